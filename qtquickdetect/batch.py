@@ -0,0 +1,301 @@
+import argparse
+import datetime
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from .models.app_config import AppConfig
+from .models.collections import Collections
+from .models.preset import Preset
+from .utils import filepaths
+
+
+class BatchRunner:
+    """
+    Runs the inference of a collection with one or more weights from the command line, without the GUI.
+    The pipelines run on plain Python threads and the results are saved like an inference from the GUI,
+    so they can be opened from the inference history tab.
+    """
+    def __init__(self, app_config: AppConfig, preset: Preset, weights: list[tuple[str, str, str]], media_type: str):
+        """
+        Initializes the BatchRunner.
+
+        :param app_config: The application configuration, holding the models and pipelines.
+        :param preset: The preset used by the pipelines.
+        :param weights: The list of model name, model builder and weight to run.
+        :param media_type: The media type of the inputs, image or video.
+        """
+        self._app_config: AppConfig = app_config
+        self._preset: Preset = preset
+        self._weights: list[tuple[str, str, str]] = weights
+        self._media_type: str = media_type
+        self.file_count: int = 0
+        self.error_count: int = 0
+        self._count_lock: threading.Lock = threading.Lock()
+
+    def run(self, inputs: list[Path], results_path: Path) -> bool:
+        """
+        Runs all the weights on the inputs, up to preset.max_concurrent_pipelines weights at the same time.
+        With preset.shared_decoding, the inputs are decoded once and all the weights run at the same time.
+
+        :param inputs: The input file paths.
+        :param results_path: Path to save the results.
+        :return: True if all the files have been processed without error, False otherwise.
+        """
+        # Imported here, once main() set the headless mode
+        from .pipeline.model_cache import ModelCache
+        from .pipeline.pipeline import Pipeline
+        from .utils.fan_out_reader import FanOutReader
+
+        ModelCache.get_instance().set_memory_budget(self._app_config.model_cache_size)
+
+        fan_out_reader = None
+        concurrency = min(self._preset.max_concurrent_pipelines, len(self._weights))
+        if self._preset.shared_decoding and len(self._weights) > 1:
+            if self._media_type == 'image':
+                source = Pipeline._read_images(inputs)
+            else:
+                source = Pipeline._read_videos(inputs, self._preset)
+            fan_out_reader = FanOutReader(source, self._preset.prefetch_depth)
+            concurrency = len(self._weights)
+
+        thread_budget = max(1, (os.cpu_count() or 1) // concurrency) if concurrency > 1 else None
+        pipelines = []
+        try:
+            for model_name, model_builder, weight in self._weights:
+                pipeline = self._setup_pipeline(model_name, model_builder, weight, inputs, results_path)
+                pipeline.thread_budget = thread_budget
+                if fan_out_reader is not None:
+                    pipeline.shared_input = fan_out_reader.subscribe(lambda p=pipeline: p.cancel_requested)
+                pipelines.append(pipeline)
+        finally:
+            if fan_out_reader is not None:
+                fan_out_reader.start()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                list(executor.map(lambda p: p.run(), pipelines))
+            except KeyboardInterrupt:
+                for pipeline in pipelines:
+                    pipeline.request_cancel()
+                raise
+
+        return self.error_count == 0
+
+    def _setup_pipeline(self, model_name: str, model_builder: str, weight: str, inputs: list[Path],
+                        results_path: Path):
+        """
+        Creates the pipeline of a weight and connects its signals to the console output.
+
+        :param model_name: The model name.
+        :param model_builder: The model builder.
+        :param weight: The weight name.
+        :param inputs: The input file paths.
+        :param results_path: Path to save the results.
+        :return: The pipeline.
+        """
+        pipeline_name = self._app_config.models[model_name]['pipeline']
+        module_name, class_name = self._app_config.pipelines[pipeline_name].rsplit('.', 1)
+        pipeline_class = getattr(importlib.import_module(module_name), class_name)
+
+        images_paths = inputs if self._media_type == 'image' else None
+        videos_paths = inputs if self._media_type == 'video' else None
+        pipeline = pipeline_class(model_name, model_builder, weight, self._preset, images_paths, videos_paths, None,
+                                  results_path)
+
+        name = f'{model_builder}.{weight}'
+        pipeline.finished_file_signal.connect(lambda input_path, _, json_path: self._file_done(name, input_path,
+                                                                                                json_path))
+        pipeline.error_signal.connect(lambda input_path, e: self._file_failed(name, input_path, e))
+        pipeline.fatal_error_signal.connect(lambda message, e: self._file_failed(name, message, e))
+        return pipeline
+
+    def _file_done(self, name: str, input_path: Path, json_path: Path) -> None:
+        """
+        Prints a processed file.
+
+        :param name: The model builder and weight.
+        :param input_path: The input file path.
+        :param json_path: The output JSON path.
+        """
+        with self._count_lock:
+            self.file_count += 1
+        print(f'[{name}] {input_path.name} -> {json_path}', flush=True)
+
+    def _file_failed(self, name: str, source: Path | str, exception: Exception) -> None:
+        """
+        Prints a file, or a pipeline, which failed.
+
+        :param name: The model builder and weight.
+        :param source: The input file path, or the error message of a fatal error.
+        :param exception: The exception.
+        """
+        with self._count_lock:
+            self.error_count += 1
+        source_name = source.name if isinstance(source, Path) else source
+        print(f'[{name}] {source_name} failed: {exception}', file=sys.stderr, flush=True)
+
+
+def find_weights(app_config: AppConfig, names: list[str]) -> list[tuple[str, str, str]]:
+    """
+    Finds the models of the given weights in the application configuration.
+
+    :param app_config: The application configuration.
+    :param names: The weight names (ex: yolov8n.pt), or model builder and weight (ex: resnet50.DEFAULT).
+    :return: The list of model name, model builder and weight.
+    :raises ValueError: If a weight is unknown or ambiguous.
+    """
+    weights = []
+    for name in names:
+        matches = [
+            (model_name, model_builder, weight)
+            for model_name, model in app_config.models.items()
+            for model_builder, builder_weights in model['model_builders'].items()
+            for weight in builder_weights
+            if name in (weight, f'{model_builder}.{weight}')
+        ]
+        if len(matches) == 0:
+            raise ValueError(f'Unknown weight: {name}')
+        if len(matches) > 1:
+            raise ValueError(f'Ambiguous weight: {name}, use model_builder.weight')
+        weights.append(matches[0])
+    return weights
+
+
+def positive_int(value: str) -> int:
+    """
+    Argument type of the integers greater than 0.
+
+    :param value: The argument value.
+    :return: The integer.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {value}')
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    """
+    Argument type of the numbers greater than or equal to 0.
+
+    :param value: The argument value.
+    :return: The number.
+    """
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f'must be 0 or more, got {value}')
+    return number
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+
+    :param argv: The arguments, None to use sys.argv.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog='qtquickdetect-batch',
+                                     description='Runs the inference of a collection without the GUI.')
+    parser.add_argument('--preset', required=True, help='Preset name, ex: default.json')
+    parser.add_argument('--model', required=True, action='append', dest='models',
+                        help='Weight to run (ex: yolov8n.pt, or resnet50.DEFAULT), can be repeated')
+    parser.add_argument('--collection', required=True, help='Collection name')
+    parser.add_argument('--media', choices=['image', 'video'], default='image', help='Collection media type')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Results directory, defaults to a new folder of the inference history')
+    parser.add_argument('--results-only', action='store_true',
+                        help='Only save the JSON results, without drawing and saving the images or videos')
+    parser.add_argument('--frame-stride', type=positive_int, default=None, help='Infer one video frame every N frames')
+    parser.add_argument('--target-fps', type=non_negative_float, default=None,
+                        help='Number of video frames inferred per second, 0 to infer every frame')
+    parser.add_argument('--start', type=non_negative_float, default=None, help='Start time of the videos, in seconds')
+    parser.add_argument('--end', type=non_negative_float, default=None,
+                        help='End time of the videos, in seconds, 0 for the end of the videos')
+    args = parser.parse_args(argv)
+    if args.start is not None and args.end is not None and 0 < args.end <= args.start:
+        parser.error(f'--end must be after --start, got {args.start} and {args.end}')
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    # The pipelines must be imported in headless mode, without PyQt6
+    os.environ.setdefault('QTQUICKDETECT_HEADLESS', '1')
+
+    args = parse_args(argv)
+
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.WARNING, format=log_format)
+
+    filepaths.create_cache_dir()
+    filepaths.create_config_dir()
+    filepaths.create_data_dir()
+
+    # Set the environment variable for the torch home directory
+    os.environ['TORCH_HOME'] = str(filepaths.get_base_data_dir() / 'weights')
+
+    app_config = AppConfig()
+    try:
+        weights = find_weights(app_config, args.models)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    tasks = {app_config.models[model_name]['task'] for model_name, _, _ in weights}
+    if len(tasks) > 1:
+        print(f'All the weights must have the same task, got: {", ".join(sorted(tasks))}', file=sys.stderr)
+        return 2
+    task = tasks.pop()
+
+    collection_path = Collections.get_collection_path(args.collection, args.media)
+    if not collection_path.is_dir():
+        print(f'Unknown {args.media} collection: {args.collection}', file=sys.stderr)
+        return 2
+    inputs = Collections.get_collection_file_paths(args.collection, args.media)
+
+    preset = Preset(args.preset)
+    if args.results_only:
+        # Only for this run, the preset file is not changed
+        preset.results_only = True
+    for name, value in [('frame_stride', args.frame_stride), ('target_fps', args.target_fps),
+                        ('start_time', args.start), ('end_time', args.end)]:
+        if value is not None:
+            setattr(preset, name, value)
+    if 0 < preset.end_time <= preset.start_time:
+        print(f'The end time of the videos must be after the start time, got {preset.start_time} and '
+              f'{preset.end_time}', file=sys.stderr)
+        return 2
+
+    formatted_date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    results_path = args.output or filepaths.get_base_data_dir() / 'history' / f'{args.media}_{task}_{formatted_date}'
+    results_path.mkdir(parents=True, exist_ok=True)
+
+    info = {
+        'media': args.media,
+        'collection': args.collection,
+        'preset': args.preset,
+        'task': task,
+        'date': formatted_date,
+        'weights': [f'{model_builder}.{weight}' for _, model_builder, weight in weights]
+    }
+    with open(results_path / 'info.json', 'w') as f:
+        json.dump(info, f, indent=4)
+
+    runner = BatchRunner(app_config, preset, weights, args.media)
+    try:
+        success = runner.run(inputs, results_path)
+    except Exception as e:
+        print(f'Inference failed: {e}', file=sys.stderr)
+        return 1
+    print(f'{runner.file_count} files processed, {runner.error_count} errors, results in {results_path}')
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,6 +22,8 @@ class AppConfig:
         """
         self.localization: str = 'en'
         self.qss: str = 'dark'
+        # Memory budget of the loaded models cache, in megabytes
+        self.model_cache_size: int = 2048
         # pipeline_name: pipeline class
         self.pipelines: dict[str, str] = {}
         # model_name: {pipeline_name, task, model_builders: {model_builder: [weights]}}
@@ -82,6 +84,11 @@ class AppConfig:
             self.qss = 'dark'
             changed = True
 
+        if not isinstance(self.model_cache_size, int) or self.model_cache_size < 0:
+            logging.warning(f'Invalid model cache size in config: {self.model_cache_size}')
+            self.model_cache_size = 2048
+            changed = True
+
         return changed
 
     def save(self) -> None:
@@ -3,6 +3,7 @@ import json
 import re
 from pathlib import Path
 from ..utils import filepaths
+from ..utils.display_buffer import DISPLAY_POLICIES
 
 # Regular expression to validate device strings
 DEVICE_VALIDATION_REGEX = re.compile(r'^(cpu|cuda)(:\d+)?$')
@@ -26,9 +27,33 @@ class Preset:
         self.device: str = 'cpu'
         self.half_precision: bool = False
         self.iou_threshold: float = 0.7
+        self.confidence_threshold: float = 0.25
+        self.max_detections: int = 100
+        self.batch_size: int = 1
+        self.prefetch_depth: int = 4
+        self.writer_threads: int = 2
+        self.worker_processes: int = 1
+        self.max_concurrent_pipelines: int = 1
+        self.shared_decoding: bool = False
 
         self.image_format: str = 'png'
         self.video_format: str = 'mp4'
+        self.video_backend: str = 'opencv'
+        self.video_codec: str = 'mpeg4'
+        self.video_hw_acceleration: bool = False
+        self.video_threads: int = 0
+        self.frame_stride: int = 1
+        self.target_fps: float = 0.0
+        self.start_time: float = 0.0
+        self.end_time: float = 0.0
+        self.stream_max_fps: float = 30.0
+        self.stream_target_latency: float = 0.5
+        self.stream_display_policy: str = 'latest'
+        self.stream_display_delay: float = 0.2
+        self.results_only: bool = False
+        self.result_format: str = 'json'
+        self.mask_encoding: str = 'float'
+        self.mask_tolerance: float = 0.0
 
         self.box_color: tuple[int, int, int, int] = (0, 255, 0, 255)
         self.box_color_per_class: bool = True
@@ -38,12 +63,17 @@ class Preset:
         self.segment_color_per_class: bool = True
         self.segment_thickness: int = 2
 
+        # Colors of the classes when colored by class, repeated over the classes, generated if empty
+        self.palette: list[tuple[int, int, int, int]] = []
+
         self.pose_head_color: tuple[int, int, int, int] = (0, 255, 0, 255)
         self.pose_chest_color: tuple[int, int, int, int] = (0, 255, 0, 255)
         self.pose_leg_color: tuple[int, int, int, int] = (0, 255, 0, 255)
         self.pose_arm_color: tuple[int, int, int, int] = (0, 255, 0, 255)
         self.pose_point_size: int = 3
         self.pose_line_thickness: int = 2
+        # Skeleton of the pose models, see Skeleton.from_dict, empty for the COCO skeleton of 17 keypoint models
+        self.pose_skeleton: dict = {}
 
         self.text_color: tuple[int, int, int, int] = (0, 0, 0, 255)
         self.text_size: float = 1.5
@@ -97,6 +127,46 @@ class Preset:
             self.iou_threshold = 0.7
             changed = True
 
+        if not isinstance(self.confidence_threshold, float) or not (0 <= self.confidence_threshold <= 1):
+            logging.warning(f'Invalid confidence threshold in config: {self.confidence_threshold}')
+            self.confidence_threshold = 0.25
+            changed = True
+
+        if not isinstance(self.max_detections, int) or self.max_detections < 1:
+            logging.warning(f'Invalid max detections in config: {self.max_detections}')
+            self.max_detections = 100
+            changed = True
+
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            logging.warning(f'Invalid batch size in config: {self.batch_size}')
+            self.batch_size = 1
+            changed = True
+
+        if not isinstance(self.prefetch_depth, int) or self.prefetch_depth < 1:
+            logging.warning(f'Invalid prefetch depth in config: {self.prefetch_depth}')
+            self.prefetch_depth = 4
+            changed = True
+
+        if not isinstance(self.writer_threads, int) or self.writer_threads < 1:
+            logging.warning(f'Invalid writer threads in config: {self.writer_threads}')
+            self.writer_threads = 2
+            changed = True
+
+        if not isinstance(self.worker_processes, int) or self.worker_processes < 1:
+            logging.warning(f'Invalid worker processes in config: {self.worker_processes}')
+            self.worker_processes = 1
+            changed = True
+
+        if not isinstance(self.max_concurrent_pipelines, int) or self.max_concurrent_pipelines < 1:
+            logging.warning(f'Invalid max concurrent pipelines in config: {self.max_concurrent_pipelines}')
+            self.max_concurrent_pipelines = 1
+            changed = True
+
+        if not isinstance(self.shared_decoding, bool):
+            logging.warning(f'Invalid shared decoding in config: {self.shared_decoding}')
+            self.shared_decoding = False
+            changed = True
+
         if not isinstance(self.device, str) or not DEVICE_VALIDATION_REGEX.match(self.device):
             logging.warning(f'Invalid device in config: {self.device}')
             self.device = 'cpu'
@@ -112,6 +182,86 @@ class Preset:
             self.video_format = 'mp4'
             changed = True
 
+        if not isinstance(self.video_backend, str) or self.video_backend not in ['opencv', 'pyav', 'ffmpeg']:
+            logging.warning(f'Invalid video backend in config: {self.video_backend}')
+            self.video_backend = 'opencv'
+            changed = True
+
+        if not isinstance(self.video_codec, str) or self.video_codec not in ['mpeg4', 'h264', 'mjpeg']:
+            logging.warning(f'Invalid video codec in config: {self.video_codec}')
+            self.video_codec = 'mpeg4'
+            changed = True
+
+        if not isinstance(self.video_hw_acceleration, bool):
+            logging.warning(f'Invalid video hardware acceleration in config: {self.video_hw_acceleration}')
+            self.video_hw_acceleration = False
+            changed = True
+
+        if not isinstance(self.video_threads, int) or self.video_threads < 0:
+            logging.warning(f'Invalid video threads in config: {self.video_threads}')
+            self.video_threads = 0
+            changed = True
+
+        if not isinstance(self.frame_stride, int) or self.frame_stride < 1:
+            logging.warning(f'Invalid frame stride in config: {self.frame_stride}')
+            self.frame_stride = 1
+            changed = True
+
+        if not isinstance(self.target_fps, float) or self.target_fps < 0:
+            logging.warning(f'Invalid target FPS in config: {self.target_fps}')
+            self.target_fps = 0.0
+            changed = True
+
+        if not isinstance(self.start_time, float) or self.start_time < 0:
+            logging.warning(f'Invalid start time in config: {self.start_time}')
+            self.start_time = 0.0
+            changed = True
+
+        if not isinstance(self.end_time, float) or self.end_time < 0 or 0 < self.end_time <= self.start_time:
+            logging.warning(f'Invalid end time in config: {self.end_time}')
+            self.end_time = 0.0
+            changed = True
+
+        if not isinstance(self.stream_max_fps, float) or self.stream_max_fps <= 0:
+            logging.warning(f'Invalid stream max FPS in config: {self.stream_max_fps}')
+            self.stream_max_fps = 30.0
+            changed = True
+
+        if not isinstance(self.stream_target_latency, float) or self.stream_target_latency <= 0:
+            logging.warning(f'Invalid stream target latency in config: {self.stream_target_latency}')
+            self.stream_target_latency = 0.5
+            changed = True
+
+        if not isinstance(self.stream_display_policy, str) or self.stream_display_policy not in DISPLAY_POLICIES:
+            logging.warning(f'Invalid stream display policy in config: {self.stream_display_policy}')
+            self.stream_display_policy = 'latest'
+            changed = True
+
+        if not isinstance(self.stream_display_delay, float) or self.stream_display_delay < 0:
+            logging.warning(f'Invalid stream display delay in config: {self.stream_display_delay}')
+            self.stream_display_delay = 0.2
+            changed = True
+
+        if not isinstance(self.results_only, bool):
+            logging.warning(f'Invalid results only in config: {self.results_only}')
+            self.results_only = False
+            changed = True
+
+        if not isinstance(self.result_format, str) or self.result_format not in ['json', 'npz']:
+            logging.warning(f'Invalid result format in config: {self.result_format}')
+            self.result_format = 'json'
+            changed = True
+
+        if not isinstance(self.mask_encoding, str) or self.mask_encoding not in ['float', 'int', 'rle']:
+            logging.warning(f'Invalid mask encoding in config: {self.mask_encoding}')
+            self.mask_encoding = 'float'
+            changed = True
+
+        if not isinstance(self.mask_tolerance, float) or self.mask_tolerance < 0:
+            logging.warning(f'Invalid mask tolerance in config: {self.mask_tolerance}')
+            self.mask_tolerance = 0.0
+            changed = True
+
         if not self._check_color(self.box_color):
             logging.warning(f'Invalid box color in config: {self.box_color}')
             self.box_color = (0, 255, 0, 255)
@@ -142,6 +292,12 @@ class Preset:
             self.segment_thickness = 2
             changed = True
 
+        if not isinstance(self.palette, list) or not all(isinstance(color, (list, tuple)) and self._check_color(color)
+                                                          for color in self.palette):
+            logging.warning(f'Invalid palette in config: {self.palette}')
+            self.palette = []
+            changed = True
+
         if not self._check_color(self.pose_head_color):
             logging.warning(f'Invalid pose head color in config: {self.pose_head_color}')
             self.pose_head_color = (0, 255, 0, 255)
@@ -172,6 +328,12 @@ class Preset:
             self.pose_line_thickness = 2
             changed = True
 
+        if not isinstance(self.pose_skeleton, dict) or (self.pose_skeleton and
+                                                        not self._check_skeleton(self.pose_skeleton)):
+            logging.warning(f'Invalid pose skeleton in config: {self.pose_skeleton}')
+            self.pose_skeleton = {}
+            changed = True
+
         if not self._check_color(self.text_color):
             logging.warning(f'Invalid text color in config: {self.text_color}')
             self.text_color = (0, 0, 0, 255)
@@ -184,6 +346,23 @@ class Preset:
 
         return changed
 
+    @staticmethod
+    def _check_skeleton(skeleton: dict) -> bool:
+        """
+        Validates a pose skeleton description.
+
+        :param skeleton: The skeleton description.
+        :return: True if the skeleton is valid, False otherwise.
+        """
+        # Imported here, the renderer imports the preset
+        from ..utils.overlay_renderer import Skeleton
+
+        try:
+            Skeleton.from_dict(skeleton)
+        except ValueError:
+            return False
+        return True
+
     @staticmethod
     def _check_color(color: tuple) -> bool:
         """
@@ -0,0 +1,70 @@
+import numpy as np
+import torch
+
+
+class Detections:
+    """
+    Bounding boxes detected in an image, stored as NumPy arrays so the post-processing works on whole arrays.
+    The per-detection dictionaries of the JSON results are only built by to_dicts, when the results are saved.
+    """
+    def __init__(self, boxes: np.ndarray, classes: np.ndarray, confidences: np.ndarray):
+        """
+        Initializes the detections.
+
+        :param boxes: The (N, 4) integer array of x1, y1, x2, y2 box corners.
+        :param classes: The (N,) integer array of class ids.
+        :param confidences: The (N,) float array of confidences.
+        """
+        self.boxes: np.ndarray = boxes
+        self.classes: np.ndarray = classes
+        self.confidences: np.ndarray = confidences
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __iter__(self):
+        """
+        Iterates over the detections, ex: to draw them.
+
+        :return: An iterator of ((x1, y1), (x2, y2), class id, confidence) tuples of Python numbers.
+        """
+        for (x1, y1, x2, y2), class_id, confidence in zip(self.boxes.tolist(), self.classes.tolist(),
+                                                          self.confidences.tolist()):
+            yield (x1, y1), (x2, y2), class_id, confidence
+
+    @staticmethod
+    def from_tensors(boxes: torch.Tensor, classes: torch.Tensor, confidences: torch.Tensor) -> 'Detections':
+        """
+        Creates the detections from the output tensors of a model, with a single transfer to the CPU.
+
+        :param boxes: The (N, 4) tensor of x1, y1, x2, y2 box corners.
+        :param classes: The (N,) tensor of class ids.
+        :param confidences: The (N,) tensor of confidences.
+        :return: The detections.
+        """
+        data = torch.cat((
+            boxes.reshape(-1, 4).float(),
+            classes.reshape(-1, 1).float(),
+            confidences.reshape(-1, 1).float()
+        ), dim=1).cpu().numpy()
+
+        # Truncated like int(), as the box corners are pixel positions
+        return Detections(data[:, :4].astype(int), data[:, 4].astype(int), data[:, 5])
+
+    def to_dicts(self) -> list[dict]:
+        """
+        Builds the results array of the detections, as saved in the JSON results.
+
+        :return: A dictionary with the box corners, class id and confidence of each detection.
+        """
+        return [
+            {
+                'x1': top_left[0],
+                'y1': top_left[1],
+                'x2': bottom_right[0],
+                'y2': bottom_right[1],
+                'classid': class_id,
+                'confidence': confidence,
+            }
+            for top_left, bottom_right, class_id, confidence in self
+        ]
@@ -0,0 +1,177 @@
+import logging
+import threading
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+# Memory budget of the cache until the caller sets the budget of its config, in megabytes
+DEFAULT_MEMORY_BUDGET = 2048
+
+
+class ModelCache:
+    """
+    ModelCache is a singleton holding the loaded models of the process, shared by all the pipelines.
+    Models are kept in least recently used order and evicted once their total size exceeds the memory budget.
+    Pipelines borrow the models from the cache instead of loading their own, and serialize their inferences
+    on a shared model with the lock of its entry. Models are loaded outside the cache lock, with a lock per key,
+    so a model is loaded once while the other models can be loaded or borrowed meanwhile.
+    """
+    _instance = None
+
+    def __init__(self):
+        """
+        Initializes the ModelCache instance. Ensures that only one instance of the class can be created.
+        """
+        if ModelCache._instance is not None:
+            raise Exception('Singleton class, use get_instance() instead')
+
+        ModelCache._instance = self
+
+        self._lock: threading.RLock = threading.RLock()
+        self._models: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._inference_locks: dict[Hashable, threading.Lock] = {}
+        self._load_locks: dict[Hashable, threading.Lock] = {}
+        # Set from the app config by the pipeline manager or the batch runner
+        self.memory_budget: int = DEFAULT_MEMORY_BUDGET * 1024 * 1024
+
+    @staticmethod
+    def get_instance() -> 'ModelCache':
+        """
+        Returns the singleton instance of the ModelCache class. Creates a new instance if none exists.
+
+        :return: The singleton instance of ModelCache.
+        """
+        if ModelCache._instance is None:
+            ModelCache()
+        return ModelCache._instance
+
+    def set_memory_budget(self, budget: int) -> None:
+        """
+        Sets the memory budget of the cache and evicts the models exceeding it.
+
+        :param budget: The memory budget in megabytes.
+        """
+        with self._lock:
+            self.memory_budget = budget * 1024 * 1024
+            self._evict_over_budget()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the model of the given key, loading it with the loader if it is not cached yet.
+
+        :param key: The key of the model (pipeline class, model builder, weight, device, precision...).
+        :param loader: Function loading the model if it is not cached.
+        :return: The loaded model.
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                logging.info(f'Model cache hit: {key}')
+                return self._models[key]
+            if key not in self._load_locks:
+                self._load_locks[key] = threading.Lock()
+            load_lock = self._load_locks[key]
+
+        # Concurrent misses of the same key wait for the first one to load the model
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    logging.info(f'Model cache hit: {key}')
+                    return self._models[key]
+
+            logging.info(f'Model cache miss, loading: {key}')
+            model = loader()
+            size = self.model_size(model)
+
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = size
+                self._evict_over_budget()
+            return model
+
+    def get_inference_lock(self, key: Hashable) -> threading.Lock:
+        """
+        Returns the lock to hold while running an inference with the model of the given key.
+
+        :param key: The key of the model.
+        :return: The inference lock of the model.
+        """
+        with self._lock:
+            if key not in self._inference_locks:
+                self._inference_locks[key] = threading.Lock()
+            return self._inference_locks[key]
+
+    def evict(self, key: Hashable) -> bool:
+        """
+        Removes a model from the cache. Pipelines still using it keep their reference until they finish.
+
+        :param key: The key of the model.
+        :return: True if the model was cached, False otherwise.
+        """
+        with self._lock:
+            if key not in self._models:
+                return False
+            del self._models[key]
+            del self._sizes[key]
+            logging.info(f'Model evicted from cache: {key}')
+            return True
+
+    def evict_weight(self, weight: str) -> None:
+        """
+        Removes all the models loaded from the given weight, ex: when the weight file is deleted.
+
+        :param weight: The weight name.
+        """
+        with self._lock:
+            for key in [key for key in self._models if weight in key]:
+                self.evict(key)
+
+    def clear(self) -> None:
+        """
+        Removes all the models from the cache.
+        """
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+    def memory_usage(self) -> int:
+        """
+        :return: The estimated memory used by the cached models, in bytes.
+        """
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def _evict_over_budget(self) -> None:
+        """
+        Evicts the least recently used models until the cache fits in the memory budget.
+        The most recently used model is always kept.
+        """
+        while len(self._models) > 1 and sum(self._sizes.values()) > self.memory_budget:
+            key = next(iter(self._models))
+            self.evict(key)
+
+    @staticmethod
+    def model_size(model: Any) -> int:
+        """
+        Estimates the memory used by a model from its parameters and buffers.
+
+        :param model: The model, a torch module or an object wrapping one.
+        :return: The estimated size in bytes, 0 if it can't be estimated.
+        """
+        if not hasattr(model, 'parameters'):
+            return 0
+
+        size = sum(param.numel() * param.element_size() for param in model.parameters())
+        if hasattr(model, 'buffers'):
+            size += sum(buffer.numel() * buffer.element_size() for buffer in model.buffers())
+        return size
@@ -1,12 +1,36 @@
 import json
+import multiprocessing
+import os
+import queue
+import threading
 import time
 import cv2 as cv
 import numpy as np
+import torch
 
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from PyQt6.QtCore import pyqtSignal, QThread
+from typing import Any, Callable, Iterable, Iterator
+from ..utils.qt_compat import pyqtSignal, QThread
+from .detections import Detections
+from .model_cache import ModelCache
+from .result_store import RESULT_SUFFIXES, VIDEO_RESULT_SUFFIXES, ResultWriter, open_result_writer, save_npz
+from .shard_worker import run_shard
 from ..models.preset import Preset
+from ..utils.async_writer import AsyncWriter
+from ..utils.fan_out_reader import FanOutSubscription
+from ..utils.mask_encoding import encode_mask
+from ..utils.frame_ring import FrameRing
 from ..utils.media_fetcher import MediaFetcher
+from ..utils.media_io import VideoReader, VideoWriter, open_video_reader, open_video_writer
+from ..utils.overlay_renderer import OverlayRenderer
+from ..utils.prefetcher import Prefetcher
+from ..utils.stage_worker import STAGE_END, DropOldestQueue, StageWorker
+from ..utils.stream_scheduler import StreamScheduler
+
+# Maximum number of stream frames waiting between two stages, the oldest ones are dropped
+STREAM_QUEUE_DEPTH = 2
 
 
 class Pipeline(QThread):
@@ -14,8 +38,8 @@ class Pipeline(QThread):
     Generic pipeline class for handling pipeline execution.
     """
     progress_signal = pyqtSignal(float, Path)  # Progress percentage on the current file, input file
-    finished_file_signal = pyqtSignal(Path, Path, Path)  # Source file, output file, JSON file
-    finished_stream_frame_signal = pyqtSignal(np.ndarray)  # Frame
+    finished_file_signal = pyqtSignal(Path, object, Path)  # Source file, output file (None if results only), JSON file
+    finished_stream_frame_signal = pyqtSignal(np.ndarray, float)  # RGB frame (frame_ring buffer), capture time
     finished_all_signal = pyqtSignal()  # Signal emitted when all files are processed
     error_signal = pyqtSignal(Path, Exception)  # Source file, exception
     fatal_error_signal = pyqtSignal(str, Exception)  # Error message, exception
@@ -43,12 +67,54 @@ class Pipeline(QThread):
         self.mode: str = 'images' if images_paths else 'videos' if videos_paths else 'stream'
         self.results_path: Path = results_path / f"{model_builder}.{weight}" if results_path else None
         self.preset: Preset = preset
+        self.renderer: OverlayRenderer = OverlayRenderer(preset)
         self.cancel_requested: bool = False
         self.stream_fps: float = 0.0
+        self.model_lock: threading.Lock = threading.Lock()
+        # Number of intra-op CPU threads of the pipeline thread, None to keep the torch default
+        self.thread_budget: int | None = None
+        # Inputs decoded once by the pipeline manager and shared with the other weights, None to decode them here
+        self.shared_input: FanOutSubscription | None = None
+        # Keyword arguments of the last results drawn by the renderer, redrawn on the frames which are not inferred
+        self._last_overlay: dict[str, Any] | None = None
+        # Whether the results are only kept in _last_overlay, to be drawn by another stage
+        self._defer_drawing: bool = False
+        # Buffers of the delivered stream frames, reused from frame to frame
+        self.frame_ring: FrameRing = FrameRing()
+        # Scheduler of the stream inferences, shared by the stream stages
+        self._stream_scheduler: StreamScheduler | None = None
 
         if self.results_path:
             self.results_path.mkdir(parents=True, exist_ok=True)
 
+    def _model_key(self) -> tuple:
+        """
+        Returns the key identifying the model of the pipeline in the model cache.
+
+        :return: The model key.
+        """
+        return type(self).__name__, self.model_builder, self.weight, self.preset.device, self.preset.half_precision
+
+    @property
+    def draws_results(self) -> bool:
+        """
+        :return: Whether the results are drawn on the images, they are not in results-only mode, except on streams.
+        """
+        return self.mode == 'stream' or not self.preset.results_only
+
+    def _load_model(self, loader: Callable[[], Any]) -> Any:
+        """
+        Borrows the model of the pipeline from the model cache, loading it if it is not cached yet.
+        Inferences with the model must hold self.model_lock, as the model can be shared with other pipelines.
+
+        :param loader: Function loading the model if it is not cached.
+        :return: The loaded model.
+        """
+        cache = ModelCache.get_instance()
+        key = self._model_key()
+        self.model_lock = cache.get_inference_lock(key)
+        return cache.get(key, loader)
+
     def request_cancel(self) -> None:
         """
         Requests cancellation of the ongoing process.
@@ -59,16 +125,38 @@ class Pipeline(QThread):
         """
         Runs the pipeline from another thread.
         """
-        if self.mode == 'images':
-            self._run_images(self.images_paths)
-        elif self.mode == 'videos':
-            self._run_videos(self.videos_paths)
-        elif self.mode == 'stream':
-            self._run_stream(self.stream_url)
+        if self.thread_budget:
+            torch.set_num_threads(self.thread_budget)
+
+        try:
+            if self.mode == 'images':
+                self._run_images(self.images_paths)
+            elif self.mode == 'videos':
+                self._run_videos(self.videos_paths)
+            elif self.mode == 'stream':
+                self._run_stream(self.stream_url)
+        finally:
+            # Detach from the shared input so the reader does not wait for this pipeline anymore
+            if self.shared_input is not None:
+                self.shared_input.close()
+
+    def _open_input(self, source: Iterable) -> Prefetcher | FanOutSubscription:
+        """
+        Opens the decoded inputs of the pipeline: the shared input if the pipeline manager decodes them for all
+        the weights, otherwise a prefetcher decoding the source on a reader thread.
+
+        :param source: The iterable decoding the inputs, ignored when the input is shared.
+        :return: The iterable of decoded inputs, to use as a context manager.
+        """
+        if self.shared_input is not None:
+            return self.shared_input
+        return Prefetcher(source, self.preset.prefetch_depth, lambda: self.cancel_requested)
 
     def _run_images(self, inputs: list[Path]):
         """
-        Process a list of image paths.
+        Process a list of image paths, by batches of preset.batch_size images.
+        Images are decoded ahead on a reader thread while the previous batch is inferred, and the results are
+        encoded and written by writer threads.
 
         :param inputs: The list of image paths.
         """
@@ -76,32 +164,209 @@ class Pipeline(QThread):
             self.fatal_error_signal.emit('No results path provided', Exception('No results path provided'))
             return
 
-        for input_path in inputs:
+        if self.preset.worker_processes > 1 and self.shared_input is None and len(inputs) > 1:
+            self._run_images_sharded(inputs)
+            return
+
+        batch_size = self.preset.batch_size
+        batch_paths = []
+        batch_images = []
+        pending_writes: deque[tuple[Future, Path, Path | None, Path]] = deque()
+
+        with AsyncWriter(self.preset.writer_threads, 2 * self.preset.writer_threads) as writer, \
+                self._open_input(self._read_images(inputs)) as prefetcher:
+            for input_path, image in prefetcher:
+                if self.cancel_requested:
+                    break
+
+                # Unreadable images are reported and skipped
+                if image is None:
+                    self.error_signal.emit(input_path, IOError(f'Could not read image: {input_path}'))
+                    continue
+
+                # Shared images are drawn on a copy, the other weights use them too
+                batch_paths.append(input_path)
+                batch_images.append(image.copy() if self.shared_input is not None and self.draws_results else image)
+
+                if len(batch_images) == batch_size:
+                    self._process_image_batch(batch_paths, batch_images, writer, pending_writes)
+                    batch_paths = []
+                    batch_images = []
+
+                self._emit_written_files(pending_writes, wait=False)
+
+            # Process the last incomplete batch
+            if batch_images and not self.cancel_requested:
+                self._process_image_batch(batch_paths, batch_images, writer, pending_writes)
+
+        # Files are only reported once they are fully written
+        self._emit_written_files(pending_writes, wait=True)
+
+        if self.cancel_requested:
+            return
+
+        self.finished_all_signal.emit()
+
+    def _run_images_sharded(self, inputs: list[Path]) -> None:
+        """
+        Process a list of image paths with preset.worker_processes worker processes, each one loading its own model
+        and processing a shard of the images. The signals of the workers are re-emitted by this pipeline as the
+        results stream back.
+
+        :param inputs: The list of image paths.
+        """
+        worker_count = min(self.preset.worker_processes, len(inputs))
+        shards = [inputs[i::worker_count] for i in range(worker_count)]
+        thread_budget = max(1, (self.thread_budget or os.cpu_count() or 1) // worker_count)
+        pipeline_class_path = f'{type(self).__module__}.{type(self).__qualname__}'
+
+        # Spawned workers, forking a process running torch and Qt threads is not safe
+        context = multiprocessing.get_context('spawn')
+        events = context.Queue()
+        cancel_event = context.Event()
+        workers = [
+            context.Process(target=run_shard, daemon=True,
+                            args=(pipeline_class_path, self.model_name, self.model_builder, self.weight, self.preset,
+                                  index, shard, self.results_path.parent, thread_budget, events, cancel_event))
+            for index, shard in enumerate(shards)
+        ]
+        for worker in workers:
+            worker.start()
+
+        reported: set[Path] = set()
+        running = set(range(worker_count))
+        while running:
             if self.cancel_requested:
-                return
+                cancel_event.set()
 
+            try:
+                kind, *args = events.get(timeout=0.1)
+            except queue.Empty:
+                # Report the images of the workers which died without finishing their shard, once their last events,
+                # flushed before they exited, have been read
+                dead = [index for index in running if not workers[index].is_alive()]
+                if not dead or not events.empty():
+                    continue
+                for index in dead:
+                    running.discard(index)
+                    for input_path in shards[index]:
+                        if input_path not in reported and not self.cancel_requested:
+                            self.error_signal.emit(input_path, Exception('Worker process terminated unexpectedly'))
+                continue
+
+            if kind == 'file':
+                reported.add(args[0])
+                self.finished_file_signal.emit(*args)
+            elif kind == 'error':
+                reported.add(args[0])
+                self.error_signal.emit(*args)
+            elif kind == 'fatal':
+                self.fatal_error_signal.emit(*args)
+            elif kind == 'done':
+                running.discard(args[0])
+
+        for worker in workers:
+            worker.join()
+
+        if self.cancel_requested:
+            return
+
+        self.finished_all_signal.emit()
+
+    @staticmethod
+    def _read_images(inputs: list[Path]) -> Iterator[tuple[Path, np.ndarray | None]]:
+        """
+        Decodes the images one by one, used as the source of the prefetcher.
+
+        :param inputs: The list of image paths.
+        :return: An iterator of image paths and decoded images (None if the image could not be read).
+        """
+        for input_path in inputs:
+            yield input_path, cv.imread(str(input_path))
+
+    def _process_image_batch(self, batch_paths: list[Path], batch_images: list[np.ndarray], writer: AsyncWriter,
+                             pending_writes: deque[tuple[Future, Path, Path | None, Path]]) -> None:
+        """
+        Processes a batch of images in one forward pass and submits the results of each image to the writer.
+
+        :param batch_paths: The input paths of the batch.
+        :param batch_images: The decoded images of the batch.
+        :param writer: The writer saving the results.
+        :param pending_writes: The queue of submitted writes, with their input, image and JSON paths.
+        """
+        try:
+            batch_results = self._process_images(batch_images)
+        except Exception as e:
+            for input_path in batch_paths:
+                self.error_signal.emit(input_path, e)
+            return
+
+        for input_path, (result_image, results_array) in zip(batch_paths, batch_results):
             try:
                 # Create paths for the output files
                 file_name = input_path.name
                 file_path = self.results_path / file_name
-                image_path = file_path.with_suffix(f".{self.preset.image_format}")
-                json_path = file_path.with_suffix('.json')
-
-                # Read the image and process it
-                image = cv.imread(str(input_path))
-                result_image, results_array = self._process_image(image)
-
-                # Save the result image and JSON file
-                cv.imwrite(str(image_path), result_image)
-                with open(json_path, 'w') as f:
-                    results = self._make_results(results_array)
-                    json.dump(results, f, indent=4)
+                image_path = None if self.preset.results_only else file_path.with_suffix(f".{self.preset.image_format}")
+                json_path = file_path.with_suffix(RESULT_SUFFIXES[self.preset.result_format])
 
-                self.finished_file_signal.emit(input_path, image_path, json_path)
+                # Build the results, save the result image and JSON file from a writer thread
+                future = writer.submit(self._write_image_results, result_image, image_path, results_array, json_path)
+                pending_writes.append((future, input_path, image_path, json_path))
             except Exception as e:
                 self.error_signal.emit(input_path, e)
 
-        self.finished_all_signal.emit()
+    def _write_image_results(self, result_image: np.ndarray, image_path: Path | None,
+                             results_array: list | Detections, json_path: Path) -> None:
+        """
+        Encodes and writes the result image and the results file, runs on a writer thread.
+
+        :param result_image: The processed image.
+        :param image_path: The output image path, None to only write the results file.
+        :param results_array: The results of the image.
+        :param json_path: The output results path.
+        """
+        if image_path is not None and not cv.imwrite(str(image_path), result_image):
+            raise IOError(f'Could not write image: {image_path}')
+        self._save_results(results_array, json_path)
+
+    def _save_results(self, results_array: list | Detections, path: Path) -> None:
+        """
+        Saves the results of an image in the result format of the preset, indented JSON or columnar NPZ.
+
+        :param results_array: The results of the image.
+        :param path: The output results path.
+        """
+        if self.preset.result_format == 'npz':
+            save_npz(path, self._make_results(results_array), per_frame=False)
+            return
+        with open(path, 'w') as f:
+            json.dump(self._make_results(self._serializable(results_array)), f, indent=4)
+
+    def _open_video_results(self, path: Path) -> ResultWriter:
+        """
+        Opens the writer of the results of a video, the results are written frame by frame.
+
+        :param path: The output results path.
+        :return: The result writer.
+        """
+        metadata = self._make_results([])
+        del metadata['results']
+        return open_result_writer(path, metadata)
+
+    def _emit_written_files(self, pending_writes: deque[tuple[Future, Path, Path | None, Path]], wait: bool) -> None:
+        """
+        Emits the finished file signal, or the error signal, for the submitted writes that are done, in order.
+
+        :param pending_writes: The queue of submitted writes, with their input, image and JSON paths.
+        :param wait: Whether to wait for all the pending writes to finish.
+        """
+        while pending_writes and (wait or pending_writes[0][0].done()):
+            future, input_path, image_path, json_path = pending_writes.popleft()
+            error = future.exception()
+            if error is None:
+                self.finished_file_signal.emit(input_path, image_path, json_path)
+            else:
+                self.error_signal.emit(input_path, error)
 
     def _run_videos(self, inputs: list[Path]):
         """
@@ -121,16 +386,11 @@ class Pipeline(QThread):
                 # Create paths for the output files
                 file_name = input_path.name
                 file_path = self.results_path / file_name
-                video_path = file_path.with_suffix(f".{self.preset.video_format}")
-                json_path = file_path.with_suffix('.json')
+                video_path = None if self.preset.results_only else file_path.with_suffix(f".{self.preset.video_format}")
+                json_path = file_path.with_suffix(VIDEO_RESULT_SUFFIXES[self.preset.result_format])
 
-                # Process the video and save it
-                results_array = self._process_video(input_path, video_path)
-
-                # Save the JSON file
-                with open(json_path, 'w') as f:
-                    results = self._make_results(results_array)
-                    json.dump(results, f, indent=4)
+                # Process the video and save it, the results are written as the frames are processed
+                self._process_video(input_path, video_path, json_path)
 
                 self.finished_file_signal.emit(input_path, video_path, json_path)
             except Exception as e:
@@ -159,81 +419,367 @@ class Pipeline(QThread):
             self.fatal_error_signal.emit('Error opening stream', e)
             return
 
-        self.stream_fps = media_fetcher.fps
-        max_fps = 30.0
-        frame_interval = 1.0 / min(self.stream_fps, max_fps)
-        last_frame_time = time.time()
+        # Frames are processed at the rate the model sustains, the frames captured meanwhile are dropped
+        self.fetcher = media_fetcher
+        self._stream_scheduler = StreamScheduler(self.preset.stream_max_fps, self.preset.stream_target_latency,
+                                                 media_fetcher.fps)
+        self.stream_fps = self._stream_scheduler.fps
+
+        # The stages run concurrently, each one on its own thread: while this thread delivers a frame, the render
+        # stage draws the previous one, the inference stage infers the next one and the preprocessing stage decodes
+        # the newest captured frame. The capture runs on the thread of the fetcher.
+        self._defer_drawing = True
+        preprocessed = DropOldestQueue(1)
+        inferred = DropOldestQueue(STREAM_QUEUE_DEPTH)
+        rendered = DropOldestQueue(STREAM_QUEUE_DEPTH)
+        stages = [
+            StageWorker(self._preprocess_stream_frame, self._fetch_stream_frame, preprocessed, 'stream-preprocess'),
+            StageWorker(self._infer_stream_frame, self._next_stream_frame(preprocessed), inferred, 'stream-infer'),
+            StageWorker(self._render_stream_frame, inferred.get, rendered, 'stream-render')
+        ]
 
-        while not self.cancel_requested:
-            current_time = time.time()
-            elapsed_since_last_frame = current_time - last_frame_time
+        try:
+            while not self.cancel_requested:
+                error = next((stage.error for stage in stages if stage.error is not None), None)
+                if error is not None:
+                    self.fatal_error_signal.emit("Error processing frame", error)
+                    break
 
-            # Fetch the frame and process it
-            if elapsed_since_last_frame >= frame_interval:
                 try:
-                    frame, frame_available = media_fetcher.fetch_frame()
-                    if not frame_available:
-                        continue
-                    result_frame, _ = self._process_image(frame)
-                    self.finished_stream_frame_signal.emit(result_frame)
-                except Exception as e:
-                    self.fatal_error_signal.emit("Error processing frame", e)
+                    item = rendered.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                # The stream ended
+                if item is STAGE_END:
                     break
-                last_frame_time = current_time
 
-            # Because it's another thread, we can use sleep
-            time.sleep(max(0.0, frame_interval - (time.time() - current_time)))
+                # Deliver the frame from the pipeline thread, converted to RGB in a buffer of the frame ring, it is
+                # dropped if the display still holds all the buffers
+                self.stream_fps = self._stream_scheduler.fps
+                frame, frame_time = item
+                buffer = self.frame_ring.write(frame)
+                if buffer is not None:
+                    self.finished_stream_frame_signal.emit(buffer, frame_time)
+        finally:
+            for stage in stages:
+                stage.close()
+            # Release the frame fetcher when cancelled or when the stream ended
+            media_fetcher.release()
+
+    def _fetch_stream_frame(self, timeout: float) -> Any:
+        """
+        Fetches the newest frame of the stream, the source of the preprocessing stage.
+
+        :param timeout: The maximum time to wait for a new frame, in seconds.
+        :return: The frame and its capture time, or STAGE_END if the stream ended.
+        :raises queue.Empty: If there is no new frame yet.
+        """
+        frame, frame_available = self.fetcher.fetch_frame(timeout)
+        if frame_available:
+            return frame, self.fetcher.frame_time
+        if self.fetcher.ended:
+            return STAGE_END
+        raise queue.Empty
+
+    def _preprocess_stream_frame(self, item: tuple[np.ndarray, float]) -> tuple[np.ndarray, float] | None:
+        """
+        Drops the stream frames too old to be inferred within the target latency, runs on the preprocessing stage.
+
+        :param item: The frame and its capture time.
+        :return: The frame and its capture time, None if the frame is dropped.
+        """
+        _, frame_time = item
+        if not self._stream_scheduler.accept(time.monotonic() - frame_time):
+            return None
+        return item
+
+    def _next_stream_frame(self, preprocessed: DropOldestQueue) -> Callable[[float], Any]:
+        """
+        Returns the source of the inference stage, waiting for the inference slot given by the scheduler before
+        taking the newest preprocessed frame.
+
+        :param preprocessed: The output queue of the preprocessing stage.
+        :return: The source of the inference stage.
+        """
+        def next_frame(timeout: float) -> Any:
+            delay = self._stream_scheduler.delay()
+            if delay > 0:
+                time.sleep(min(delay, timeout))
+                raise queue.Empty
+            return preprocessed.get(timeout)
+        return next_frame
+
+    def _infer_stream_frame(self, item: tuple[np.ndarray, float]) -> tuple[np.ndarray, dict[str, Any] | None, float]:
+        """
+        Infers a stream frame, runs on the inference stage. The results are drawn by the render stage.
+
+        :param item: The frame and its capture time.
+        :return: The frame, the results to draw on it, the keyword arguments of OverlayRenderer.render, and the
+            capture time of the frame.
+        """
+        frame, frame_time = item
+        start_time = time.monotonic()
+        result_frame, _ = self._process_image(frame)
+        self._stream_scheduler.record(start_time)
+        return result_frame, self._last_overlay, frame_time
+
+    def _render_stream_frame(self, item: tuple[np.ndarray, dict[str, Any] | None, float]) -> tuple[np.ndarray, float]:
+        """
+        Draws the results of an inferred stream frame, runs on the render stage.
 
-        # Release the frame fetcher when cancelled
-        media_fetcher.release()
+        :param item: The frame, the results to draw on it and the capture time of the frame.
+        :return: The drawn frame and its capture time.
+        """
+        frame, overlay, frame_time = item
+        if overlay is not None:
+            self.renderer.render(frame, **overlay)
+        return frame, frame_time
 
-    def _process_video(self, video_path: Path, output_path: Path) -> list[list[dict]]:
+    def _process_video(self, video_path: Path, output_path: Path | None, results_path: Path) -> None:
         """
         Processes a single video and saves the output.
 
         :param video_path: The input video path.
-        :param output_path: The output video path.
-        :return: The results array.
-        """
-        # Open the video
-        cap = cv.VideoCapture(str(video_path))
-        width = int(cap.get(cv.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv.CAP_PROP_FRAME_HEIGHT))
-        fps = cap.get(cv.CAP_PROP_FPS)
-        codec = cv.VideoWriter_fourcc(*'mp4v')
-        out = cv.VideoWriter(str(output_path), codec, fps, (width, height))
-
-        results_array = []
-        # Process each frame
-        while True:
-            ret, frame = cap.read()
-            if not ret or self.cancel_requested:
-                break
-
-            # Infer the frame like an image
-            result_frame, result_json = self._process_image(frame)
-            # Write the frame to the output video
-            out.write(result_frame)
-            # Append the results to the results array
-            results_array.append(result_json)
-            # Emit the progress signal for the progress bar
-            self.progress_signal.emit(cap.get(cv.CAP_PROP_POS_FRAMES) / cap.get(cv.CAP_PROP_FRAME_COUNT), video_path)
-
-        # Release the video capture and the video writer
-        cap.release()
-        out.release()
+        :param output_path: The output video path, None to only save the results.
+        :param results_path: The output results path.
+        """
+        with self._open_video_results(results_path) as results_writer:
+            if self.shared_input is not None:
+                self._process_shared_video(video_path, output_path, results_writer)
+                return
+
+            # Open the video, frames are decoded ahead on a reader thread, the skipped frames are only decoded to be
+            # drawn in the output video
+            with self._open_video_reader(video_path, self.preset) as reader:
+                frames = reader.frames(*self._frame_sampling(self.preset, reader.fps),
+                                       decode_skipped=output_path is not None)
+                with self._open_input(frames) as prefetcher:
+                    self._process_frames(video_path, output_path, results_writer, reader.info, prefetcher)
+
+    def _process_shared_video(self, video_path: Path, output_path: Path | None, results_writer: ResultWriter) -> None:
+        """
+        Processes a single video from the shared input and saves the output.
+        The shared input is made of the items of _read_videos, the video is found by its start marker so the
+        frames left by a previous video are skipped.
+
+        :param video_path: The input video path.
+        :param output_path: The output video path, None to only save the results.
+        :param results_writer: The writer of the results.
+        """
+        for path, kind, data in self.shared_input:
+            if path != video_path:
+                continue
+            if kind == 'error':
+                raise data
+            if kind == 'start':
+                self._process_frames(video_path, output_path, results_writer, data, self._shared_frames())
+                return
 
-        return results_array
+        if self.cancel_requested:
+            return
+        raise IOError(f'Video not found in the shared input: {video_path}')
+
+    def _shared_frames(self) -> Iterator[tuple[np.ndarray, float, bool]]:
+        """
+        Yields copies of the frames of the current video from the shared input, until its end marker.
+
+        :return: An iterator of frames, their position in the video and whether they are sampled.
+        :raises Exception: The decoding error of the video, from its error marker.
+        """
+        for _, kind, data in self.shared_input:
+            if kind == 'error':
+                raise data
+            if kind != 'frame':
+                return
+            frame, position, sampled = data
+            # Shared frames are drawn on a copy, the other weights use them too
+            yield (frame.copy() if self.draws_results else frame), position, sampled
+
+    @staticmethod
+    def _frame_sampling(preset: Preset, fps: float) -> tuple[int, int | None, int]:
+        """
+        Returns the frames of a video to infer, from the time window, frame stride and target FPS of the preset.
+
+        :param preset: The preset.
+        :param fps: The frame rate of the video, 0 if unknown, the time window and target FPS are then ignored.
+        :return: The index of the first frame, the index after the last frame (None for the end of the video) and
+            the number of frames between two inferred frames.
+        """
+        if fps <= 0:
+            return 0, None, preset.frame_stride
+
+        start = round(preset.start_time * fps)
+        end = round(preset.end_time * fps) if preset.end_time > 0 else None
+        stride = preset.frame_stride
+        if preset.target_fps > 0:
+            stride = max(stride, round(fps / preset.target_fps))
+        return start, end, stride
+
+    def _process_frames(self, video_path: Path, output_path: Path | None, results_writer: ResultWriter,
+                        video_info: tuple[int, int, float, float],
+                        frames: Iterable[tuple[np.ndarray, float, bool]]) -> None:
+        """
+        Processes the decoded frames of a video and saves the output.
+        Only the sampled frames are inferred, the other ones are drawn with the results of the last inferred frame.
+
+        :param video_path: The input video path.
+        :param output_path: The output video path, None to only save the results.
+        :param results_writer: The writer of the results, the results of each inferred frame are written in order.
+        :param video_info: The width, height, FPS and frame count of the video.
+        :param frames: The decoded frames, their position in the video and whether they are sampled.
+        """
+        width, height, fps, frame_count = video_info
+
+        # The progress is relative to the time window of the video
+        start, end, _ = self._frame_sampling(self.preset, fps)
+        window_end = min(end, frame_count) if end is not None else frame_count
+        window_size = window_end - start
+        self._last_overlay = None
+
+        # Process each frame, frames are encoded and results are written by a writer thread
+        out = None
+        writer = AsyncWriter(1, self.preset.prefetch_depth)
+        try:
+            if output_path is not None:
+                out = self._open_video_writer(output_path, fps, (width, height))
+
+            for frame, position, sampled in frames:
+                if self.cancel_requested or writer.error is not None:
+                    break
+
+                if sampled:
+                    # Infer the frame like an image
+                    result_frame, result_json = self._process_image(frame)
+                    # Write the results of the frame, with its index in the video
+                    writer.submit(results_writer.write_frame, result_json, int(position) - 1)
+                else:
+                    # Draw the results of the last inferred frame
+                    result_frame = frame
+                    if out is not None and self._last_overlay is not None:
+                        self.renderer.render(frame, **self._last_overlay)
+                # Write the frame to the output video
+                if out is not None:
+                    writer.submit(out.write, result_frame)
+                # Emit the progress signal for the progress bar
+                if window_size > 0:
+                    self.progress_signal.emit(min(1.0, (position - start) / window_size), video_path)
+        finally:
+            # Stop the reader, even if the processing failed, then release the video writer once the pending frames
+            # are written
+            close_reader = getattr(frames, 'close', None)
+            if close_reader is not None:
+                close_reader()
+            writer.close()
+            if out is not None:
+                out.release()
+
+        if writer.error is not None:
+            raise writer.error
+
+    @staticmethod
+    def _open_video_reader(path: Path, preset: Preset) -> VideoReader:
+        """
+        Opens a video for decoding with the video backend of the preset.
+
+        :param path: The video path.
+        :param preset: The preset.
+        :return: The video reader.
+        """
+        return open_video_reader(path, preset.video_backend, preset.video_hw_acceleration, preset.video_threads)
+
+    def _open_video_writer(self, path: Path, fps: float, size: tuple[int, int]) -> VideoWriter:
+        """
+        Opens the output video with the video backend and codec of the preset.
+
+        :param path: The output video path.
+        :param fps: The frame rate.
+        :param size: The width and height of the frames.
+        :return: The video writer.
+        """
+        preset = self.preset
+        return open_video_writer(path, fps, size, preset.video_backend, preset.video_codec,
+                                 preset.video_hw_acceleration, preset.video_threads)
+
+    @staticmethod
+    def _read_videos(inputs: list[Path], preset: Preset) -> Iterator[tuple[Path, str, Any]]:
+        """
+        Decodes the frames of several videos one by one, used as the shared input of the weights.
+        Each video is delimited by a start marker, holding the video properties, and an end marker.
+        A video which can not be opened or decoded ends with an error marker instead, holding the exception, so
+        only this video fails and the next ones are still decoded for all the weights.
+        The frames are sampled with the preset, the skipped frames are only decoded when videos are saved.
+
+        :param inputs: The list of video paths.
+        :param preset: The preset, with the video backend and the frame sampling.
+        :return: An iterator of (video path, 'start', video info), (video path, 'frame', (frame, position, sampled)),
+            (video path, 'end', None) and (video path, 'error', exception) items.
+        """
+        for input_path in inputs:
+            try:
+                with Pipeline._open_video_reader(input_path, preset) as reader:
+                    yield input_path, 'start', reader.info
+                    frames = reader.frames(*Pipeline._frame_sampling(preset, reader.fps),
+                                           decode_skipped=not preset.results_only)
+                    for frame_data in frames:
+                        yield input_path, 'frame', frame_data
+            except Exception as e:
+                yield input_path, 'error', e
+                continue
+            yield input_path, 'end', None
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict] | Detections]:
         """
-        Processes a single image.
+        Processes a single image, as a batch of one image.
 
         :param image: The input image.
         :return: The processed image and the results array.
         """
+        return self._process_images([image])[0]
+
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict] | Detections]]:
+        """
+        Processes a batch of images in a single inference.
+
+        :param images: The input images.
+        :return: The processed image and the results array (or the detections) for each input image.
+        """
         raise NotImplementedError
 
+    def _draw_results(self, image: np.ndarray, **overlay: Any) -> None:
+        """
+        Draws the results of an image with the renderer, they are kept to be drawn on the next frames of a video
+        which are not inferred. When the drawing is deferred, the results are only kept, for the render stage.
+
+        :param image: The image to draw on.
+        :param overlay: The results to draw, the keyword arguments of OverlayRenderer.render.
+        """
+        self._last_overlay = overlay
+        if not self._defer_drawing:
+            self.renderer.render(image, **overlay)
+
+    def _encode_mask(self, polygon: np.ndarray, image_shape: tuple[int, ...]) -> list | dict:
+        """
+        Encodes a segmentation mask for the results, with the mask encoding and simplification tolerance of the preset.
+
+        :param polygon: The (M, 2) points of the mask polygon.
+        :param image_shape: The shape of the image.
+        :return: The encoded mask.
+        """
+        return encode_mask(polygon, self.preset.mask_encoding, self.preset.mask_tolerance, image_shape)
+
+    @staticmethod
+    def _serializable(results_array: list | Detections) -> list:
+        """
+        Converts the detections of an image to dictionaries, when the results are saved.
+
+        :param results_array: The results of an image.
+        :return: The results array with dictionaries only.
+        """
+        if isinstance(results_array, Detections):
+            return results_array.to_dicts()
+        return results_array
+
     def _make_results(self, results_array: list) -> dict:
         """
         Creates the result's dictionary.
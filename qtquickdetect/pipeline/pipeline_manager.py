@@ -1,13 +1,17 @@
 import logging
 import importlib
+import os
 import numpy as np
 
+from collections import deque
 from typing import Optional
 from pathlib import Path
 from PyQt6.QtCore import pyqtSignal, QObject
+from .model_cache import ModelCache
 from .pipeline import Pipeline
 from ..models.app_state import AppState
 from ..models.preset import Preset
+from ..utils.fan_out_reader import FanOutReader
 
 
 class PipelineManager(QObject):
@@ -15,8 +19,8 @@ class PipelineManager(QObject):
     Pipeline Manager class to manage the pipeline execution.
     """
     progress_signal = pyqtSignal(float, Path)  # Progress percentage on the current file, input file
-    finished_file_signal = pyqtSignal(Path, Path, Path)  # Source file, output file, JSON file
-    finished_stream_frame_signal = pyqtSignal(np.ndarray)  # Frame
+    finished_file_signal = pyqtSignal(Path, object, Path)  # Source file, output file (None if results only), JSON file
+    finished_stream_frame_signal = pyqtSignal(np.ndarray, float)  # RGB frame (frame_ring buffer), capture time
     finished_all_signal = pyqtSignal()  # Signal emitted when all files are processed
     error_signal = pyqtSignal(Path, Exception)  # Source file, exception
     fatal_error_signal = pyqtSignal(str, Exception)  # Error message, exception
@@ -35,6 +39,18 @@ class PipelineManager(QObject):
         self._preset: Preset = preset
         self._appstate: AppState = AppState.get_instance()
         self.current_pipeline: Optional[Pipeline] = None
+        self.running_pipelines: list[Pipeline] = []
+        self._pending: deque[tuple[str, str, str]] = deque()
+        self._progress: dict[Pipeline, float] = {}
+        self._images_paths: Optional[list[Path]] = None
+        self._videos_paths: Optional[list[Path]] = None
+        self._results_path: Optional[Path] = None
+        self._failed: bool = False
+        self._max_concurrent: int = 1
+        self._fan_out_reader: Optional[FanOutReader] = None
+
+        # Pipelines borrow their models from the shared cache, sized from the app config
+        ModelCache.get_instance().set_memory_budget(self._appstate.app_config.model_cache_size)
 
         logging.info(f'Pipeline Manager initialized with task: {task}, models: {models}')
 
@@ -56,80 +72,31 @@ class PipelineManager(QObject):
         """
         Public method to request cancellation of the process.
         """
-        if self.current_pipeline:
+        self._pending.clear()
+        for pipeline in self.running_pipelines:
+            pipeline.request_cancel()
+        if self.current_pipeline and self.current_pipeline not in self.running_pipelines:
             self.current_pipeline.request_cancel()
 
-    def run_image(self, images_paths: list[Path], results_path: Path, current_weight_index: int = 0) -> None:
+    def run_image(self, images_paths: list[Path], results_path: Path) -> None:
         """
-        Runs the pipeline, one pipeline per weight. Uses recursion to run the next weight after the current one is done.
+        Runs the pipeline, one pipeline per weight. Up to preset.max_concurrent_pipelines weights run at the same time,
+        the next weight starts when a running one is done.
 
         :param images_paths: List of image paths.
         :param results_path: Path to save the results.
-        :param current_weight_index: Index of the current weight to run.
         """
-        index = 0
-        # Iterate over the models
-        for model, model_builders in self._models.items():
-            # Iterate over the model_builders
-            for model_builder, weights in model_builders.items():
-                for weight in weights:
-                    # Skip if not the current weight
-                    if index != current_weight_index:
-                        index += 1
-                        continue
-
-                    # Setup the pipeline for the current weight
-                    self._setup_pipeline(model, model_builder, weight, images_paths, None, None, results_path)
-                    self._appstate.pipelines.append(self.current_pipeline)
-
-                    # Connect the end signal to run the next weight not at the same time
-                    self.current_pipeline.finished_all_signal.connect(
-                        lambda: self.run_image(images_paths, results_path, current_weight_index + 1)
-                    )
-
-                    # Start the pipeline
-                    self.current_pipeline.start()
-
-                    # Exit the function because the pipeline will run the next weight and we don't want to emit the signal
-                    return
-
-        # If we are here, it means that all weights have been processed
-        self.finished_all_signal.emit()
+        self._schedule(images_paths, None, results_path)
 
-    def run_video(self, videos_paths: list[Path], results_path: Path, current_weight_index: int = 0) -> None:
+    def run_video(self, videos_paths: list[Path], results_path: Path) -> None:
         """
-        Runs the pipeline, one pipeline per weight, for videos. Uses recursion to run the next weight after the current one is done.
+        Runs the pipeline, one pipeline per weight, for videos. Up to preset.max_concurrent_pipelines weights run at
+        the same time, the next weight starts when a running one is done.
 
         :param videos_paths: List of video paths.
         :param results_path: Path to save the results.
-        :param current_weight_index: Index of the current weight to run.
         """
-        index = 0
-        for model, model_builders in self._models.items():
-            for model_builder, weights in model_builders.items():
-                for weight in weights:
-                    # Skip if not the current weight
-                    if index != current_weight_index:
-                        index += 1
-                        continue
-
-                    # Setup the pipeline for the current weight
-                    self._setup_pipeline(model, model_builder, weight, None, videos_paths, None, results_path)
-                    self._appstate.pipelines.append(self.current_pipeline)
-
-                    # Connect the end signal to run the next weight not at the same time
-                    self.current_pipeline.finished_all_signal.connect(
-                        lambda: self.run_video(videos_paths, results_path, current_weight_index + 1)
-                    )
-
-                    # Start the pipeline
-                    self.current_pipeline.start()
-
-                    # Exit the function because the pipeline will run the next weight and we don't want to emit the signal
-                    return
-
-        # If we are here, it means that all weights have been processed
-        self.finished_all_signal.emit()
+        self._schedule(None, videos_paths, results_path)
 
     def run_stream(self, url: str) -> None:
         """
@@ -144,6 +111,124 @@ class PipelineManager(QObject):
         self._appstate.pipelines.append(self.current_pipeline)
         self.current_pipeline.start()
 
+    def _schedule(self, images_paths: list[Path] | None, videos_paths: list[Path] | None, results_path: Path) -> None:
+        """
+        Queues one pipeline per weight and starts as many as the concurrency limit allows.
+        With preset.shared_decoding and several weights, the inputs are decoded once by a fan-out reader and all
+        the weights run at the same time, as each decoded input is given to all of them.
+
+        :param images_paths: List of image paths if processing images.
+        :param videos_paths: List of video paths if processing videos.
+        :param results_path: Path to save the results.
+        """
+        self._images_paths = images_paths
+        self._videos_paths = videos_paths
+        self._results_path = results_path
+        self._failed = False
+        self._pending = deque(
+            (model, model_builder, weight)
+            for model, model_builders in self._models.items()
+            for model_builder, weights in model_builders.items()
+            for weight in weights
+        )
+
+        self._fan_out_reader = None
+        self._max_concurrent = self._preset.max_concurrent_pipelines
+        if self._preset.shared_decoding and len(self._pending) > 1:
+            if images_paths:
+                source = Pipeline._read_images(images_paths)
+            else:
+                source = Pipeline._read_videos(videos_paths, self._preset)
+            self._fan_out_reader = FanOutReader(source, self._preset.prefetch_depth)
+            self._max_concurrent = len(self._pending)
+
+        self._start_pending()
+
+    def _thread_budget(self) -> Optional[int]:
+        """
+        Splits the CPU threads between the pipelines running at the same time.
+
+        :return: The number of intra-op threads per pipeline, None if the pipelines run one at a time.
+        """
+        concurrency = min(self._max_concurrent, len(self.running_pipelines) + len(self._pending))
+        if concurrency <= 1:
+            return None
+        return max(1, (os.cpu_count() or 1) // concurrency)
+
+    def _start_pending(self) -> None:
+        """
+        Starts queued pipelines until the concurrency limit is reached, and emits the end signal once all the
+        pipelines are done.
+        """
+        try:
+            while self._pending and len(self.running_pipelines) < self._max_concurrent:
+                thread_budget = self._thread_budget()
+                model, model_builder, weight = self._pending.popleft()
+
+                self._setup_pipeline(model, model_builder, weight, self._images_paths, self._videos_paths, None,
+                                     self._results_path)
+                pipeline = self.current_pipeline
+                pipeline.thread_budget = thread_budget
+                if self._fan_out_reader is not None:
+                    pipeline.shared_input = self._fan_out_reader.subscribe(lambda p=pipeline: p.cancel_requested)
+                self.running_pipelines.append(pipeline)
+                self._progress[pipeline] = 0.0
+                self._appstate.pipelines.append(pipeline)
+
+                pipeline.finished_all_signal.connect(lambda p=pipeline: self._pipeline_finished(p))
+                pipeline.fatal_error_signal.connect(lambda *_, p=pipeline: self._pipeline_failed(p))
+                pipeline.start()
+        finally:
+            # All the weights subscribed (or failed to load), the shared inputs can be decoded
+            if self._fan_out_reader is not None:
+                self._fan_out_reader.start()
+                self._fan_out_reader = None
+
+        if not self.running_pipelines and not self._failed:
+            self.finished_all_signal.emit()
+
+    def _pipeline_finished(self, pipeline: Pipeline) -> None:
+        """
+        Removes a finished pipeline from the running ones and starts the next queued weight.
+
+        :param pipeline: The finished pipeline.
+        """
+        if pipeline in self.running_pipelines:
+            self.running_pipelines.remove(pipeline)
+        self._progress.pop(pipeline, None)
+        self._start_pending()
+
+    def _pipeline_failed(self, pipeline: Pipeline) -> None:
+        """
+        Stops scheduling the queued weights after a fatal error, the running pipelines are left to finish.
+
+        :param pipeline: The failed pipeline.
+        """
+        self._failed = True
+        self._pending.clear()
+        self._pipeline_finished(pipeline)
+
+    def _aggregate_progress(self, pipeline: Pipeline, progress: float, input_path: Path) -> None:
+        """
+        Re-emits the progress of a pipeline as the sum of the progress of all the running pipelines
+        on their current file, so the progress bar accounts for the files being processed concurrently.
+
+        :param pipeline: The pipeline reporting its progress.
+        :param progress: The progress of the pipeline on its current file.
+        :param input_path: The current file of the pipeline.
+        """
+        self._progress[pipeline] = progress
+        self.progress_signal.emit(sum(self._progress.values()), input_path)
+
+    def _reset_progress(self, pipeline: Pipeline) -> None:
+        """
+        Resets the progress of a pipeline on its current file once the file is done.
+
+        :param pipeline: The pipeline which finished a file.
+        """
+        if pipeline in self._progress:
+            self._progress[pipeline] = 0.0
+
     def _setup_pipeline(self, model: str, model_builder: str, weight: str, images_path: list[Path] | None,
                         videos_path: list[Path] | None, stream_url: str | None, results_path: Path | None) -> None:
         """
@@ -163,7 +248,11 @@ class PipelineManager(QObject):
         model_class = getattr(module, class_name)
         self.current_pipeline = model_class(model, model_builder, weight, self._preset, images_path, videos_path,
                                             stream_url, results_path)
-        self.current_pipeline.progress_signal.connect(self.progress_signal)
+        pipeline = self.current_pipeline
+        self.current_pipeline.progress_signal.connect(
+            lambda progress, input_path: self._aggregate_progress(pipeline, progress, input_path)
+        )
+        self.current_pipeline.finished_file_signal.connect(lambda *_: self._reset_progress(pipeline))
         self.current_pipeline.finished_file_signal.connect(self.finished_file_signal)
         self.current_pipeline.finished_stream_frame_signal.connect(self.finished_stream_frame_signal)
         self.current_pipeline.error_signal.connect(self.error_signal)
@@ -0,0 +1,480 @@
+import json
+import os
+import shutil
+import zipfile
+import numpy as np
+
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Optional
+from .detections import Detections
+
+# File suffix of each result format
+RESULT_SUFFIXES = {
+    'json': '.json',
+    'npz': '.npz'
+}
+
+# File suffix of the results of a video in each result format, they are written frame by frame
+VIDEO_RESULT_SUFFIXES = {
+    'json': '.jsonl',
+    'npz': '.npz'
+}
+
+
+def find_result_file(directory: Path, stem: str) -> Optional[Path]:
+    """
+    Finds the result file of an input in a weight results directory, in any result format.
+
+    :param directory: The results directory of a weight.
+    :param stem: The input file name without suffix.
+    :return: The result file path, None if there is none.
+    """
+    for suffix in dict.fromkeys([*RESULT_SUFFIXES.values(), *VIDEO_RESULT_SUFFIXES.values()]):
+        path = directory / f'{stem}{suffix}'
+        if path.exists():
+            return path
+    return None
+
+
+def _frame_columns(frame: list[dict] | Detections) -> dict[str, list]:
+    """
+    Splits the results of a frame into columns.
+
+    :param frame: The results of a frame, as detections or as the dictionaries of the JSON results.
+    :return: The columns of the frame, as arrays or lists with one item per result.
+    """
+    if isinstance(frame, Detections):
+        return {'boxes': frame.boxes, 'classes': frame.classes, 'confidences': frame.confidences}
+    if len(frame) == 0:
+        return {}
+
+    first = frame[0]
+    columns = {}
+    if 'x1' in first:
+        columns['boxes'] = [(result['x1'], result['y1'], result['x2'], result['y2']) for result in frame]
+    if 'classid' in first:
+        columns['classes'] = [result['classid'] for result in frame]
+    if 'confidence' in first:
+        columns['confidences'] = [result['confidence'] for result in frame]
+    if 'mask' in first:
+        if isinstance(first['mask'], dict):
+            columns['rles'] = [result['mask'] for result in frame]
+        else:
+            columns['masks'] = [np.asarray(result['mask']).reshape(-1, 2) for result in frame]
+    if 'xy' in first:
+        columns['keypoints'] = [result['xy'] for result in frame]
+    return columns
+
+
+class ResultWriter:
+    """
+    Writes the results of a video frame by frame, as they are produced. The results are not kept in memory, and the
+    results of the processed frames are kept when the processing is cancelled.
+    """
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write_frame(self, frame: list[dict] | Detections, index: Optional[int] = None) -> None:
+        """
+        Writes the results of the next frame.
+
+        :param frame: The results of the frame.
+        :param index: The index of the frame in the video, None for the frame following the previous one.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _next_index(indices: array, index: Optional[int]) -> int:
+        """
+        Returns the index of the next frame.
+
+        :param indices: The indices of the frames written so far.
+        :param index: The given index of the frame, None for the frame following the previous one.
+        :return: The frame index.
+        """
+        if index is not None:
+            return index
+        return indices[-1] + 1 if indices else 0
+
+    def close(self) -> None:
+        """
+        Writes the end of the file and closes it.
+        """
+        raise NotImplementedError
+
+
+class JsonLinesResultWriter(ResultWriter):
+    """
+    Writes results in the JSON Lines format: the first line holds the result's dictionary without the results, then
+    each line holds the index of a frame in the video and its results array, as {"frame": ..., "results": [...]}.
+    The last line holds the index of the frames, the byte offset of each frame line so a frame can be read without
+    parsing the previous ones, and the frame indices.
+    Each line is flushed when written, the frames of an interrupted video can still be read.
+    """
+    def __init__(self, path: Path, metadata: dict):
+        """
+        Creates the file and writes the metadata line.
+
+        :param path: The output path.
+        :param metadata: The result's dictionary, without the results.
+        """
+        self._file: BinaryIO = open(path, 'wb')
+        self._position: int = 0
+        self._offsets: array = array('q')
+        self._frame_indices: array = array('q')
+        self._write_line(metadata)
+
+    def _write_line(self, value: dict | list) -> None:
+        """
+        Writes a JSON value on its own line.
+
+        :param value: The JSON value.
+        """
+        line = json.dumps(value).encode() + b'\n'
+        self._file.write(line)
+        self._file.flush()
+        self._position += len(line)
+
+    def write_frame(self, frame: list[dict] | Detections, index: Optional[int] = None) -> None:
+        index = self._next_index(self._frame_indices, index)
+        self._offsets.append(self._position)
+        self._frame_indices.append(index)
+        self._write_line({'frame': index, 'results': frame.to_dicts() if isinstance(frame, Detections) else frame})
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._write_line({'index': self._offsets.tolist(), 'frame_indices': self._frame_indices.tolist()})
+        self._file.close()
+
+
+class NpzResultWriter(ResultWriter):
+    """
+    Writes results in the columnar NPZ format: the results are stored in flat arrays of boxes, class ids,
+    confidences, mask vertices and keypoints, with the number of results of each frame and the number of vertices
+    of each mask. Run-length encoded masks are stored as their shapes and flat run lengths, with the number of runs
+    of each mask. The index of each frame in the video is stored with the frames.
+    The frames are written by chunks, each array of a chunk is stored as '<name>_<chunk index>'.
+    """
+    def __init__(self, path: Path, metadata: dict, per_frame: bool, chunk_size: int = 1024):
+        """
+        Creates the archive and writes the metadata.
+
+        :param path: The output path.
+        :param metadata: The result's dictionary, without the results.
+        :param per_frame: Whether the results are the results of each frame of a video.
+        :param chunk_size: The number of frames kept in memory before they are written.
+        """
+        self._archive: zipfile.ZipFile = zipfile.ZipFile(path, 'w', allowZip64=True)
+        self._chunk_size: int = max(1, chunk_size)
+        self._chunk_count: int = 0
+        self._frames: list[list[dict] | Detections] = []
+        self._frame_indices: array = array('q')
+        self._write_array('metadata', np.array(json.dumps(metadata)))
+        self._write_array('per_frame', np.array(per_frame))
+
+    def _write_array(self, name: str, values: np.ndarray) -> None:
+        """
+        Writes an array to the archive, like np.savez.
+
+        :param name: The array name.
+        :param values: The array.
+        """
+        with self._archive.open(f'{name}.npy', 'w', force_zip64=True) as f:
+            np.lib.format.write_array(f, values, allow_pickle=False)
+
+    def write_frame(self, frame: list[dict] | Detections, index: Optional[int] = None) -> None:
+        self._frame_indices.append(self._next_index(self._frame_indices, index))
+        self._frames.append(frame)
+        if len(self._frames) >= self._chunk_size:
+            self._write_chunk()
+
+    def _write_chunk(self) -> None:
+        """
+        Writes the columns of the pending frames as a chunk.
+        """
+        columns: dict[str, list] = {}
+        for frame in self._frames:
+            for key, values in _frame_columns(frame).items():
+                columns.setdefault(key, []).append(values)
+
+        arrays = {
+            'frame_sizes': np.array([len(frame) for frame in self._frames], dtype=np.int64),
+            'frame_indices': np.array(self._frame_indices[-len(self._frames):], dtype=np.int64)
+        }
+        if 'boxes' in columns:
+            arrays['boxes'] = np.concatenate([np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+                                              for boxes in columns['boxes']])
+        if 'classes' in columns:
+            arrays['classes'] = np.concatenate([np.asarray(classes, dtype=np.int32)
+                                                for classes in columns['classes']])
+        if 'confidences' in columns:
+            arrays['confidences'] = np.concatenate([np.asarray(confidences, dtype=np.float64)
+                                                    for confidences in columns['confidences']])
+        if 'masks' in columns:
+            masks = [mask for frame_masks in columns['masks'] for mask in frame_masks]
+            arrays['mask_sizes'] = np.array([len(mask) for mask in masks], dtype=np.int64)
+            # Integer points are kept as integers, empty masks do not change the type of the points
+            points = np.concatenate([mask for mask in masks if len(mask) > 0] or [np.zeros((0, 2), dtype=np.int32)])
+            arrays['mask_points'] = points.astype(np.int32 if np.issubdtype(points.dtype, np.integer) else np.float32)
+        if 'rles' in columns:
+            rles = [rle for frame_rles in columns['rles'] for rle in frame_rles]
+            arrays['rle_shapes'] = np.array([rle['size'] for rle in rles], dtype=np.int32).reshape(-1, 2)
+            arrays['rle_sizes'] = np.array([len(rle['counts']) for rle in rles], dtype=np.int64)
+            arrays['rle_counts'] = np.concatenate([np.asarray(rle['counts'], dtype=np.int64) for rle in rles])
+        if 'keypoints' in columns:
+            keypoints = [np.asarray(frame_keypoints, dtype=np.int32) for frame_keypoints in columns['keypoints']]
+            keypoint_count = max(frame_keypoints.shape[1] for frame_keypoints in keypoints)
+            arrays['keypoints'] = np.concatenate([frame_keypoints.reshape(-1, keypoint_count, 2)
+                                                  for frame_keypoints in keypoints])
+
+        for name, values in arrays.items():
+            self._write_array(f'{name}_{self._chunk_count}', values)
+        self._chunk_count += 1
+        self._frames = []
+
+    def close(self) -> None:
+        if self._archive.fp is None:
+            return
+        if self._frames:
+            self._write_chunk()
+        self._archive.close()
+
+
+def open_result_writer(path: Path, metadata: dict) -> ResultWriter:
+    """
+    Opens the writer of the results of a video, the format is given by the path suffix.
+
+    :param path: The output path, with a suffix of VIDEO_RESULT_SUFFIXES.
+    :param metadata: The result's dictionary, without the results.
+    :return: The result writer.
+    """
+    if path.suffix == VIDEO_RESULT_SUFFIXES['npz']:
+        return NpzResultWriter(path, metadata, per_frame=True)
+    return JsonLinesResultWriter(path, metadata)
+
+
+def save_npz(path: Path, results: dict, per_frame: bool) -> None:
+    """
+    Saves results in the columnar NPZ format, in a single chunk.
+
+    :param path: The output path.
+    :param results: The result's dictionary, with the results array or detections in 'results', and the index of each
+        frame in 'frame_indices' if only some frames of the video were processed.
+    :param per_frame: Whether the results are the list of the results of each frame of a video.
+    """
+    metadata = {key: value for key, value in results.items() if key not in ('results', 'frame_indices')}
+    frames = results['results'] if per_frame else [results['results']]
+    frame_indices = results.get('frame_indices', range(len(frames)))
+    with NpzResultWriter(path, metadata, per_frame, chunk_size=len(frames)) as writer:
+        for frame, index in zip(frames, frame_indices):
+            writer.write_frame(frame, index)
+
+
+def export_json(result_path: Path, output_path: Path) -> None:
+    """
+    Exports results to an indented JSON file, NPZ results are converted.
+
+    :param result_path: The result file path.
+    :param output_path: The output JSON path.
+    :raises OSError: If the results could not be exported.
+    """
+    if result_path.suffix == RESULT_SUFFIXES['json']:
+        shutil.copyfile(result_path, output_path)
+        return
+    with open(output_path, 'w') as f:
+        json.dump(ResultReader(result_path).to_dict(), f, indent=4)
+
+
+class ResultReader:
+    """
+    Reads the results saved by a pipeline, in the JSON, JSON Lines or NPZ format, with random access to the results
+    of a frame. The results of a frame are returned as the dictionaries of the JSON results.
+    The frames are numbered in the order they were written, frame_indices gives their index in the video.
+    """
+    def __init__(self, path: Path):
+        """
+        Opens a result file, NPZ columns and JSON Lines frames are only loaded when the results are read.
+
+        :param path: The result file path.
+        """
+        self.path: Path = path
+        self.info: dict
+        self.per_frame: bool
+        self.frame_indices: list[int]
+        self._results: Optional[list] = None
+        self._line_offsets: Optional[list[int]] = None
+        self._columns: Optional[dict[str, np.ndarray]] = None
+
+        if path.suffix == RESULT_SUFFIXES['npz']:
+            with np.load(path) as archive:
+                self.info = json.loads(str(archive['metadata']))
+                self.per_frame = bool(archive['per_frame'])
+                frame_sizes = self._concatenate_chunks(archive, 'frame_sizes')
+                frame_indices = self._concatenate_chunks(archive, 'frame_indices')
+            self._offsets: np.ndarray = np.concatenate([[0], np.cumsum(frame_sizes, dtype=np.int64)])
+            # Files written without frame indices hold every frame
+            self.frame_indices = frame_indices.tolist() if len(frame_indices) == len(frame_sizes) \
+                else list(range(len(frame_sizes)))
+        elif path.suffix == VIDEO_RESULT_SUFFIXES['json']:
+            self.per_frame = True
+            self.info, self._line_offsets, self.frame_indices = self._index_lines(path)
+        else:
+            with open(path, 'r') as f:
+                self.info = json.load(f)
+            results = self.info.pop('results')
+            self.per_frame = len(results) > 0 and isinstance(results[0], list)
+            self._results = results if self.per_frame else [results]
+            self.frame_indices = self.info.pop('frame_indices', list(range(len(self._results))))
+
+    def __len__(self) -> int:
+        """
+        :return: The number of frames, 1 for an image.
+        """
+        if self._results is not None:
+            return len(self._results)
+        if self._line_offsets is not None:
+            return len(self._line_offsets)
+        return len(self._offsets) - 1
+
+    @staticmethod
+    def _index_lines(path: Path) -> tuple[dict, list[int], list[int]]:
+        """
+        Reads the metadata and the frame index of a JSON Lines file. If the file has no index, because its writing
+        was interrupted, the index is rebuilt from the complete frame lines.
+
+        :param path: The result file path.
+        :return: The result's dictionary without the results, the byte offset of each frame line and the index of
+            each frame in the video.
+        """
+        with open(path, 'rb') as f:
+            info = json.loads(f.readline())
+            frames_start = f.tell()
+
+            # The index is the last line, read backwards from the end of the file
+            end = f.seek(0, os.SEEK_END)
+            if end > frames_start:
+                line_start = end - 1
+                while line_start > frames_start:
+                    f.seek(max(frames_start, line_start - 65536))
+                    block = f.read(line_start - f.tell())
+                    newline = block.rfind(b'\n')
+                    if newline >= 0:
+                        line_start -= len(block) - newline - 1
+                        break
+                    line_start -= len(block)
+                f.seek(line_start)
+                line = f.readline()
+                if line.startswith(b'{"index":') and line.endswith(b'\n'):
+                    index = json.loads(line)
+                    return info, index['index'], index['frame_indices']
+
+            # No index, only the frame lines written entirely are kept
+            offsets = []
+            frame_indices = []
+            f.seek(frames_start)
+            position = frames_start
+            for line in f:
+                if not line.endswith(b'\n') or not line.startswith(b'{"frame":'):
+                    break
+                offsets.append(position)
+                frame_indices.append(json.loads(line)['frame'])
+                position += len(line)
+            return info, offsets, frame_indices
+
+    @staticmethod
+    def _concatenate_chunks(archive: np.lib.npyio.NpzFile, name: str) -> np.ndarray:
+        """
+        Concatenates the chunks of an array of a NPZ file.
+
+        :param archive: The opened NPZ file.
+        :param name: The array name.
+        :return: The array, empty if the archive has no such array.
+        """
+        chunks = sorted((int(key.rpartition('_')[2]), key) for key in archive.files
+                        if key.rpartition('_')[0] == name)
+        if not chunks:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([archive[key] for _, key in chunks])
+
+    def _load_columns(self) -> dict[str, np.ndarray]:
+        """
+        Loads the result columns of a NPZ file.
+
+        :return: The columns, by name.
+        """
+        if self._columns is None:
+            with np.load(self.path) as archive:
+                names = {key.rpartition('_')[0] for key in archive.files if key.rpartition('_')[2].isdigit()}
+                self._columns = {name: self._concatenate_chunks(archive, name)
+                                 for name in names - {'frame_sizes', 'frame_indices'}}
+            for name in ('mask', 'rle'):
+                if f'{name}_sizes' in self._columns:
+                    sizes = self._columns.pop(f'{name}_sizes')
+                    self._columns[f'{name}_offsets'] = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        return self._columns
+
+    def frame(self, index: int) -> list[dict]:
+        """
+        Returns the results of a frame.
+
+        :param index: The frame index, 0 for an image.
+        :return: The results array of the frame.
+        """
+        if self._results is not None:
+            return self._results[index]
+        if self._line_offsets is not None:
+            with open(self.path, 'rb') as f:
+                f.seek(self._line_offsets[index])
+                return json.loads(f.readline())['results']
+
+        columns = self._load_columns()
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        frame = [{} for _ in range(end - start)]
+
+        # Same keys, in the same order, as the JSON results
+        if 'boxes' in columns:
+            for result, (x1, y1, x2, y2) in zip(frame, columns['boxes'][start:end].tolist()):
+                result.update(x1=x1, y1=y1, x2=x2, y2=y2)
+        if 'mask_offsets' in columns:
+            mask_offsets, mask_points = columns['mask_offsets'], columns['mask_points']
+            for result, mask_index in zip(frame, range(start, end)):
+                result['mask'] = mask_points[mask_offsets[mask_index]:mask_offsets[mask_index + 1]].tolist()
+        if 'rle_offsets' in columns:
+            rle_offsets, rle_counts, rle_shapes = columns['rle_offsets'], columns['rle_counts'], columns['rle_shapes']
+            for result, mask_index in zip(frame, range(start, end)):
+                result['mask'] = {
+                    'size': rle_shapes[mask_index].tolist(),
+                    'counts': rle_counts[rle_offsets[mask_index]:rle_offsets[mask_index + 1]].tolist()
+                }
+        if 'keypoints' in columns:
+            for result, xy in zip(frame, columns['keypoints'][start:end].tolist()):
+                result['xy'] = xy
+        if 'classes' in columns:
+            for result, class_id in zip(frame, columns['classes'][start:end].tolist()):
+                result['classid'] = class_id
+        if 'confidences' in columns:
+            for result, confidence in zip(frame, columns['confidences'][start:end].tolist()):
+                result['confidence'] = confidence
+        return frame
+
+    def to_dict(self) -> dict:
+        """
+        Returns all the results, as the dictionary of the JSON results. The results of a video also hold the index of
+        each frame in the video, in 'frame_indices'.
+
+        :return: The result's dictionary.
+        """
+        if self._line_offsets is not None:
+            with open(self.path, 'rb') as f:
+                f.readline()
+                frames = [json.loads(f.readline())['results'] for _ in range(len(self))]
+        else:
+            frames = [self.frame(index) for index in range(len(self))]
+        if not self.per_frame:
+            return {**self.info, 'results': frames[0]}
+        return {**self.info, 'frame_indices': self.frame_indices, 'results': frames}
@@ -0,0 +1,79 @@
+import importlib
+import os
+import pickle
+import threading
+
+from multiprocessing.synchronize import Event
+from multiprocessing.queues import Queue
+from pathlib import Path
+from ..models.preset import Preset
+
+
+def picklable_exception(exception: Exception) -> Exception:
+    """
+    Returns the exception if it can be sent to another process, otherwise a generic exception with its message.
+
+    :param exception: The exception.
+    :return: A picklable exception.
+    """
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:
+        return Exception(f'{type(exception).__name__}: {exception}')
+
+
+def run_shard(pipeline_class_path: str, model_name: str, model_builder: str, weight: str, preset: Preset,
+              shard_index: int, images_paths: list[Path], results_path: Path, thread_budget: int, events: Queue,
+              cancel_event: Event) -> None:
+    """
+    Runs a pipeline on a shard of an image collection, in a worker process.
+    The pipeline signals are sent to the parent pipeline through the events queue, as (kind, *arguments) tuples:
+    ('file', input, image, json), ('error', input, exception), ('fatal', message, exception) and
+    ('done', shard index).
+
+    :param pipeline_class_path: The module and class name of the pipeline.
+    :param model_name: The model name.
+    :param model_builder: The model builder.
+    :param weight: The weight name.
+    :param preset: The preset of the parent pipeline.
+    :param shard_index: The index of the shard, sent back when it is done.
+    :param images_paths: The image paths of the shard.
+    :param results_path: Path to save the results, the folder holding the results of every weight.
+    :param thread_budget: The number of intra-op CPU threads of the worker.
+    :param events: The queue sending the pipeline signals to the parent process.
+    :param cancel_event: Event set by the parent process when the processing is cancelled.
+    """
+    # The worker does not need Qt, unless the parent main module already imported it
+    os.environ.setdefault('QTQUICKDETECT_HEADLESS', '1')
+
+    import torch
+    torch.set_num_threads(thread_budget)
+
+    try:
+        module_name, class_name = pipeline_class_path.rsplit('.', 1)
+        pipeline_class = getattr(importlib.import_module(module_name), class_name)
+
+        # The worker processes its shard itself
+        preset.worker_processes = 1
+        pipeline = pipeline_class(model_name, model_builder, weight, preset, images_paths, None, None, results_path)
+    except Exception as e:
+        events.put(('fatal', 'Error loading the model in a worker process', picklable_exception(e)))
+        events.put(('done', shard_index))
+        return
+
+    pipeline.finished_file_signal.connect(
+        lambda input_path, image_path, json_path: events.put(('file', input_path, image_path, json_path))
+    )
+    pipeline.error_signal.connect(lambda input_path, e: events.put(('error', input_path, picklable_exception(e))))
+    pipeline.fatal_error_signal.connect(lambda message, e: events.put(('fatal', message, picklable_exception(e))))
+
+    # Forward the cancellation of the parent pipeline
+    def watch_cancel() -> None:
+        cancel_event.wait()
+        pipeline.request_cancel()
+
+    threading.Thread(target=watch_cancel, daemon=True).start()
+
+    pipeline._run_images(images_paths)
+    events.put(('done', shard_index))
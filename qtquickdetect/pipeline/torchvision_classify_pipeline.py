@@ -6,7 +6,6 @@ import torchvision.models as models
 from pathlib import Path
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_classification_label
 from ..utils.filepaths import get_base_data_dir
 
 CLASS_NAMES = models.DenseNet121_Weights.DEFAULT.meta['categories']
@@ -34,40 +33,59 @@ class TorchVisionClassifyPipeline(Pipeline):
         self.device = torch.device(self.preset.device)
         self.transform = T.Compose([T.ToTensor()])
 
-        if weight in ['IMAGENET1K_V1', 'IMAGENET1K_V2', 'IMAGENET1K_SWAG_E2E_V1', 'IMAGENET1K_SWAG_LINEAR_V1', 'DEFAULT']:
-            self.model = getattr(models, model_builder)(weights=weight).to(self.device)
+        self.model = self._load_model(self._build_model)
+
+    def _build_model(self) -> torch.nn.Module:
+        """
+        Builds the TorchVision model and loads its weights.
+
+        :return: The model in evaluation mode.
+        """
+        if self.weight in ['IMAGENET1K_V1', 'IMAGENET1K_V2', 'IMAGENET1K_SWAG_E2E_V1', 'IMAGENET1K_SWAG_LINEAR_V1', 'DEFAULT']:
+            model = getattr(models, self.model_builder)(weights=self.weight).to(self.device)
         else:  # Custom weights
-            self.model = getattr(models, model_builder)(weights=None).to(self.device)
-            self.model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / weight))
-        self.model.eval()
+            model = getattr(models, self.model_builder)(weights=None).to(self.device)
+            model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / self.weight))
+        model.eval()
+        return model
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with TorchVision classification.
+        Processes a batch of images with TorchVision classification.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Preprocess image
-        image_tensor = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            predictions = self.model(image_tensor)[0].squeeze().softmax(0)
-
-        top5_probs, top5_indices = torch.topk(predictions, 5)
-        results_array = []
-        # Process top 5 predictions
-        for i in range(5):
-            class_id = top5_indices[i].item()
-            confidence = top5_probs[i].item()
-            class_name = CLASS_NAMES[class_id]
-            draw_classification_label(image, class_name, confidence, self.preset, i)
-
-            results_array.append({
-                'classid': class_id,
-                'confidence': confidence
-            })
-
-        return image, results_array
+        # Preprocess images, they can only be stacked in a single batch if they share the same size
+        image_tensors = [self.transform(image) for image in images]
+        if all(tensor.shape == image_tensors[0].shape for tensor in image_tensors):
+            batches = [torch.stack(image_tensors)]
+        else:
+            batches = [tensor.unsqueeze(0) for tensor in image_tensors]
+
+        with self.model_lock, torch.no_grad():
+            predictions = torch.cat([self.model(batch.to(self.device)) for batch in batches]).softmax(1)
+
+        outputs = []
+        for image, image_predictions in zip(images, predictions):
+            top5_probs, top5_indices = torch.topk(image_predictions, 5)
+            results_array = []
+            # Process top 5 predictions
+            for i in range(5):
+                class_id = top5_indices[i].item()
+                confidence = top5_probs[i].item()
+
+                results_array.append({
+                    'classid': class_id,
+                    'confidence': confidence
+                })
+
+            if self.draws_results:
+                self._draw_results(image, labels=[CLASS_NAMES[result['classid']] for result in results_array],
+                                   label_confidences=[result['confidence'] for result in results_array])
+            outputs.append((image, results_array))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
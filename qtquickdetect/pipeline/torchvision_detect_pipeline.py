@@ -5,8 +5,8 @@ import torchvision.models as models
 
 from pathlib import Path
 from ..models.preset import Preset
+from ..pipeline.detections import Detections
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_bounding_box
 from ..utils.filepaths import get_base_data_dir
 
 # COCO classes used for TorchVision models
@@ -27,6 +27,27 @@ CLASS_NAMES = [
 ]
 
 
+def detection_thresholds(model_builder: str, preset: Preset) -> dict:
+    """
+    Returns the keyword arguments of a TorchVision detection model builder setting its confidence threshold and its
+    maximum number of detections per image.
+
+    :param model_builder: The model builder name.
+    :param preset: The preset holding the confidence threshold and the maximum number of detections.
+    :return: The keyword arguments of the builder.
+    """
+    # R-CNN models prune the boxes in their box head, RetinaNet, FCOS and SSD models in their post-processing
+    if 'rcnn' in model_builder:
+        return {
+            'box_score_thresh': preset.confidence_threshold,
+            'box_detections_per_img': preset.max_detections
+        }
+    return {
+        'score_thresh': preset.confidence_threshold,
+        'detections_per_img': preset.max_detections
+    }
+
+
 class TorchVisionDetectPipeline(Pipeline):
     """
     Pipeline for detecting objects in images and videos using TorchVision models with pre-trained weights.
@@ -49,53 +70,55 @@ class TorchVisionDetectPipeline(Pipeline):
         self.device = torch.device(self.preset.device)
         self.transform = T.Compose([T.ToTensor()])
 
-        if weight in ['COCO_V1', 'DEFAULT']:
-            self.model = getattr(models.detection, model_builder)(weights=weight).to(self.device)
+        self.model = self._load_model(self._build_model)
+
+    def _model_key(self) -> tuple:
+        """
+        Returns the key identifying the model in the model cache, the thresholds are part of the built model.
+
+        :return: The model key.
+        """
+        return super()._model_key() + (self.preset.confidence_threshold, self.preset.max_detections)
+
+    def _build_model(self) -> torch.nn.Module:
+        """
+        Builds the TorchVision model and loads its weights.
+
+        :return: The model in evaluation mode.
+        """
+        # The thresholds are applied inside the model, before the heads and the post-processing
+        thresholds = detection_thresholds(self.model_builder, self.preset)
+        if self.weight in ['COCO_V1', 'DEFAULT']:
+            model = getattr(models.detection, self.model_builder)(weights=self.weight, **thresholds).to(self.device)
         else:  # Custom weights
-            self.model = getattr(models.detection, model_builder)(weights=None).to(self.device)
-            self.model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / weight))
-        self.model.eval()
+            model = getattr(models.detection, self.model_builder)(weights=None, **thresholds).to(self.device)
+            model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / self.weight))
+        model.eval()
+        return model
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, Detections]]:
         """
-        Processes a single image with TorchVision detection.
+        Processes a batch of images with TorchVision detection.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the detections for each input image.
         """
-        # Inference
-        image_tensor = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            predictions = self.model(image_tensor)[0]
-
-        results_array = []
-        # For each box in the result
-        for i in range(len(predictions['labels'])):
-            # Extract box information
-            box = predictions['boxes'][i].cpu().numpy()
-            label = int(predictions['labels'][i].item())
-            score = predictions['scores'][i].item()
-
-            # Temp, threshold
-            if score < 0.3:
-                continue
-
-            draw_bounding_box(
-                image, (int(box[0]), int(box[1])), (int(box[2]), int(box[3])), CLASS_NAMES[label], label, score,
-                self.preset
-            )
-
-            # Append the box to the results array
-            results_array.append({
-                'x1': int(box[0]),
-                'y1': int(box[1]),
-                'x2': int(box[2]),
-                'y2': int(box[3]),
-                'classid': label,
-                'confidence': score,
-            })
-
-        return image, results_array
+        # Inference, detection models take a list of tensors of any size
+        image_tensors = [self.transform(image).to(self.device) for image in images]
+        with self.model_lock, torch.no_grad():
+            batch_predictions = self.model(image_tensors)
+
+        outputs = []
+        for image, predictions in zip(images, batch_predictions):
+            detections = Detections.from_tensors(predictions['boxes'], predictions['labels'], predictions['scores'])
+
+            if self.draws_results:
+                self._draw_results(image, boxes=detections.boxes, classes=detections.classes,
+                                   confidences=detections.confidences, class_names=CLASS_NAMES)
+
+            outputs.append((image, detections))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
@@ -6,7 +6,7 @@ import torchvision.models as models
 from pathlib import Path
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_keypoints
+from ..pipeline.torchvision_detect_pipeline import detection_thresholds
 from ..utils.filepaths import get_base_data_dir
 
 
@@ -32,42 +32,63 @@ class TorchVisionPosePipeline(Pipeline):
         self.device = torch.device(self.preset.device)
         self.transform = T.Compose([T.ToTensor()])
 
-        if weight in ['COCO_V1', 'COCO_LEGACY', 'DEFAULT']:
-            self.model = getattr(models.detection, model_builder)(weights=weight).to(self.device)
+        self.model = self._load_model(self._build_model)
+
+    def _model_key(self) -> tuple:
+        """
+        Returns the key identifying the model in the model cache, the thresholds are part of the built model.
+
+        :return: The model key.
+        """
+        return super()._model_key() + (self.preset.confidence_threshold, self.preset.max_detections)
+
+    def _build_model(self) -> torch.nn.Module:
+        """
+        Builds the TorchVision model and loads its weights.
+
+        :return: The model in evaluation mode.
+        """
+        # The thresholds are applied inside the model, before the heads and the post-processing
+        thresholds = detection_thresholds(self.model_builder, self.preset)
+        if self.weight in ['COCO_V1', 'COCO_LEGACY', 'DEFAULT']:
+            model = getattr(models.detection, self.model_builder)(weights=self.weight, **thresholds).to(self.device)
         else:  # Custom weights
-            self.model = getattr(models.detection, model_builder)(weights=None).to(self.device)
-            self.model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / weight))
-        self.model.eval()
+            model = getattr(models.detection, self.model_builder)(weights=None, **thresholds).to(self.device)
+            model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / self.weight))
+        model.eval()
+        return model
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with TorchVision posing.
+        Processes a batch of images with TorchVision posing.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Preprocess image
-        image_tensor = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            predictions = self.model(image_tensor)[0]
-
-        results_array = []
-        keypoints = predictions['keypoints'].cpu().numpy()
-        scores = predictions['scores'].cpu().numpy()
-        # For each pose in the result
-        for i in range(len(keypoints)):
-            if scores[i] < self.preset.iou_threshold:
-                continue
-
-            xy = [(int(keypoint[0]), int(keypoint[1])) for keypoint in keypoints[i]]
-            draw_keypoints(image, xy, self.preset)
-
-            results_array.append({
-                'xy': xy,
-                'confidence': float(scores[i])
-            })
-
-        return image, results_array
+        # Preprocess images, detection models take a list of tensors of any size
+        image_tensors = [self.transform(image).to(self.device) for image in images]
+        with self.model_lock, torch.no_grad():
+            batch_predictions = self.model(image_tensors)
+
+        outputs = []
+        for image, predictions in zip(images, batch_predictions):
+            results_array = []
+            keypoints = predictions['keypoints'].cpu().numpy()
+            scores = predictions['scores'].cpu().numpy()
+            # For each pose in the result
+            for i in range(len(keypoints)):
+                xy = [(int(keypoint[0]), int(keypoint[1])) for keypoint in keypoints[i]]
+
+                results_array.append({
+                    'xy': xy,
+                    'confidence': float(scores[i])
+                })
+
+            if self.draws_results:
+                self._draw_results(image, keypoints=keypoints[:, :, :2].astype(int))
+            outputs.append((image, results_array))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
@@ -7,7 +7,7 @@ import cv2 as cv
 from pathlib import Path
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_segmentation_mask_from_points
+from ..pipeline.torchvision_detect_pipeline import detection_thresholds
 from ..utils.filepaths import get_base_data_dir
 
 # COCO classes used for TorchVision models
@@ -49,56 +49,83 @@ class TorchVisionSegmentPipeline(Pipeline):
         self.device = torch.device(self.preset.device)
         self.transform = T.Compose([T.ToTensor()])
 
-        if weight in ['COCO_V1', 'DEFAULT']:
-            self.model = getattr(models.detection, model_builder)(weights=weight).to(self.device)
+        self.model = self._load_model(self._build_model)
+
+    def _model_key(self) -> tuple:
+        """
+        Returns the key identifying the model in the model cache, the thresholds are part of the built model.
+
+        :return: The model key.
+        """
+        return super()._model_key() + (self.preset.confidence_threshold, self.preset.max_detections)
+
+    def _build_model(self) -> torch.nn.Module:
+        """
+        Builds the TorchVision model and loads its weights.
+
+        :return: The model in evaluation mode.
+        """
+        # The thresholds are applied inside the model, before the heads and the post-processing
+        thresholds = detection_thresholds(self.model_builder, self.preset)
+        if self.weight in ['COCO_V1', 'DEFAULT']:
+            model = getattr(models.detection, self.model_builder)(weights=self.weight, **thresholds).to(self.device)
         else:  # Custom weights
-            self.model = getattr(models.detection, model_builder)(weights=None).to(self.device)
-            self.model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / weight))
-        self.model.eval()
+            model = getattr(models.detection, self.model_builder)(weights=None, **thresholds).to(self.device)
+            model.load_state_dict(torch.load(get_base_data_dir() / 'weights' / self.weight))
+        model.eval()
+        return model
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with TorchVision detection and segmentation.
+        Processes a batch of images with TorchVision detection and segmentation.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Inference
-        image_tensor = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            predictions = self.model(image_tensor)[0]
-
-        results_array = []
-        for i in range(len(predictions['labels'])):
-            box = predictions['boxes'][i].cpu().numpy()
-            label = int(predictions['labels'][i])
-            score = predictions['scores'][i].item()
-            if score < 0.5:
-                continue
-
-            # Extract mask
-            mask = predictions['masks'][i, 0].cpu().numpy()
-            mask = mask > 0.5
-
-            # Extract polygon from mask
-            contours, _ = cv.findContours((mask * 255).astype(np.uint8), cv.RETR_TREE, cv.CHAIN_APPROX_SIMPLE)
-            polygons = [contour.astype(np.float32).squeeze(axis=1).tolist() for contour in contours]
-            polygon = max(polygons, key=lambda x: len(x))
-
-            draw_segmentation_mask_from_points(image, polygon, label, self.preset)
-
-            # Append the box to the results array
-            results_array.append({
-                'x1': int(box[0]),
-                'y1': int(box[1]),
-                'x2': int(box[2]),
-                'y2': int(box[3]),
-                'mask': polygon,
-                'classid': label,
-                'confidence': score,
-            })
-
-        return image, results_array
+        # Inference, detection models take a list of tensors of any size
+        image_tensors = [self.transform(image).to(self.device) for image in images]
+        with self.model_lock, torch.no_grad():
+            batch_predictions = self.model(image_tensors)
+
+        outputs = []
+        for image, predictions in zip(images, batch_predictions):
+            results_array = []
+            mask_polygons, classes = [], []
+            for i in range(len(predictions['labels'])):
+                box = predictions['boxes'][i].cpu().numpy()
+                label = int(predictions['labels'][i])
+                score = predictions['scores'][i].item()
+
+                # Extract mask
+                mask = predictions['masks'][i, 0].cpu().numpy()
+                mask = mask > 0.5
+
+                # Extract polygon from mask
+                contours, _ = cv.findContours((mask * 255).astype(np.uint8), cv.RETR_TREE, cv.CHAIN_APPROX_SIMPLE)
+                if not contours:
+                    # No pixel of the mask is above the threshold
+                    continue
+                polygon = max(contours, key=len).reshape(-1, 2).astype(np.float32)
+
+                mask_polygons.append(polygon)
+                classes.append(label)
+
+                # Append the box to the results array
+                results_array.append({
+                    'x1': int(box[0]),
+                    'y1': int(box[1]),
+                    'x2': int(box[2]),
+                    'y2': int(box[3]),
+                    'mask': self._encode_mask(polygon, image.shape),
+                    'classid': label,
+                    'confidence': score,
+                })
+
+            if self.draws_results:
+                self._draw_results(image, classes=np.array(classes, dtype=int), polygons=mask_polygons)
+            outputs.append((image, results_array))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
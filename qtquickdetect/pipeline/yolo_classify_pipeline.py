@@ -5,7 +5,6 @@ from pathlib import Path
 from ultralytics import YOLO
 
 from ..utils.filepaths import get_base_data_dir
-from ..utils.image_helpers import draw_classification_label
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
 
@@ -32,34 +31,40 @@ class YoloClassifyPipeline(Pipeline):
         super().__init__(model_name, model_builder, weight, preset, images_paths, videos_paths, stream_url,
                          results_path)
         self.device = torch.device(self.preset.device)
-        self.model = YOLO(get_base_data_dir() / 'weights' / weight).to(self.device)
+        self.model = self._load_model(lambda: YOLO(get_base_data_dir() / 'weights' / weight).to(self.device))
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with YoloV8 classification.
+        Processes a batch of images with YoloV8 classification.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Inference
-        result = self.model(image, half=(self.device.type == 'cuda' and self.preset.half_precision),
-                            verbose=False, iou=self.preset.iou_threshold)[0].cpu()
+        # Inference on the whole batch
+        with self.model_lock:
+            results = self.model(images, half=(self.device.type == 'cuda' and self.preset.half_precision),
+                                 verbose=False, iou=self.preset.iou_threshold)
 
-        top5_classe_ids = result.probs.top5
-        top5_confidences = result.probs.top5conf
-        top5_classe_names = [self.model.names[int(class_id)] for class_id in top5_classe_ids]
+        outputs = []
+        for image, result in zip(images, results):
+            result = result.cpu()
+            top5_classe_ids = result.probs.top5
+            top5_confidences = result.probs.top5conf
+            top5_classe_names = [self.model.names[int(class_id)] for class_id in top5_classe_ids]
 
-        results_array = []
-        # add top 5 classes to results array
-        for i in range(5):
-            draw_classification_label(image, top5_classe_names[i], top5_confidences[i], self.preset, i)
+            results_array = []
+            # add top 5 classes to results array
+            for i in range(5):
+                results_array.append({
+                    'classid': int(top5_classe_ids[i]),
+                    'confidence': float(top5_confidences[i])
+                })
 
-            results_array.append({
-                'classid': int(top5_classe_ids[i]),
-                'confidence': float(top5_confidences[i])
-            })
+            if self.draws_results:
+                self._draw_results(image, labels=top5_classe_names, label_confidences=top5_confidences.tolist())
+            outputs.append((image, results_array))
 
-        return image, results_array
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
@@ -6,8 +6,8 @@ from ultralytics import YOLO
 
 from ..utils.filepaths import get_base_data_dir
 from ..models.preset import Preset
+from ..pipeline.detections import Detections
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_bounding_box
 
 
 class YoloDetectPipeline(Pipeline):
@@ -30,44 +30,33 @@ class YoloDetectPipeline(Pipeline):
         super().__init__(model_name, model_builder, weight, preset, images_paths, videos_paths, stream_url,
                          results_path)
         self.device = torch.device(self.preset.device)
-        self.model = YOLO(get_base_data_dir() / 'weights' / weight).to(self.device)
+        self.model = self._load_model(lambda: YOLO(get_base_data_dir() / 'weights' / weight).to(self.device))
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, Detections]]:
         """
-        Processes a single image with YoloV8 detection.
+        Processes a batch of images with YoloV8 detection.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the detections for each input image.
         """
-        # Inference
-        result = self.model(image, half=(self.device.type == 'cuda' and self.preset.half_precision),
-                            verbose=False, iou=self.preset.iou_threshold)[0].cpu()
+        # Inference on the whole batch
+        with self.model_lock:
+            results = self.model(images, half=(self.device.type == 'cuda' and self.preset.half_precision),
+                                 verbose=False, iou=self.preset.iou_threshold,
+                                 conf=self.preset.confidence_threshold, max_det=self.preset.max_detections)
 
-        results_array = []
-        # For each box in the result
-        for box in result.boxes:
-            # Extract box information
-            flat = box.xyxy.flatten()
-            top_left, bottom_right = (int(flat[0]), int(flat[1])), (int(flat[2]), int(flat[3]))
-            class_id, class_name = int(box.cls), self.model.names[int(box.cls)]
-            conf = float(box.conf[0])
+        outputs = []
+        for image, result in zip(images, results):
+            boxes = result.boxes
+            detections = Detections.from_tensors(boxes.xyxy, boxes.cls, boxes.conf)
 
-            draw_bounding_box(
-                image, top_left, bottom_right, class_name, class_id, conf,
-                self.preset
-            )
+            if self.draws_results:
+                self._draw_results(image, boxes=detections.boxes, classes=detections.classes,
+                                   confidences=detections.confidences, class_names=self.model.names)
 
-            # Append the box to the results array
-            results_array.append({
-                'x1': top_left[0],
-                'y1': top_left[1],
-                'x2': bottom_right[0],
-                'y2': bottom_right[1],
-                'classid': class_id,
-                'confidence': conf,
-            })
+            outputs.append((image, detections))
 
-        return image, results_array
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
@@ -5,7 +5,6 @@ from pathlib import Path
 from ultralytics import YOLO
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_keypoints
 from ..utils.filepaths import get_base_data_dir
 
 
@@ -29,32 +28,39 @@ class YoloPosePipeline(Pipeline):
         super().__init__(model_name, model_builder, weight, preset, images_paths, videos_paths, stream_url,
                          results_path)
         self.device = torch.device(self.preset.device)
-        self.model = YOLO(get_base_data_dir() / 'weights' / weight).to(self.device)
+        self.model = self._load_model(lambda: YOLO(get_base_data_dir() / 'weights' / weight).to(self.device))
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with YoloV8 detection.
+        Processes a batch of images with YoloV8 posing.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Inference
-        result = self.model(image, half=(self.device.type == 'cuda' and self.preset.half_precision),
-                            verbose=False, iou=self.preset.iou_threshold)[0].cpu()
+        # Inference on the whole batch
+        with self.model_lock:
+            results = self.model(images, half=(self.device.type == 'cuda' and self.preset.half_precision),
+                                 verbose=False, iou=self.preset.iou_threshold,
+                                 conf=self.preset.confidence_threshold, max_det=self.preset.max_detections)
 
-        results_array = []
-        # For each pose in the result
-        for pose in result:
-            # Draw keypoints
-            xy = [(int(xy[0]), int(xy[1])) for xy in pose.keypoints[0].xy[0]]
-            draw_keypoints(image, xy, self.preset)
+        outputs = []
+        for image, result in zip(images, results):
+            result = result.cpu()
+            results_array = []
+            # For each pose in the result
+            for pose in result:
+                xy = [(int(xy[0]), int(xy[1])) for xy in pose.keypoints[0].xy[0]]
 
-            results_array.append({
-                'xy': xy,
-                'confidence': np.mean([float(conf) for conf in pose.keypoints[0].conf[0]])
-            })
+                results_array.append({
+                    'xy': xy,
+                    'confidence': np.mean([float(conf) for conf in pose.keypoints[0].conf[0]])
+                })
 
-        return image, results_array
+            if self.draws_results:
+                self._draw_results(image, keypoints=np.array([result['xy'] for result in results_array], dtype=int))
+            outputs.append((image, results_array))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
@@ -5,7 +5,6 @@ from pathlib import Path
 from ultralytics import YOLO
 from ..models.preset import Preset
 from ..pipeline.pipeline import Pipeline
-from ..utils.image_helpers import draw_segmentation_mask_from_points
 from ..utils.filepaths import get_base_data_dir
 
 
@@ -29,42 +28,53 @@ class YoloSegmentPipeline(Pipeline):
         super().__init__(model_name, model_builder, weight, preset, images_paths, videos_paths, stream_url,
                          results_path)
         self.device = torch.device(self.preset.device)
-        self.model = YOLO(get_base_data_dir() / 'weights' / weight).to(self.device)
+        self.model = self._load_model(lambda: YOLO(get_base_data_dir() / 'weights' / weight).to(self.device))
 
-    def _process_image(self, image: np.ndarray) -> tuple[np.ndarray, list[dict]]:
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
         """
-        Processes a single image with YoloV8 segmentation.
+        Processes a batch of images with YoloV8 segmentation.
 
-        :param image: The input image.
-        :return: The processed image and the results array.
+        :param images: The input images.
+        :return: The processed image and the results array for each input image.
         """
-        # Inference
-        result = self.model(image, half=(self.device.type == 'cuda' and self.preset.half_precision),
-                            verbose=False, iou=self.preset.iou_threshold)[0].cpu()
+        # Inference on the whole batch
+        with self.model_lock:
+            results = self.model(images, half=(self.device.type == 'cuda' and self.preset.half_precision),
+                                 verbose=False, iou=self.preset.iou_threshold,
+                                 conf=self.preset.confidence_threshold, max_det=self.preset.max_detections)
 
-        results_array = []
-        # For each box in the result
-        for index, box in enumerate(result.boxes):
-            # Extract box information
-            flat = box.xyxy.flatten()
-            top_left, bottom_right = (int(flat[0]), int(flat[1])), (int(flat[2]), int(flat[3]))
-            class_id, class_name = int(box.cls), self.model.names[int(box.cls)]
-            conf = float(box.conf[0])
+        outputs = []
+        for image, result in zip(images, results):
+            result = result.cpu()
+            results_array = []
+            polygons, classes = [], []
+            # For each box in the result
+            for index, box in enumerate(result.boxes):
+                # Extract box information
+                flat = box.xyxy.flatten()
+                top_left, bottom_right = (int(flat[0]), int(flat[1])), (int(flat[2]), int(flat[3]))
+                class_id, class_name = int(box.cls), self.model.names[int(box.cls)]
+                conf = float(box.conf[0])
 
-            draw_segmentation_mask_from_points(image, result.masks.xy[index], class_id, self.preset)
+                polygons.append(result.masks.xy[index])
+                classes.append(class_id)
 
-            # Append the box to the results array
-            results_array.append({
-                'x1': top_left[0],
-                'y1': top_left[1],
-                'x2': bottom_right[0],
-                'y2': bottom_right[1],
-                'mask': result.masks.xy[index].tolist(),
-                'classid': class_id,
-                'confidence': conf,
-            })
+                # Append the box to the results array
+                results_array.append({
+                    'x1': top_left[0],
+                    'y1': top_left[1],
+                    'x2': bottom_right[0],
+                    'y2': bottom_right[1],
+                    'mask': self._encode_mask(result.masks.xy[index], image.shape),
+                    'classid': class_id,
+                    'confidence': conf,
+                })
 
-        return image, results_array
+            if self.draws_results:
+                self._draw_results(image, classes=np.array(classes, dtype=int), polygons=polygons)
+            outputs.append((image, results_array))
+
+        return outputs
 
     def _make_results(self, results_array: list) -> dict:
         """
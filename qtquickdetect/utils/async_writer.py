@@ -0,0 +1,61 @@
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class AsyncWriter:
+    """
+    Runs write jobs (encoding and disk writes) on a pool of writer threads, off the inference thread.
+    The number of pending jobs is bounded, submitting a job blocks while the writers are saturated.
+    With a single worker, the jobs are executed in submission order.
+    """
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Initializes the AsyncWriter.
+
+        :param workers: The number of writer threads.
+        :param max_pending: The maximum number of submitted jobs not yet finished.
+        """
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                                                thread_name_prefix='writer')
+        self._slots: threading.Semaphore = threading.Semaphore(max(1, max_pending))
+        self._error_lock: threading.Lock = threading.Lock()
+        self.error: Optional[BaseException] = None
+
+    def __enter__(self) -> 'AsyncWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def submit(self, job: Callable, *args) -> Future:
+        """
+        Submits a write job, blocks until a pending slot is free.
+
+        :param job: The function to run on a writer thread.
+        :param args: The arguments of the function.
+        :return: The future of the job.
+        """
+        self._slots.acquire()
+        future = self._executor.submit(job, *args)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def close(self) -> None:
+        """
+        Waits for all the submitted jobs to finish and stops the writer threads.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _job_done(self, future: Future) -> None:
+        """
+        Frees the pending slot of a finished job and keeps the first error raised by a job.
+
+        :param future: The future of the finished job.
+        """
+        self._slots.release()
+        if future.exception() is not None:
+            with self._error_lock:
+                if self.error is None:
+                    self.error = future.exception()
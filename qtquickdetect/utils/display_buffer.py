@@ -0,0 +1,115 @@
+import time
+import numpy as np
+
+from collections import deque
+from typing import Callable, Optional
+
+# Display policies of the stream frames
+DISPLAY_POLICIES = ['latest', 'smooth', 'paced']
+
+
+class DisplayBuffer:
+    """
+    Buffer between the stream frames delivered by the pipeline and the display, which decides when each frame is
+    shown from its capture time, depending on the display policy:
+
+    - latest: the newest frame is shown as soon as possible, the older ones are dropped, for the lowest latency.
+    - smooth: jitter buffer, each frame is shown a fixed delay after its capture, so the irregular inference and
+      delivery times do not make the frames stutter. Frames arriving after their display time are shown at once.
+    - paced: each frame is shown after its capture with the highest delay recently measured between the capture and
+      the delivery of the frames, so the frames keep the spacing of their capture with the lowest steady delay.
+
+    When several frames are due, only the newest one is shown. The frames not shown are given to the release
+    callback, like the frames shown by the display.
+    """
+    def __init__(self, policy: str, delay: float, release: Callable[[np.ndarray], None], max_frames: int = 30,
+                 window: int = 30):
+        """
+        Initializes the buffer.
+
+        :param policy: The display policy, 'latest', 'smooth' or 'paced'.
+        :param delay: The delay between the capture and the display of the frames with the smooth policy, in seconds.
+        :param release: The function called with the frames dropped before being displayed.
+        :param max_frames: The maximum number of buffered frames, the oldest frame is dropped beyond it.
+        :param window: The number of frames over which the delivery delay is measured with the paced policy.
+        """
+        if policy not in DISPLAY_POLICIES:
+            raise ValueError(f'Unknown display policy: {policy}')
+        self.policy: str = policy
+        self.delay: float = delay
+        self._release: Callable[[np.ndarray], None] = release
+        self._frames: deque[tuple[np.ndarray, float]] = deque()
+        self._max_frames: int = max(1, max_frames)
+        self._delivery_delays: deque[float] = deque(maxlen=max(1, window))
+        # Number of frames dropped before being displayed
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        """
+        :return: The number of buffered frames.
+        """
+        return len(self._frames)
+
+    def put(self, frame: np.ndarray, frame_time: float, now: Optional[float] = None) -> None:
+        """
+        Buffers a frame delivered by the pipeline.
+
+        :param frame: The frame.
+        :param frame_time: The time.monotonic() capture time of the frame.
+        :param now: The current time.monotonic() time, the delivery time of the frame.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._delivery_delays.append(now - frame_time)
+
+        if self.policy == 'latest' or len(self._frames) == self._max_frames:
+            self._drop(len(self._frames) if self.policy == 'latest' else 1)
+        self._frames.append((frame, frame_time))
+
+    def take(self, now: Optional[float] = None) -> Optional[tuple[np.ndarray, float]]:
+        """
+        Takes the frame to display, the newest of the frames due, dropping the older ones.
+
+        :param now: The current time.monotonic() time.
+        :return: The frame and its capture time, None if no frame is due yet.
+        """
+        if now is None:
+            now = time.monotonic()
+        delay = self.display_delay()
+
+        due = 0
+        while due < len(self._frames) and self._frames[due][1] + delay <= now:
+            due += 1
+        if due == 0:
+            return None
+
+        self._drop(due - 1)
+        return self._frames.popleft()
+
+    def display_delay(self) -> float:
+        """
+        :return: The delay between the capture and the display of the frames, in seconds, 0 for the newest frame
+            as soon as possible.
+        """
+        if self.policy == 'smooth':
+            return self.delay
+        if self.policy == 'paced' and self._delivery_delays:
+            return max(self._delivery_delays)
+        return 0.0
+
+    def clear(self) -> None:
+        """
+        Drops all the buffered frames.
+        """
+        self._drop(len(self._frames))
+
+    def _drop(self, count: int) -> None:
+        """
+        Drops the oldest buffered frames.
+
+        :param count: The number of frames to drop.
+        """
+        for _ in range(count):
+            frame, _ = self._frames.popleft()
+            self._release(frame)
+            self.dropped += 1
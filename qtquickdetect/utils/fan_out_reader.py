@@ -0,0 +1,142 @@
+import queue
+import threading
+
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Marker put in the queues when the source is exhausted
+_END = object()
+
+
+class FanOutSubscription:
+    """
+    The items of a FanOutReader delivered to one consumer, in order, through a bounded queue.
+    The items are shared with the other consumers and must not be modified in place.
+    """
+    def __init__(self, depth: int, cancel_requested: Callable[[], bool]):
+        """
+        Initializes the subscription.
+
+        :param depth: The maximum number of items buffered ahead of the consumer.
+        :param cancel_requested: Callable returning True when the consumer has been cancelled.
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self._cancel_requested: Callable[[], bool] = cancel_requested
+        self._closed_event: threading.Event = threading.Event()
+
+    def __enter__(self) -> 'FanOutSubscription':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the next items of the source, until the source is exhausted or the consumer is stopped.
+        Iterating again after a break resumes after the last yielded item.
+        Exceptions raised by the source are re-raised in the consumer thread.
+        """
+        while True:
+            try:
+                item, error = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stopped():
+                    return
+                continue
+
+            if item is _END:
+                # The source is exhausted, later iterations return immediately
+                self._closed_event.set()
+                if error is not None:
+                    raise error
+                return
+
+            yield item
+
+    def close(self) -> None:
+        """
+        Detaches the consumer, the reader stops feeding it and keeps feeding the other consumers.
+        """
+        self._closed_event.set()
+
+        while not self._queue.empty():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def stopped(self) -> bool:
+        """
+        :return: True if the consumer is detached or cancelled.
+        """
+        return self._closed_event.is_set() or self._cancel_requested()
+
+    def _put(self, item: Any, error: Optional[Exception]) -> bool:
+        """
+        Puts an item in the queue, waiting for a free slot unless the consumer is stopped.
+
+        :param item: The item to put.
+        :param error: The exception raised by the source, if any.
+        :return: True if the item has been put, False if the consumer has been stopped.
+        """
+        while not self.stopped():
+            try:
+                self._queue.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class FanOutReader:
+    """
+    Iterates once over a source on a reader thread and delivers every item to several consumers, so an input
+    decoded once is shared by all of them.
+    The reader waits for the slowest consumer when its queue is full (back-pressure), skips the detached consumers
+    and stops when all of them are detached.
+    """
+    def __init__(self, source: Iterable, depth: int):
+        """
+        Initializes the FanOutReader, the reader thread is started by start() once all the consumers subscribed.
+
+        :param source: The iterable to read from the reader thread (ex: a generator decoding images).
+        :param depth: The maximum number of items buffered ahead of each consumer.
+        """
+        self._source: Iterable = source
+        self._depth: int = depth
+        self._subscriptions: list[FanOutSubscription] = []
+        self._thread: threading.Thread = threading.Thread(target=self._read, daemon=True)
+
+    def subscribe(self, cancel_requested: Callable[[], bool]) -> FanOutSubscription:
+        """
+        Adds a consumer, must be called before start().
+
+        :param cancel_requested: Callable returning True when the consumer has been cancelled.
+        :return: The subscription to iterate from the consumer thread.
+        """
+        subscription = FanOutSubscription(self._depth, cancel_requested)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def start(self) -> None:
+        """
+        Starts the reader thread.
+        """
+        self._thread.start()
+
+    def _read(self) -> None:
+        """
+        Reads the source on the reader thread.
+        """
+        error: Optional[Exception] = None
+        try:
+            for item in self._source:
+                delivered = False
+                for subscription in self._subscriptions:
+                    delivered = subscription._put(item, None) or delivered
+                if not delivered:
+                    return
+        except Exception as e:
+            error = e
+
+        for subscription in self._subscriptions:
+            subscription._put(_END, error)
@@ -0,0 +1,61 @@
+import threading
+import cv2 as cv
+import numpy as np
+
+from typing import Optional
+
+
+class FrameRing:
+    """
+    Ring of preallocated frame buffers, to hand frames from the pipeline thread to the display without allocating
+    a new frame each time. The pipeline converts each frame to RGB directly into a free buffer, the display
+    wraps the buffer without copying it, then releases it once the frame is shown or dropped.
+    Buffers are allocated on demand, up to the maximum size of the ring, and reallocated when the frame size changes.
+    """
+    def __init__(self, max_buffers: int = 32):
+        """
+        Initializes the ring, without any buffer.
+
+        :param max_buffers: The maximum number of buffers, frames are dropped while all of them are in use.
+        """
+        self._max_buffers: int = max(1, max_buffers)
+        self._lock: threading.Lock = threading.Lock()
+        self._free: list[np.ndarray] = []
+        self._in_use: dict[int, np.ndarray] = {}
+        self._shape: Optional[tuple[int, ...]] = None
+        # Number of frames dropped because all the buffers were in use
+        self.dropped: int = 0
+
+    def write(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Converts a BGR frame to RGB into a free buffer.
+
+        :param frame: The BGR frame.
+        :return: The buffer holding the RGB frame, to release once displayed, None if all the buffers are in use.
+        """
+        with self._lock:
+            if frame.shape != self._shape:
+                # The buffers in use are still released, but not reused
+                self._free.clear()
+                self._shape = frame.shape
+            if self._free:
+                buffer = self._free.pop()
+            elif len(self._in_use) < self._max_buffers:
+                buffer = np.empty(frame.shape, dtype=np.uint8)
+            else:
+                self.dropped += 1
+                return None
+            self._in_use[id(buffer)] = buffer
+
+        cv.cvtColor(frame, cv.COLOR_BGR2RGB, dst=buffer)
+        return buffer
+
+    def release(self, buffer: np.ndarray) -> None:
+        """
+        Gives a buffer back to the ring, once its frame is displayed or dropped.
+
+        :param buffer: A buffer returned by write.
+        """
+        with self._lock:
+            if self._in_use.pop(id(buffer), None) is not None and buffer.shape == self._shape:
+                self._free.append(buffer)
@@ -0,0 +1,99 @@
+import cv2 as cv
+import numpy as np
+
+# Encodings of the segmentation masks stored in the results
+MASK_ENCODINGS = ['float', 'int', 'rle']
+
+
+def simplify_polygon(polygon: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplifies a polygon with the Douglas-Peucker algorithm.
+
+    :param polygon: The (M, 2) points of the polygon.
+    :param tolerance: The maximum distance in pixels between the polygon and its simplification, 0 to keep it as is.
+    :return: The (K, 2) float32 points of the simplified polygon.
+    """
+    polygon = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+    if tolerance <= 0 or len(polygon) < 3:
+        return polygon
+    return cv.approxPolyDP(polygon.reshape(-1, 1, 2), tolerance, True).reshape(-1, 2)
+
+
+def encode_rle(polygon: np.ndarray, image_shape: tuple[int, ...]) -> dict:
+    """
+    Encodes a polygon as the run-length encoding of its bitmask, in the uncompressed COCO format: the lengths of the
+    alternating runs of 0 and 1 of the mask in column-major order, starting with a run of 0.
+
+    :param polygon: The (M, 2) points of the polygon.
+    :param image_shape: The shape of the image, the mask has its height and width.
+    :return: The {'size': [height, width], 'counts': [...]} mask.
+    """
+    height, width = image_shape[:2]
+    points = np.rint(np.asarray(polygon, dtype=np.float32).reshape(-1, 2)).astype(np.int32)
+    if len(points) == 0:
+        return {'size': [height, width], 'counts': [height * width]}
+
+    # Only the columns covered by the polygon are rasterized, the other ones are runs of 0
+    x0 = int(np.clip(points[:, 0].min(), 0, width))
+    x1 = int(np.clip(points[:, 0].max() + 1, x0, width))
+    mask = np.zeros((height, x1 - x0), dtype=np.uint8)
+    cv.fillPoly(mask, [points], 1, offset=(-x0, 0))
+
+    flat = mask.ravel(order='F')
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    boundaries = np.concatenate([[0], changes, [len(flat)]])
+    runs = np.diff(boundaries)
+    if len(flat) > 0 and flat[0] == 1:
+        runs = np.concatenate([[0], runs])
+    if len(runs) % 2 == 0:
+        # The mask ends with a run of 1, the following columns start a run of 0
+        runs = np.concatenate([runs, [0]])
+
+    runs[0] += x0 * height
+    runs[-1] += (width - x1) * height
+    return {'size': [height, width], 'counts': runs.tolist()}
+
+
+def decode_rle(rle: dict) -> np.ndarray:
+    """
+    Decodes a run-length encoded mask.
+
+    :param rle: The {'size': [height, width], 'counts': [...]} mask.
+    :return: The (height, width) uint8 mask, 1 inside the mask.
+    """
+    height, width = rle['size']
+    values = np.arange(len(rle['counts']), dtype=np.uint8) % 2
+    return np.repeat(values, rle['counts']).reshape((height, width), order='F')
+
+
+def encode_mask(polygon: np.ndarray, encoding: str, tolerance: float, image_shape: tuple[int, ...]) -> list | dict:
+    """
+    Encodes a segmentation mask for the results.
+
+    :param polygon: The (M, 2) points of the mask polygon.
+    :param encoding: The mask encoding, one of MASK_ENCODINGS.
+    :param tolerance: The simplification tolerance in pixels, 0 to keep all the points.
+    :param image_shape: The shape of the image, used by the run-length encoding.
+    :return: The points of the polygon, as floats or integers, or the run-length encoded mask.
+    """
+    polygon = simplify_polygon(polygon, tolerance)
+    if encoding == 'rle':
+        return encode_rle(polygon, image_shape)
+    if encoding == 'int':
+        return np.rint(polygon).astype(np.int32).tolist()
+    return polygon.tolist()
+
+
+def mask_polygon(mask: list | dict) -> np.ndarray:
+    """
+    Returns the polygon of a mask of the results, whatever its encoding.
+
+    :param mask: The mask, as polygon points or run-length encoded.
+    :return: The (M, 2) points of the polygon, the largest outline for a run-length encoded mask.
+    """
+    if not isinstance(mask, dict):
+        return np.asarray(mask).reshape(-1, 2)
+    contours, _ = cv.findContours(decode_rle(mask), cv.RETR_EXTERNAL, cv.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return np.zeros((0, 2), dtype=np.int32)
+    return max(contours, key=len).reshape(-1, 2)
@@ -1,52 +1,138 @@
+import logging
+import threading
 import time
 import cv2 as cv
 import numpy as np
 
+from typing import Optional
+
+# Maximum time to wait for the capture thread when releasing the stream, in seconds
+RELEASE_TIMEOUT = 1.0
 
 class MediaFetcher:
     """
-    Class to fetch frames from a video stream, not on a separate thread, has a method to fetch the frame.
+    Class to fetch frames from a video stream. A capture thread grabs the frames of the stream continuously, and the
+    consumer only retrieves the newest grabbed frame, so it always gets the freshest frame without converting the
+    frames it missed, and a slow consumer does not make the stream latency drift.
     """
     def __init__(self, url_or_device: str | int):
         """
-        Initializes the MediaFetcher object.
+        Initializes the MediaFetcher object and starts the capture thread.
 
         :param url_or_device: The URL of the video stream or the index of the webcam device.
         """
         self.cap = cv.VideoCapture(url_or_device)
-        self.fps = self.cap.get(cv.CAP_PROP_FPS)
-        self.last_fetch_time = None
         if not self.cap.isOpened():
             raise IOError(f"Failed to open stream: {url_or_device}")
+        # Frame rate reported by the stream, 0 if unknown (ex: some webcams and RTSP streams)
+        self.fps = self.cap.get(cv.CAP_PROP_FPS)
+        # Number of frames of a video file, 0 or less for live streams
+        self._frame_count: float = self.cap.get(cv.CAP_PROP_FRAME_COUNT)
+        # Number of grabbed frames replaced by a newer one before being fetched
+        self.dropped_frames: int = 0
+        # The time.monotonic() capture time of the last fetched frame
+        self.frame_time: float = 0.0
+
+        # The VideoCapture is used by both threads, the capture thread grabs and the consumer retrieves
+        self._cap_lock: threading.Lock = threading.Lock()
+        self._condition: threading.Condition = threading.Condition()
+        self._frame_time: float = 0.0
+        self._frame_id: int = 0
+        self._fetched_id: int = 0
+        self._fetching: bool = False
+        self._ended: bool = False
+        # Whether the capture thread releases the VideoCapture when it stops, if it was blocked in a grab on release
+        self._release_on_exit: bool = False
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(target=self._capture, daemon=True)
+        self._thread.start()
 
-    def fetch_frame(self) -> tuple[np.ndarray, bool]:
+    @property
+    def ended(self) -> bool:
         """
-        Fetches the latest frame from the stream.
+        :return: Whether the stream ended or failed, no new frame will be available.
+        """
+        with self._condition:
+            return self._ended
 
+    def _capture(self) -> None:
+        """
+        Grabs the frames of the stream on the capture thread, each frame replaces the previous one until retrieved.
+        """
+        cap = self.cap
+        try:
+            while not self._stop_event.is_set():
+                with self._condition:
+                    # A pending fetch retrieves the grabbed frame before the next grab replaces it
+                    if not self._condition.wait_for(lambda: not self._fetching, 0.1):
+                        continue
+
+                with self._cap_lock:
+                    # A grab past the end of a video file discards the last grabbed frame, it is not attempted
+                    if 0 < self._frame_count <= cap.get(cv.CAP_PROP_POS_FRAMES):
+                        break
+                    if not cap.grab():
+                        break
+                    frame_time = time.monotonic()
+
+                    with self._condition:
+                        if self._frame_id > self._fetched_id:
+                            self.dropped_frames += 1
+                        self._frame_time = frame_time
+                        self._frame_id += 1
+                        self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._ended = True
+                release = self._release_on_exit
+                self._condition.notify_all()
+            if release:
+                cap.release()
+
+    def fetch_frame(self, timeout: float = 0.1) -> tuple[Optional[np.ndarray], bool]:
+        """
+        Fetches the latest frame from the stream, waiting for a frame newer than the last fetched one.
+        The frame is retrieved from the newest grabbed frame on the calling thread.
+
+        :param timeout: The maximum time to wait for a new frame, in seconds.
         :return: The frame and a boolean indicating if the frame is available.
         """
-        if self.cap is None or not self.cap.isOpened():
+        if self.cap is None:
             raise ValueError("VideoCapture is not initialized or already released.")
 
-        current_time = time.time()
-
-        # Skip frames if necessary
-        if self.last_fetch_time is not None:
-            elapsed_time = current_time - self.last_fetch_time
-            frame_interval = 1.0 / self.fps
-            frames_to_skip = int(elapsed_time / frame_interval)
-            for _ in range(frames_to_skip):
-                self.cap.read()
+        with self._condition:
+            self._condition.wait_for(lambda: self._frame_id > self._fetched_id or self._ended, timeout)
+            if self._frame_id == self._fetched_id:
+                return None, False
+            self._fetching = True
 
-        # Fetch the frame
-        frame_available, frame = self.cap.read()
+        try:
+            with self._cap_lock:
+                with self._condition:
+                    self.frame_time = self._frame_time
+                    self._fetched_id = self._frame_id
+                frame_available, frame = self.cap.retrieve()
+        finally:
+            with self._condition:
+                self._fetching = False
+                self._condition.notify_all()
 
-        self.last_fetch_time = time.time()
-        return frame, frame_available
+        return (frame, True) if frame_available else (None, False)
 
     def release(self) -> None:
         """
-        Releases the VideoCapture object.
+        Stops the capture thread and releases the VideoCapture object. A grab can block on a stalled stream, so the
+        capture thread is only waited for RELEASE_TIMEOUT seconds, it then releases the VideoCapture itself when its
+        grab returns.
         """
         if self.cap:
-            self.cap.release()
+            self._stop_event.set()
+            self._thread.join(RELEASE_TIMEOUT)
+            with self._condition:
+                stalled = not self._ended
+                self._release_on_exit = stalled
+            if stalled:
+                logging.warning('Capture thread stalled, the stream will be released when its grab returns')
+            else:
+                self.cap.release()
+            self.cap = None
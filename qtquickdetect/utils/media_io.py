@@ -0,0 +1,406 @@
+import logging
+import shutil
+import subprocess
+import tempfile
+import cv2 as cv
+import numpy as np
+
+from fractions import Fraction
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Encoder of each codec setting: OpenCV FourCC and FFmpeg encoder name
+VIDEO_CODECS = {
+    'mpeg4': ('mp4v', 'mpeg4'),
+    'h264': ('avc1', 'libx264'),
+    'mjpeg': ('MJPG', 'mjpeg')
+}
+
+# FFmpeg encoder options, the fastest x264 preset as encoding runs while the frames are inferred
+ENCODER_OPTIONS = {
+    'libx264': {'preset': 'ultrafast'}
+}
+
+# Frame rate of the output videos when the input video has none, ex: some streams and damaged containers
+DEFAULT_FPS = 30.0
+
+# Pixel format of the FFmpeg encoders, MJPEG needs the full range format
+ENCODER_PIXEL_FORMATS = {
+    'mjpeg': 'yuvj420p'
+}
+
+
+def pyav_available() -> bool:
+    """
+    :return: Whether PyAV, the optional FFmpeg bindings, is installed.
+    """
+    try:
+        import av  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def ffmpeg_available() -> bool:
+    """
+    :return: Whether the ffmpeg command is available.
+    """
+    return shutil.which('ffmpeg') is not None
+
+
+def _select_backend(backend: str) -> str:
+    """
+    Returns the backend to use, OpenCV if the selected one is not available.
+
+    :param backend: The selected backend, 'opencv', 'pyav' or 'ffmpeg'.
+    :return: The available backend.
+    """
+    if backend == 'pyav' and not pyav_available():
+        logging.warning('PyAV is not installed, falling back to the OpenCV video backend')
+        return 'opencv'
+    if backend == 'ffmpeg' and not ffmpeg_available():
+        logging.warning('ffmpeg was not found, falling back to the OpenCV video backend')
+        return 'opencv'
+    return backend
+
+
+class VideoReader:
+    """
+    Decodes the frames of a video file.
+    """
+    width: int
+    height: int
+    fps: float
+    frame_count: float
+
+    def __enter__(self) -> 'VideoReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+    @property
+    def info(self) -> tuple[int, int, float, float]:
+        """
+        :return: The width, height, FPS and frame count of the video.
+        """
+        return self.width, self.height, self.fps, self.frame_count
+
+    def frames(self, start: int = 0, end: Optional[int] = None, stride: int = 1,
+               decode_skipped: bool = True) -> Iterator[tuple[np.ndarray, float, bool]]:
+        """
+        Decodes the frames one by one, sampling one frame every stride frames of a range of the video.
+
+        :param start: The index of the first frame, the video is seeked to it.
+        :param end: The index after the last frame, None to read until the end of the video.
+        :param stride: The sampling interval, in frames.
+        :param decode_skipped: Whether to decode and return the frames between the sampled ones, they are only
+            grabbed (demuxed without being decoded) otherwise.
+        :return: An iterator of BGR frames, their position in the video (the frame index plus one) and whether they
+            are sampled.
+        """
+        index = self._seek(start)
+        while end is None or index < end:
+            sampled = (index - start) % stride == 0
+            if sampled or decode_skipped:
+                frame = self._read()
+                if frame is None:
+                    return
+                yield frame, float(index + 1), sampled
+            elif not self._grab():
+                return
+            index += 1
+
+    def _seek(self, index: int) -> int:
+        """
+        Moves to a frame.
+
+        :param index: The frame index.
+        :return: The index of the next frame.
+        """
+        raise NotImplementedError
+
+    def _grab(self) -> bool:
+        """
+        Skips the next frame, without decoding it if possible.
+
+        :return: Whether there was a frame.
+        """
+        raise NotImplementedError
+
+    def _read(self) -> Optional[np.ndarray]:
+        """
+        Decodes the next frame.
+
+        :return: The BGR frame, None at the end of the video.
+        """
+        raise NotImplementedError
+
+    def release(self) -> None:
+        """
+        Closes the video.
+        """
+        raise NotImplementedError
+
+
+class OpenCVVideoReader(VideoReader):
+    """
+    Decodes a video with OpenCV, optionally with hardware acceleration.
+    """
+    def __init__(self, path: Path, hw_acceleration: bool = False):
+        """
+        Opens the video.
+
+        :param path: The video path.
+        :param hw_acceleration: Whether to decode on the GPU or media engine when available.
+        :raises IOError: If the video can not be opened.
+        """
+        params = [cv.CAP_PROP_HW_ACCELERATION, cv.VIDEO_ACCELERATION_ANY] if hw_acceleration else []
+        self.cap: cv.VideoCapture = cv.VideoCapture(str(path), cv.CAP_ANY, params)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise IOError(f'Could not open video: {path}')
+        self.width = int(self.cap.get(cv.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv.CAP_PROP_FPS)
+        self.frame_count = self.cap.get(cv.CAP_PROP_FRAME_COUNT)
+
+    def _seek(self, index: int) -> int:
+        if index > 0 and not self.cap.set(cv.CAP_PROP_POS_FRAMES, index):
+            # The video can not be seeked, the previous frames are skipped
+            for _ in range(index):
+                if not self.cap.grab():
+                    break
+        return int(self.cap.get(cv.CAP_PROP_POS_FRAMES))
+
+    def _grab(self) -> bool:
+        return self.cap.grab()
+
+    def _read(self) -> Optional[np.ndarray]:
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class PyAVVideoReader(VideoReader):
+    """
+    Decodes a video with PyAV, on several decoder threads.
+    """
+    def __init__(self, path: Path, threads: int = 0):
+        """
+        Opens the video.
+
+        :param path: The video path.
+        :param threads: The number of decoder threads, 0 to let FFmpeg choose.
+        """
+        import av
+
+        self.container = av.open(str(path))
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = 'AUTO'
+        self.stream.thread_count = threads
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        self.fps = float(self.stream.average_rate or 0)
+        self.frame_count = float(self.stream.frames)
+        self._decoder: Iterator = self.container.decode(self.stream)
+        self._pending: Optional[object] = None
+
+    def _seek(self, index: int) -> int:
+        if index <= 0 or self.fps <= 0:
+            return 0
+
+        # Seek to the key frame before the frame, then decode up to it
+        self.container.seek(int(index / self.fps / self.stream.time_base) + (self.stream.start_time or 0),
+                            stream=self.stream)
+        self._decoder = self.container.decode(self.stream)
+        for frame in self._decoder:
+            frame_index = round(frame.time * self.fps) if frame.time is not None else index
+            if frame_index >= index:
+                self._pending = frame
+                return frame_index
+        return index
+
+    def _next_frame(self) -> Optional[object]:
+        """
+        :return: The next decoded PyAV frame, None at the end of the video.
+        """
+        frame, self._pending = self._pending, None
+        return frame if frame is not None else next(self._decoder, None)
+
+    def _grab(self) -> bool:
+        # FFmpeg decodes every frame, only the conversion to an array is skipped
+        return self._next_frame() is not None
+
+    def _read(self) -> Optional[np.ndarray]:
+        frame = self._next_frame()
+        return frame.to_ndarray(format='bgr24') if frame is not None else None
+
+    def release(self) -> None:
+        self.container.close()
+
+
+class VideoWriter:
+    """
+    Encodes BGR frames to a video file.
+    """
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Encodes the next frame.
+
+        :param frame: The BGR frame, with the size of the video.
+        """
+        raise NotImplementedError
+
+    def release(self) -> None:
+        """
+        Encodes the remaining frames and closes the video.
+        """
+        raise NotImplementedError
+
+
+class OpenCVVideoWriter(VideoWriter):
+    """
+    Encodes a video with OpenCV, optionally with hardware acceleration.
+    """
+    def __init__(self, path: Path, fourcc: str, fps: float, size: tuple[int, int], hw_acceleration: bool = False):
+        """
+        Opens the video.
+
+        :param path: The video path.
+        :param fourcc: The FourCC of the codec.
+        :param fps: The frame rate.
+        :param size: The width and height of the frames.
+        :param hw_acceleration: Whether to encode on the GPU or media engine when available.
+        :raises IOError: If OpenCV has no encoder for the codec.
+        """
+        params = [cv.VIDEOWRITER_PROP_HW_ACCELERATION, cv.VIDEO_ACCELERATION_ANY] if hw_acceleration else []
+        self.out: cv.VideoWriter = cv.VideoWriter(str(path), cv.CAP_ANY, cv.VideoWriter_fourcc(*fourcc), fps, size,
+                                                  params)
+        if not self.out.isOpened():
+            raise IOError(f'Could not open video writer with codec {fourcc}: {path}')
+
+    def write(self, frame: np.ndarray) -> None:
+        self.out.write(frame)
+
+    def release(self) -> None:
+        self.out.release()
+
+
+class PyAVVideoWriter(VideoWriter):
+    """
+    Encodes a video with PyAV, on several encoder threads.
+    """
+    def __init__(self, path: Path, encoder: str, fps: float, size: tuple[int, int], threads: int = 0):
+        """
+        Opens the video.
+
+        :param path: The video path.
+        :param encoder: The FFmpeg encoder name.
+        :param fps: The frame rate.
+        :param size: The width and height of the frames.
+        :param threads: The number of encoder threads, 0 to let FFmpeg choose.
+        """
+        import av
+
+        self.container = av.open(str(path), mode='w')
+        self.stream = self.container.add_stream(encoder, rate=Fraction(fps).limit_denominator(1001))
+        self.stream.width, self.stream.height = size
+        self.stream.pix_fmt = ENCODER_PIXEL_FORMATS.get(encoder, 'yuv420p')
+        self.stream.thread_count = threads
+        self.stream.options = ENCODER_OPTIONS.get(encoder, {})
+        self._frame_type = av.VideoFrame
+
+    def write(self, frame: np.ndarray) -> None:
+        video_frame = self._frame_type.from_ndarray(frame, format='bgr24')
+        for packet in self.stream.encode(video_frame):
+            self.container.mux(packet)
+
+    def release(self) -> None:
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+class FFmpegPipeVideoWriter(VideoWriter):
+    """
+    Encodes a video with an ffmpeg process, the raw frames are written to its standard input. Its error output goes
+    to a temporary file, a pipe only read at the end could fill up and block the process.
+    """
+    def __init__(self, path: Path, encoder: str, fps: float, size: tuple[int, int], threads: int = 0):
+        """
+        Starts the ffmpeg process.
+
+        :param path: The video path.
+        :param encoder: The FFmpeg encoder name.
+        :param fps: The frame rate.
+        :param size: The width and height of the frames.
+        :param threads: The number of encoder threads, 0 to let FFmpeg choose.
+        """
+        options = [value for key, option in ENCODER_OPTIONS.get(encoder, {}).items() for value in (f'-{key}', option)]
+        command = [
+            'ffmpeg', '-loglevel', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{size[0]}x{size[1]}', '-r', str(fps), '-i', '-',
+            '-c:v', encoder, *options, '-threads', str(threads),
+            '-pix_fmt', ENCODER_PIXEL_FORMATS.get(encoder, 'yuv420p'), str(path)
+        ]
+        self.path: Path = path
+        self._stderr = tempfile.TemporaryFile()
+        self.process: subprocess.Popen = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self._stderr)
+
+    def write(self, frame: np.ndarray) -> None:
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def release(self) -> None:
+        self.process.stdin.close()
+        return_code = self.process.wait()
+        with self._stderr:
+            self._stderr.seek(0)
+            error = self._stderr.read().decode(errors='replace').strip()
+        if return_code != 0:
+            raise IOError(f'ffmpeg could not encode {self.path} (exit code {return_code}): {error}')
+
+
+def open_video_reader(path: Path, backend: str = 'opencv', hw_acceleration: bool = False,
+                      threads: int = 0) -> VideoReader:
+    """
+    Opens a video for decoding with the selected backend, the ffmpeg backend only encodes and decodes with OpenCV.
+
+    :param path: The video path.
+    :param backend: The video backend, 'opencv', 'pyav' or 'ffmpeg'.
+    :param hw_acceleration: Whether OpenCV decodes with hardware acceleration when available.
+    :param threads: The number of PyAV decoder threads, 0 to let FFmpeg choose.
+    :return: The video reader.
+    """
+    if _select_backend(backend) == 'pyav':
+        return PyAVVideoReader(path, threads)
+    return OpenCVVideoReader(path, hw_acceleration)
+
+
+def open_video_writer(path: Path, fps: float, size: tuple[int, int], backend: str = 'opencv', codec: str = 'mpeg4',
+                      hw_acceleration: bool = False, threads: int = 0) -> VideoWriter:
+    """
+    Opens a video for encoding with the selected backend and codec.
+
+    :param path: The video path.
+    :param fps: The frame rate, DEFAULT_FPS is used if it is 0 or less (unknown).
+    :param size: The width and height of the frames.
+    :param backend: The video backend, 'opencv', 'pyav' or 'ffmpeg'.
+    :param codec: The codec, a key of VIDEO_CODECS.
+    :param hw_acceleration: Whether OpenCV encodes with hardware acceleration when available.
+    :param threads: The number of PyAV or ffmpeg encoder threads, 0 to let FFmpeg choose.
+    :return: The video writer.
+    """
+    fourcc, encoder = VIDEO_CODECS[codec]
+    backend = _select_backend(backend)
+    if fps <= 0:
+        # The encoders reject a null frame rate
+        logging.warning(f'Unknown frame rate, {path} is encoded at {DEFAULT_FPS} FPS')
+        fps = DEFAULT_FPS
+    if backend == 'pyav':
+        return PyAVVideoWriter(path, encoder, fps, size, threads)
+    if backend == 'ffmpeg':
+        return FFmpegPipeVideoWriter(path, encoder, fps, size, threads)
+    return OpenCVVideoWriter(path, fourcc, fps, size, hw_acceleration)
@@ -0,0 +1,378 @@
+import functools
+import cv2 as cv
+import numpy as np
+
+from typing import Optional, Sequence
+from ..models.preset import Preset
+from ..utils.palette import Palette, get_palette
+
+# Font of the labels
+FONT = cv.FONT_HERSHEY_SIMPLEX
+
+# Body parts of the keypoints and skeleton edges, selecting their color among the preset pose colors
+HEAD, CHEST, ARM, LEG = range(4)
+
+# Names of the body parts in the skeletons of the presets
+BODY_PARTS = {'head': HEAD, 'chest': CHEST, 'arm': ARM, 'leg': LEG}
+
+
+class Skeleton:
+    """
+    Keypoint topology of a pose model: the edges between keypoints, and the body part of each keypoint and edge.
+    """
+    def __init__(self, edges: Sequence[tuple[int, int]], keypoint_parts: Sequence[int], edge_parts: Sequence[int]):
+        """
+        Initializes the skeleton.
+
+        :param edges: The pairs of keypoint indices linked by an edge.
+        :param keypoint_parts: The body part of each keypoint (HEAD, CHEST, ARM or LEG).
+        :param edge_parts: The body part of each edge.
+        :raises ValueError: If an edge links a keypoint outside the skeleton, or if a part is unknown.
+        """
+        self.edges: np.ndarray = np.asarray(edges, dtype=int).reshape(-1, 2)
+        self.keypoint_parts: np.ndarray = np.asarray(keypoint_parts, dtype=int)
+        self.edge_parts: np.ndarray = np.asarray(edge_parts, dtype=int)
+
+        if len(self.edge_parts) != len(self.edges):
+            raise ValueError(f'Expected {len(self.edges)} edge parts, got {len(self.edge_parts)}')
+        if len(self.edges) > 0 and not (0 <= self.edges.min() and self.edges.max() < len(self.keypoint_parts)):
+            raise ValueError('Skeleton edge linking an unknown keypoint')
+        parts = np.concatenate((self.keypoint_parts, self.edge_parts))
+        if len(parts) > 0 and not (HEAD <= parts.min() and parts.max() <= LEG):
+            raise ValueError('Unknown skeleton body part')
+
+    @property
+    def keypoint_count(self) -> int:
+        """
+        :return: The number of keypoints.
+        """
+        return len(self.keypoint_parts)
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Skeleton':
+        """
+        Creates a skeleton from its description in a preset, with the body parts by name,
+        ex: {"edges": [[0, 1], [1, 2]], "keypoint_parts": ["head", "arm", "arm"], "edge_parts": ["head", "arm"]}.
+
+        :param data: The skeleton description.
+        :return: The skeleton.
+        :raises ValueError: If the description is not a valid skeleton.
+        """
+        try:
+            return Skeleton(data['edges'], [BODY_PARTS[part] for part in data['keypoint_parts']],
+                            [BODY_PARTS[part] for part in data['edge_parts']])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f'Invalid skeleton: {e!r}') from e
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def points_only(keypoint_count: int) -> 'Skeleton':
+        """
+        Returns the skeleton of a model with unknown topology, only its keypoints are drawn.
+
+        :param keypoint_count: The number of keypoints.
+        :return: The skeleton without edges.
+        """
+        return Skeleton([], [CHEST] * keypoint_count, [])
+
+
+# COCO keypoint skeleton
+# https://pytorch.org/vision/stable/auto_examples/others/plot_visualization_utils.html#keypoint-output
+COCO_SKELETON = Skeleton(
+    [
+        (0, 1), (0, 2), (1, 3), (2, 4),  # Head
+        (5, 6),  # Shoulders
+        (5, 11), (6, 12),  # Chest (Shoulders to Hips)
+        (5, 7), (7, 9),  # Left Arm
+        (6, 8), (8, 10),  # Right Arm
+        (11, 12),  # Hips
+        (11, 13), (13, 15),  # Left Leg
+        (12, 14), (14, 16)  # Right Leg
+    ],
+    [HEAD] * 5 + [CHEST] * 2 + [ARM] * 4 + [CHEST] * 2 + [LEG] * 4,
+    [HEAD] * 4 + [CHEST] * 3 + [ARM] * 4 + [CHEST] + [LEG] * 4
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _text_size(text: str, text_size: float) -> tuple[int, int]:
+    """
+    Returns the size of a label, the labels of a class repeat from frame to frame.
+
+    :param text: The label.
+    :param text_size: The font scale.
+    :return: The width and height of the label.
+    """
+    return cv.getTextSize(text, FONT, text_size, 1)[0]
+
+
+class OverlayRenderer:
+    """
+    Draws all the results of a frame (boxes, masks, keypoints and classification labels) in a single pass,
+    with batched OpenCV calls per color, the class colors of the preset palette and cached text sizes.
+    """
+    def __init__(self, preset: Preset):
+        """
+        Initializes the renderer.
+
+        :param preset: The preset holding the drawing settings.
+        """
+        self._preset: Preset = preset
+        self._palette: Optional[Palette] = None
+        self._skeleton: Optional[Skeleton] = None
+        self._skeleton_tables: dict[Skeleton, tuple[list[tuple], list[tuple[tuple, np.ndarray]]]] = {}
+
+    def render(self, img: np.ndarray, boxes: Optional[np.ndarray] = None, classes: Optional[np.ndarray] = None,
+               confidences: Optional[np.ndarray] = None, class_names: Optional[Sequence[str]] = None,
+               polygons: Optional[list[np.ndarray]] = None, keypoints: Optional[np.ndarray] = None,
+               skeleton: Optional[Skeleton] = None, labels: Optional[Sequence[str]] = None,
+               label_confidences: Optional[Sequence[float]] = None) -> None:
+        """
+        Draws the results of a frame: the masks, then the boxes and their labels, then the poses, then the
+        classification labels.
+
+        :param img: The image to draw on, with 3 or 4 channels.
+        :param boxes: The (N, 4) integer array of x1, y1, x2, y2 box corners, labelled with the classes and confidences.
+        :param classes: The (N,) integer array of class ids of the boxes or of the polygons.
+        :param confidences: The (N,) array of confidences of the boxes.
+        :param class_names: The class names, indexed by class id.
+        :param polygons: The (M, 2) points of each mask polygon.
+        :param keypoints: The (N, K, 2) integer array of keypoints, (0, 0) for the missing keypoints.
+        :param skeleton: The skeleton of the poses, see draw_poses.
+        :param labels: The class names of a classification, drawn at the top left of the image.
+        :param label_confidences: The confidences of the classification labels.
+        """
+        if polygons is not None:
+            self.draw_masks(img, polygons, classes)
+        if boxes is not None:
+            self.draw_boxes(img, boxes, classes, confidences, class_names)
+        if keypoints is not None:
+            self.draw_poses(img, keypoints, skeleton)
+        if labels is not None:
+            self.draw_labels(img, labels, label_confidences)
+
+    @property
+    def palette(self) -> Palette:
+        """
+        :return: The shared palette of the preset colors.
+        """
+        if self._palette is None:
+            self._palette = get_palette(tuple(tuple(color) for color in self._preset.palette))
+        return self._palette
+
+    @property
+    def skeleton(self) -> Optional[Skeleton]:
+        """
+        :return: The skeleton of the pose models set in the preset, None for the default skeletons.
+        """
+        if self._skeleton is None and self._preset.pose_skeleton:
+            self._skeleton = Skeleton.from_dict(self._preset.pose_skeleton)
+        return self._skeleton
+
+    def class_color(self, class_id: int) -> tuple[int, int, int, int]:
+        """
+        Returns the color of a class.
+
+        :param class_id: The class id.
+        :return: The color (R, G, B, A).
+        """
+        return self.palette.color(class_id)
+
+    def _colors(self, classes: np.ndarray, per_class: bool,
+                color: tuple[int, int, int, int]) -> list[tuple[tuple[int, int, int, int], np.ndarray]]:
+        """
+        Groups the objects by color.
+
+        :param classes: The class ids of the objects.
+        :param per_class: Whether the objects are colored per class, instead of with the given color.
+        :param color: The color of all the objects if not per class.
+        :return: The list of colors and the indices of the objects with that color.
+        """
+        if not per_class:
+            return [(color, np.arange(len(classes)))]
+        return [
+            (self.class_color(class_id), np.flatnonzero(classes == class_id))
+            for class_id in np.unique(classes).tolist()
+        ]
+
+    def draw_boxes(self, img: np.ndarray, boxes: np.ndarray, classes: np.ndarray, confidences: np.ndarray,
+                   class_names: Sequence[str]) -> None:
+        """
+        Draws the bounding boxes, then their labels with background and percentage.
+
+        :param img: The image to draw on.
+        :param boxes: The (N, 4) integer array of x1, y1, x2, y2 box corners.
+        :param classes: The (N,) integer array of class ids.
+        :param confidences: The (N,) array of confidences.
+        :param class_names: The class names, indexed by class id.
+        """
+        if len(boxes) == 0:
+            return
+
+        preset = self._preset
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        classes = np.asarray(classes).astype(int)
+        x1, y1, x2, y2 = boxes.T
+
+        # Rectangle corners, drawn as closed polylines like cv.rectangle does
+        corners = np.stack((
+            np.stack((x1, y1), axis=1), np.stack((x2, y1), axis=1),
+            np.stack((x2, y2), axis=1), np.stack((x1, y2), axis=1)
+        ), axis=1)
+
+        colors = self._colors(classes, preset.box_color_per_class, preset.box_color)
+        for color, indices in colors:
+            cv.polylines(img, corners[indices], True, color, preset.box_thickness)
+
+        text_thickness = 1 if preset.text_size < 1 else 2
+        if preset.box_color_per_class:
+            box_colors = [tuple(color) for color in self.palette.colors(classes).tolist()]
+        else:
+            box_colors = [preset.box_color] * len(boxes)
+
+        for (left, top), class_id, confidence, color in zip(boxes[:, :2].tolist(), classes.tolist(),
+                                                             np.asarray(confidences).tolist(), box_colors):
+            text = '{} : {:.2f}%'.format(class_names[class_id], confidence * 100)
+            text_width, text_height = _text_size(text, preset.text_size)
+
+            text_top_left_y = max(0, top - text_height - 9)
+            cv.rectangle(img, (left, text_top_left_y - 2), (left + text_width + 2, text_top_left_y + text_height + 7),
+                         color, cv.FILLED)
+            cv.putText(img, text, (left, text_top_left_y + text_height), FONT, preset.text_size, preset.text_color,
+                       text_thickness)
+
+    def draw_masks(self, img: np.ndarray, polygons: list[np.ndarray], classes: np.ndarray) -> None:
+        """
+        Draws the semi-transparent polygon masks, then their outlines.
+
+        :param img: The image to draw on.
+        :param polygons: The (M, 2) points of each polygon.
+        :param classes: The (N,) integer array of class ids.
+        """
+        preset = self._preset
+        polygons = [np.asarray(polygon, dtype=np.int32).reshape(-1, 2) for polygon in polygons]
+        classes = np.asarray(classes).astype(int)
+
+        # The masks are blended in order, as overlapping masks blend over each other
+        for polygon, class_id in zip(polygons, classes.tolist()):
+            color = self.class_color(class_id) if preset.segment_color_per_class else preset.segment_color
+            self._blend_polygon(img, polygon, color)
+
+        colors = self._colors(classes, preset.segment_color_per_class, preset.segment_color)
+        for color, indices in colors:
+            outlines = [polygons[index] for index in indices.tolist() if len(polygons[index]) > 0]
+            if outlines:
+                cv.polylines(img, outlines, True, color, preset.segment_thickness)
+
+    @staticmethod
+    def _blend_polygon(img: np.ndarray, polygon: np.ndarray, color: tuple[int, int, int, int]) -> None:
+        """
+        Blends a polygon mask on an image, only the bounding rectangle of the polygon is blended.
+
+        :param img: The image to draw on.
+        :param polygon: The (M, 2) integer points of the polygon.
+        :param color: The mask color.
+        """
+        if len(polygon) == 0:
+            return
+
+        # Only the bounding rectangle of the polygon, clipped to the image, changes when blending the mask
+        x, y, width, height = cv.boundingRect(polygon)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, img.shape[1]), min(y + height, img.shape[0])
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        roi = img[y0:y1, x0:x1]
+
+        mask = np.zeros(roi.shape[:2], dtype=np.uint8)
+        cv.fillPoly(mask, [polygon], 255, offset=(-x0, -y0))
+
+        mask_colored = np.zeros(roi.shape, dtype=np.uint8)
+        mask_colored[:, :] = color[:3] if img.shape[2] == 3 else color[:4]
+
+        roi_masked = cv.bitwise_and(mask_colored, mask_colored, mask=mask)
+
+        img[y0:y1, x0:x1] = cv.addWeighted(roi, 1, roi_masked, 0.5, 0)
+
+    def _compile_skeleton(self, skeleton: Skeleton) -> tuple[list[tuple], list[tuple[tuple, np.ndarray]]]:
+        """
+        Returns the colors of the keypoints and edges of a skeleton, compiled once per skeleton from the preset.
+
+        :param skeleton: The skeleton.
+        :return: The color of each keypoint, and the list of edge colors with their (E, 2) edges.
+        """
+        tables = self._skeleton_tables.get(skeleton)
+        if tables is None:
+            preset = self._preset
+            part_colors = [tuple(color) for color in (preset.pose_head_color, preset.pose_chest_color,
+                                                      preset.pose_arm_color, preset.pose_leg_color)]
+            keypoint_colors = [part_colors[part] for part in skeleton.keypoint_parts.tolist()]
+
+            # Edges of the same color are drawn together, even if they belong to different parts
+            edge_indices: dict[tuple, list[int]] = {}
+            for index, part in enumerate(skeleton.edge_parts.tolist()):
+                edge_indices.setdefault(part_colors[part], []).append(index)
+            edge_groups = [(color, skeleton.edges[indices]) for color, indices in edge_indices.items()]
+
+            tables = (keypoint_colors, edge_groups)
+            self._skeleton_tables[skeleton] = tables
+        return tables
+
+    def draw_poses(self, img: np.ndarray, keypoints: np.ndarray, skeleton: Optional[Skeleton] = None) -> None:
+        """
+        Draws the keypoints of all the poses, then the skeleton edges between the present keypoints,
+        with one polylines call per edge color.
+
+        :param img: The image to draw on.
+        :param keypoints: The (N, K, 2) integer array of keypoints, (0, 0) for the missing keypoints.
+        :param skeleton: The skeleton of the poses, defaults to the skeleton of the preset if set, to the COCO
+            skeleton for 17 keypoints, and to the keypoints only otherwise.
+        """
+        if len(keypoints) == 0:
+            return
+
+        preset = self._preset
+        keypoints = np.asarray(keypoints, dtype=np.int32).reshape(len(keypoints), -1, 2)
+        if skeleton is None:
+            skeleton = self.skeleton
+        if skeleton is None:
+            if keypoints.shape[1] == COCO_SKELETON.keypoint_count:
+                skeleton = COCO_SKELETON
+            else:
+                skeleton = Skeleton.points_only(keypoints.shape[1])
+        keypoint_colors, edge_groups = self._compile_skeleton(skeleton)
+
+        # Poses with fewer keypoints than the skeleton miss the others
+        if keypoints.shape[1] != skeleton.keypoint_count:
+            count = min(keypoints.shape[1], skeleton.keypoint_count)
+            padded = np.zeros((len(keypoints), skeleton.keypoint_count, 2), dtype=np.int32)
+            padded[:, :count] = keypoints[:, :count]
+            keypoints = padded
+
+        present = np.any(keypoints != 0, axis=2)
+
+        pose_indices, keypoint_indices = np.nonzero(present)
+        for center, keypoint_index in zip(keypoints[pose_indices, keypoint_indices].tolist(),
+                                          keypoint_indices.tolist()):
+            cv.circle(img, center, preset.pose_point_size, keypoint_colors[keypoint_index], cv.FILLED)
+
+        # Edges of all the poses, grouped by color
+        for color, edges in edge_groups:
+            segments = keypoints[:, edges][present[:, edges[:, 0]] & present[:, edges[:, 1]]]
+            if len(segments) > 0:
+                cv.polylines(img, segments, False, color, preset.pose_line_thickness)
+
+    def draw_labels(self, img: np.ndarray, class_names: Sequence[str], confidences: Sequence[float],
+                    first_index: int = 0) -> None:
+        """
+        Draws classification labels, one per line.
+
+        :param img: The image to draw on.
+        :param class_names: The class names.
+        :param confidences: The confidences.
+        :param first_index: The line of the first label (Y rank among labels).
+        """
+        for index, (class_name, confidence) in enumerate(zip(class_names, confidences), first_index):
+            text = '{} : {:.2f}%'.format(class_name, float(confidence) * 100)
+            cv.putText(img, text, (10, 30 + 30 * index), FONT, 1, self._preset.text_color, 2)
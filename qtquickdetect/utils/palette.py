@@ -0,0 +1,106 @@
+import functools
+import random
+import threading
+import numpy as np
+
+# Number of generated class colors, the palette grows if a model has more classes
+DEFAULT_CLASS_COUNT = 256
+
+
+def generate_color(class_id: int) -> tuple[int, int, int, int]:
+    """
+    Generates a color for a class id.
+
+    :param class_id: The class id.
+    :return: The color (R, G, B, A).
+    """
+    rng = random.Random(class_id)  # Ensure the same color is generated for the same class id
+
+    # Generate a vivid color with at least one channel at full intensity
+    channels = [0, 0, 0]
+    max_channel = rng.randint(0, 2)
+    channels[max_channel] = 255  # Set one channel to 255 for vividness
+
+    # Set the other channels to a value between 50 and 200
+    for i in range(3):
+        if i != max_channel:
+            channels[i] = rng.randint(50, 200)
+
+    return (*channels, 255)
+
+
+def build_palette(class_count: int, colors: tuple[tuple[int, int, int, int], ...] = ()) -> np.ndarray:
+    """
+    Builds the color lookup table of the classes.
+
+    :param class_count: The number of classes.
+    :param colors: The user colors, repeated over the classes, generated colors are used if empty.
+    :return: The (class_count, 4) array of RGBA colors, indexed by class id.
+    """
+    if colors:
+        return np.array([colors[class_id % len(colors)] for class_id in range(class_count)], dtype=np.uint8)
+    return np.array([generate_color(class_id) for class_id in range(class_count)], dtype=np.uint8)
+
+
+class Palette:
+    """
+    Per-class colors, precomputed in a lookup table shared by the pipelines and the result viewers.
+    """
+    def __init__(self, colors: tuple[tuple[int, int, int, int], ...] = ()):
+        """
+        Initializes the palette.
+
+        :param colors: The user colors, repeated over the classes, generated colors are used if empty.
+        """
+        self._colors: tuple[tuple[int, int, int, int], ...] = colors
+        self._lock: threading.Lock = threading.Lock()
+        self.table: np.ndarray = build_palette(DEFAULT_CLASS_COUNT, colors)
+
+    def _grow(self, class_count: int) -> np.ndarray:
+        """
+        Extends the lookup table to hold at least the given number of classes.
+
+        :param class_count: The number of classes.
+        :return: The lookup table.
+        """
+        with self._lock:
+            if class_count > len(self.table):
+                size = len(self.table)
+                while size < class_count:
+                    size *= 2
+                self.table = build_palette(size, self._colors)
+            return self.table
+
+    def color(self, class_id: int) -> tuple[int, int, int, int]:
+        """
+        Returns the color of a class.
+
+        :param class_id: The class id.
+        :return: The color (R, G, B, A).
+        """
+        table = self.table if class_id < len(self.table) else self._grow(class_id + 1)
+        return tuple(table[class_id].tolist())
+
+    def colors(self, class_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the colors of several classes.
+
+        :param class_ids: The class ids.
+        :return: The (N, 4) array of RGBA colors.
+        """
+        class_ids = np.asarray(class_ids, dtype=int)
+        table = self.table
+        if len(class_ids) > 0 and class_ids.max() >= len(table):
+            table = self._grow(int(class_ids.max()) + 1)
+        return table[class_ids]
+
+
+@functools.lru_cache(maxsize=None)
+def get_palette(colors: tuple[tuple[int, int, int, int], ...] = ()) -> Palette:
+    """
+    Returns the palette of the given user colors, built once and shared.
+
+    :param colors: The user colors, generated colors are used if empty.
+    :return: The palette.
+    """
+    return Palette(colors)
@@ -0,0 +1,105 @@
+import queue
+import threading
+
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Marker put in the queue when the source is exhausted
+_END = object()
+
+
+class Prefetcher:
+    """
+    Iterates over a source on a reader thread and buffers its items in a bounded queue, so decoding
+    happens while the consumer is busy with the previous items.
+    The reader blocks when the queue is full (back-pressure) and stops as soon as a cancellation is requested.
+    """
+    def __init__(self, source: Iterable, depth: int, cancel_requested: Callable[[], bool]):
+        """
+        Initializes the Prefetcher and starts the reader thread.
+
+        :param source: The iterable to read from the reader thread (ex: a generator decoding images).
+        :param depth: The maximum number of items buffered ahead of the consumer.
+        :param cancel_requested: Callable returning True when the processing has been cancelled.
+        """
+        self._source: Iterable = source
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self._cancel_requested: Callable[[], bool] = cancel_requested
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'Prefetcher':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the items of the source in order, until the source is exhausted or the processing is cancelled.
+        Exceptions raised by the source are re-raised in the consumer thread.
+        """
+        while True:
+            try:
+                item, error = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopped():
+                    return
+                continue
+
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+
+            yield item
+
+    def close(self) -> None:
+        """
+        Stops the reader thread and waits for it to finish.
+        """
+        self._stop_event.set()
+
+        # Unblock the reader if it is waiting for a free slot
+        while not self._queue.empty():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+        self._thread.join()
+
+    def _stopped(self) -> bool:
+        """
+        :return: True if the reader should stop.
+        """
+        return self._stop_event.is_set() or self._cancel_requested()
+
+    def _read(self) -> None:
+        """
+        Reads the source on the reader thread.
+        """
+        error: Optional[Exception] = None
+        try:
+            for item in self._source:
+                if not self._put(item, None):
+                    return
+        except Exception as e:
+            error = e
+        self._put(_END, error)
+
+    def _put(self, item: Any, error: Optional[Exception]) -> bool:
+        """
+        Puts an item in the queue, waiting for a free slot unless the reader is stopped.
+
+        :param item: The item to put.
+        :param error: The exception raised by the source, if any.
+        :return: True if the item has been put, False if the reader has been stopped.
+        """
+        while not self._stopped():
+            try:
+                self._queue.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
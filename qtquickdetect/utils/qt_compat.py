@@ -0,0 +1,122 @@
+import os
+import threading
+
+from typing import Any, Callable, Optional
+
+# Set QTQUICKDETECT_HEADLESS=1 before importing the pipelines to run them without PyQt6
+HEADLESS = os.environ.get('QTQUICKDETECT_HEADLESS', '') == '1'
+
+if HEADLESS:
+    class _BoundSignal:
+        """
+        Signal of an object in headless mode, the connected slots are called synchronously from the emitting thread.
+        """
+        def __init__(self):
+            """
+            Initializes the signal without any slot.
+            """
+            self._slots: list[Callable] = []
+            self._lock: threading.Lock = threading.Lock()
+
+        def __call__(self, *args) -> None:
+            self.emit(*args)
+
+        def connect(self, slot: Callable) -> None:
+            """
+            Connects a slot (a callable or another signal) to the signal.
+
+            :param slot: The slot to call when the signal is emitted.
+            """
+            with self._lock:
+                self._slots.append(slot)
+
+        def disconnect(self, slot: Optional[Callable] = None) -> None:
+            """
+            Disconnects a slot, or all the slots if none is given.
+
+            :param slot: The slot to disconnect.
+            """
+            with self._lock:
+                if slot is None:
+                    self._slots.clear()
+                else:
+                    self._slots.remove(slot)
+
+        def emit(self, *args) -> None:
+            """
+            Calls the connected slots with the given arguments.
+
+            :param args: The arguments of the signal.
+            """
+            with self._lock:
+                slots = list(self._slots)
+            for slot in slots:
+                slot(*args)
+
+    class pyqtSignal:
+        """
+        Headless replacement of PyQt6 pyqtSignal, declared as a class attribute and bound to each instance.
+        """
+        def __init__(self, *types: Any):
+            """
+            Initializes the signal declaration, the types are only kept for documentation.
+
+            :param types: The types of the signal arguments.
+            """
+            self.types: tuple = types
+            self.name: str = ''
+
+        def __set_name__(self, owner: type, name: str) -> None:
+            self.name = name
+
+        def __get__(self, instance: Any, owner: type) -> Any:
+            if instance is None:
+                return self
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = _BoundSignal()
+            return instance.__dict__[self.name]
+
+    class QObject:
+        """
+        Headless replacement of PyQt6 QObject.
+        """
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class QThread(QObject):
+        """
+        Headless replacement of PyQt6 QThread, runs the run method on a Python thread.
+        """
+        def __init__(self, *args, **kwargs):
+            super().__init__()
+            self._thread: Optional[threading.Thread] = None
+
+        def run(self) -> None:
+            pass
+
+        def start(self) -> None:
+            """
+            Starts the run method on a new thread.
+            """
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+
+        def wait(self, timeout: Optional[int] = None) -> bool:
+            """
+            Waits for the thread to finish.
+
+            :param timeout: The maximum time to wait, in milliseconds, None to wait forever.
+            :return: True if the thread is finished, False if the timeout expired.
+            """
+            if self._thread is None:
+                return True
+            self._thread.join(None if timeout is None else timeout / 1000.0)
+            return not self._thread.is_alive()
+
+        def isRunning(self) -> bool:
+            """
+            :return: True if the thread is running.
+            """
+            return self._thread is not None and self._thread.is_alive()
+else:
+    from PyQt6.QtCore import pyqtSignal, QObject, QThread
@@ -0,0 +1,131 @@
+import queue
+import threading
+
+from collections import deque
+from typing import Any, Callable, Optional
+
+# Marker passed from stage to stage when the source of the pipeline is exhausted
+STAGE_END = object()
+
+
+class DropOldestQueue:
+    """
+    Bounded FIFO queue between two stages of a pipeline. Putting an item in a full queue drops the oldest item
+    instead of blocking, so a slow stage gets the newest items and never makes the previous stages wait.
+    Once closed, the remaining items are returned, then the end marker STAGE_END.
+    """
+    def __init__(self, depth: int):
+        """
+        Initializes the queue.
+
+        :param depth: The maximum number of items in the queue.
+        """
+        self._items: deque = deque(maxlen=max(1, depth))
+        self._condition: threading.Condition = threading.Condition()
+        self._closed: bool = False
+        # Number of items dropped because the queue was full
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        """
+        :return: The number of items in the queue.
+        """
+        with self._condition:
+            return len(self._items)
+
+    def put(self, item: Any) -> None:
+        """
+        Puts an item at the end of the queue, dropping the oldest item if the queue is full.
+
+        :param item: The item to put.
+        """
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float) -> Any:
+        """
+        Removes the oldest item from the queue, waiting for one if the queue is empty.
+
+        :param timeout: The maximum time to wait for an item, in seconds.
+        :return: The item, STAGE_END if the queue is closed and empty.
+        :raises queue.Empty: If no item was put before the timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._items) > 0 or self._closed, timeout):
+                raise queue.Empty
+            return self._items.popleft() if self._items else STAGE_END
+
+    def close(self) -> None:
+        """
+        Closes the queue, no item follows the ones already in the queue.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class StageWorker:
+    """
+    Runs a stage of a pipeline on its own thread: the items of the stage source are processed in order by the stage
+    function, and its results are put in the output queue of the stage, the source of the next stage. The stages
+    run concurrently, so the throughput of the pipeline is bounded by its slowest stage. With drop-oldest queues
+    between the stages, a slow stage drops items instead of making the previous stages wait or adding delay.
+    When the source returns the end marker, STAGE_END, the stage closes its output queue and stops.
+    """
+    def __init__(self, function: Callable[[Any], Any], source: Callable[[float], Any], output: DropOldestQueue,
+                 name: str):
+        """
+        Initializes the StageWorker and starts its thread.
+
+        :param function: The stage function, called with each item on the stage thread. It returns the item to put
+            in the output queue, or None to drop the item.
+        :param source: The callable returning the next item, waiting at most the given timeout in seconds, and
+            raising queue.Empty if there is none yet (ex: the get method of the output queue of the previous stage).
+        :param output: The queue receiving the results of the stage.
+        :param name: The name of the stage thread.
+        """
+        self._function: Callable[[Any], Any] = function
+        self._source: Callable[[float], Any] = source
+        self._output: DropOldestQueue = output
+        self._stop_event: threading.Event = threading.Event()
+        # First exception raised by the stage, the stage stops processing items after it
+        self.error: Optional[Exception] = None
+        self._thread: threading.Thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'StageWorker':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the stage thread and waits for it to finish, the items not processed yet are discarded.
+        """
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """
+        Processes the items on the stage thread.
+        """
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    item = self._source(0.1)
+                except queue.Empty:
+                    continue
+
+                if item is STAGE_END:
+                    self._output.close()
+                    return
+
+                result = self._function(item)
+                if result is not None:
+                    self._output.put(result)
+        except Exception as e:
+            self.error = e
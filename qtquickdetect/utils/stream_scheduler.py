@@ -0,0 +1,73 @@
+import time
+
+
+class StreamScheduler:
+    """
+    Schedules the inference of the frames of a live stream. The inference latency is measured with an exponentially
+    weighted moving average, and the frames are processed at the rate the model can sustain, bounded by the maximum
+    FPS and the stream FPS. The frames captured between two processed frames are dropped at the source, and
+    fetched frames which are too old to be displayed within the target latency are dropped too.
+    """
+    def __init__(self, max_fps: float, target_latency: float, source_fps: float = 0.0, smoothing: float = 0.2):
+        """
+        Initializes the scheduler.
+
+        :param max_fps: The maximum number of processed frames per second.
+        :param target_latency: The target latency in seconds, from the capture of a frame to the end of its inference.
+        :param source_fps: The frame rate of the stream, 0 if unknown.
+        :param smoothing: The weight of the last measure in the moving average of the latency, between 0 and 1.
+        """
+        self.max_fps: float = max_fps
+        self.target_latency: float = target_latency
+        self.source_fps: float = source_fps
+        self.smoothing: float = smoothing
+        # Moving average of the inference latency in seconds, 0 until the first frame is processed
+        self.latency: float = 0.0
+        self.dropped_frames: int = 0
+        self._next_time: float = 0.0
+
+    @property
+    def fps(self) -> float:
+        """
+        :return: The processing rate: the maximum FPS, the stream FPS or the rate sustained by the model, whichever
+            is the lowest.
+        """
+        rates = [self.max_fps]
+        if self.source_fps > 0:
+            rates.append(self.source_fps)
+        if self.latency > 0:
+            rates.append(1.0 / self.latency)
+        return min(rates)
+
+    def delay(self) -> float:
+        """
+        :return: The time to wait before processing the next frame, in seconds.
+        """
+        return max(0.0, self._next_time - time.monotonic())
+
+    def accept(self, frame_age: float) -> bool:
+        """
+        Checks whether a fetched frame is recent enough to be processed within the target latency. A frame captured
+        less than a processing interval ago is always accepted, so a model slower than the target latency still
+        processes the freshest frames.
+
+        :param frame_age: The time elapsed since the capture of the frame, in seconds.
+        :return: Whether to process the frame, otherwise it is dropped.
+        """
+        if frame_age + self.latency <= self.target_latency or frame_age <= 1.0 / self.fps:
+            return True
+        self.dropped_frames += 1
+        return False
+
+    def record(self, start_time: float) -> None:
+        """
+        Records the inference of a frame, to update the latency and schedule the next frame.
+
+        :param start_time: The time.monotonic() time at which the inference started.
+        """
+        latency = time.monotonic() - start_time
+        if self.latency == 0:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+        self._next_time = start_time + 1.0 / self.fps
@@ -1,4 +1,3 @@
-import json
 import numpy as np
 
 from pathlib import Path
@@ -6,11 +5,12 @@ from typing import Optional
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QGraphicsPixmapItem, QGraphicsScene, \
     QComboBox, QLabel, QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QSplitter
 from PyQt6.QtGui import QPixmap, QImage, QPainter
-from PyQt6.QtCore import Qt, QFile, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal
 from ..models.preset import Preset
+from ..pipeline.result_store import ResultReader, export_json
 from ..utils.file_explorer import open_file_explorer
-from ..utils.image_helpers import draw_bounding_box, draw_segmentation_mask_from_points, draw_classification_label, \
-                                   draw_keypoints
+from ..utils.mask_encoding import mask_polygon
+from ..utils.overlay_renderer import OverlayRenderer
 from ..views.resizeable_graphics_widget import ResizeableGraphicsWidget
 
 
@@ -31,6 +31,7 @@ class ImageResultWidget(QWidget):
         """
         super().__init__()
         self._preset: Preset = preset
+        self._renderer: OverlayRenderer = OverlayRenderer(preset)
         self._result_path: Path = result_path
         self._input_images: list[Path] = []
         self._result_jsons: dict[Path, list[Path]] = {}
@@ -253,9 +254,10 @@ class ImageResultWidget(QWidget):
         if file_name:
             if not file_name.lower().endswith('.json'):
                 file_name += ".json"
-            if QFile.copy(result_json, file_name):
+            try:
+                export_json(result_json, Path(file_name))
                 QMessageBox.information(self, self.tr('Success'), self.tr('JSON saved successfully!'))
-            else:
+            except (OSError, ValueError):
                 QMessageBox.critical(self, self.tr('Error'), self.tr('An error occurred while saving the JSON.'))
 
     def change_current_file(self) -> None:
@@ -273,9 +275,8 @@ class ImageResultWidget(QWidget):
         self._model_select_combo.clear()
         self._model_select_combo.addItem('None')
         for result_json in self._result_jsons[input_image]:
-            with open(result_json, 'r') as file:
-                data = json.load(file)
-            self._model_select_combo.addItem(f"{data['model_builder']}.{data['weight']}", result_json)
+            info = ResultReader(result_json).info
+            self._model_select_combo.addItem(f"{info['model_builder']}.{info['weight']}", result_json)
 
     def change_current_model(self) -> None:
         """
@@ -296,8 +297,7 @@ class ImageResultWidget(QWidget):
         result_json = self._result_jsons[input_image][index - 1]
         img_size = QPixmap(str(input_image)).size()
 
-        with open(result_json, 'r') as file:
-            data = json.load(file)
+        data = ResultReader(result_json).to_dict()
 
         # Add each layer to the list and scene
         for index, result in enumerate(data['results']):
@@ -312,23 +312,18 @@ class ImageResultWidget(QWidget):
             layer = np.full((img_size.height(), img_size.width(), 4), 0, np.uint8)
 
             if data['task'] == 'detection':
-                top_left = (int(result['x1']), int(result['y1']))
-                bottom_right = (int(result['x2']), int(result['y2']))
-              
-                draw_bounding_box(
-                    layer, top_left, bottom_right, class_name, result['classid'], confidence,
-                    self._preset
-                )
+                box = np.array([[result['x1'], result['y1'], result['x2'], result['y2']]], dtype=int)
+                self._renderer.draw_boxes(layer, box, np.array([result['classid']]), np.array([confidence]),
+                                          data['classes'])
 
             if data['task'] == 'segmentation':
-                draw_segmentation_mask_from_points(layer, np.array(result['mask']), result['classid'], self._preset)
+                self._renderer.draw_masks(layer, [mask_polygon(result['mask'])], np.array([result['classid']]))
 
             if data['task'] == 'classification':
-                draw_classification_label(layer, class_name, confidence, self._preset, index)
+                self._renderer.draw_labels(layer, [class_name], [confidence], index)
 
             if data['task'] == 'pose':
-                xy = result['xy']
-                draw_keypoints(layer, xy, self._preset)
+                self._renderer.draw_poses(layer, np.array([result['xy']], dtype=int))
 
             # Add the layer to the scene
             q_img = QImage(layer.data, img_size.width(), img_size.height(), 4 * img_size.width(),
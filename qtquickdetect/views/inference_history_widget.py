@@ -6,6 +6,7 @@ from typing import Optional
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem
 from ..models.app_state import AppState
 from ..models.preset import Preset
+from ..pipeline.result_store import find_result_file
 from ..views.image_result_widget import ImageResultWidget
 from ..views.video_result_widget import VideoResultWidget
 import qtquickdetect.utils.filepaths as filepaths
@@ -180,11 +181,11 @@ class InferenceHistoryWidget(QWidget):
             for image_stem, image in collection_images_stem.items():
                 # Check if the image name from the collection is in the weight directory
                 if image_stem in dir_images:
-                    result_json = weight_dir / f'{image_stem}.json'
-                    if result_json.exists():
+                    result_json = find_result_file(weight_dir, image_stem)
+                    if result_json is not None:
                         widget.add_input_and_result(image, result_json)
                     else:
-                        logging.warning(f'Expected JSON result file {result_json} does not exist')
+                        logging.warning(f'Expected result file for {image_stem} does not exist in {weight_dir}')
 
     def _process_video_results(self, widget: VideoResultWidget, result_path: Path, collection_name: str) -> None:
         """
@@ -216,14 +217,14 @@ class InferenceHistoryWidget(QWidget):
             # For each video name in the collection
             for video_stem, video in collection_videos_stem.items():
                 result_video = result_files_stem.get(video_stem)
-
-                # Check if the video name from the collection is in the weight directory
-                if result_video:
-                    result_json = weight_dir / f'{video_stem}.json'
-                    if result_json.exists():
-                        widget.add_input_and_result(video, result_video, result_json)
-                    else:
-                        logging.warning(f'Expected JSON result file {result_json} does not exist')
+                result_json = find_result_file(weight_dir, video_stem)
+
+                # Check if the video name from the collection is in the weight directory, results only inferences
+                # have no result video
+                if result_json is not None:
+                    widget.add_input_and_result(video, result_video, result_json)
+                elif result_video:
+                    logging.warning(f'Expected result file for {video_stem} does not exist in {weight_dir}')
 
     def return_to_main_view(self) -> None:
         """
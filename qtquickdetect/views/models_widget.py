@@ -3,6 +3,7 @@ from PyQt6.QtGui import QShowEvent
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTreeWidgetItem, QTreeWidget,
                              QHBoxLayout, QFileDialog, QMessageBox, QPushButton)
 from ..models.app_state import AppState
+from ..pipeline.model_cache import ModelCache
 from ..utils import filepaths
 import shutil
 import os
@@ -127,6 +128,7 @@ class ModelsWidget(QWidget):
                     weight_file_path = weights_path / weight_name
                     if os.path.exists(weight_file_path):
                         os.remove(weight_file_path)
+                    ModelCache.get_instance().evict_weight(weight_name)
 
                     self.app_state.app_config.models[model_name]['model_builders'][model_builder].remove(weight_name)
                     self.app_state.save()
@@ -4,9 +4,10 @@ from typing import Optional
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QWidget, QListWidget, QHBoxLayout, QListWidgetItem, QLineEdit, QVBoxLayout, \
-    QPushButton, QLabel, QComboBox, QSlider, QColorDialog, QScrollArea, QCheckBox
+    QPushButton, QLabel, QComboBox, QSlider, QColorDialog, QScrollArea, QCheckBox, QDoubleSpinBox
 from ..models.app_state import AppState
 from ..models.preset import Preset
+from ..utils.display_buffer import DISPLAY_POLICIES
 
 
 class PresetsWidget(QWidget):
@@ -34,12 +35,39 @@ class PresetsWidget(QWidget):
         self._device_combo: Optional[QComboBox] = None
         self._half_precision_checkbox: Optional[QCheckBox] = None
         self._iou_slider: Optional[QSlider] = None
+        self._confidence_slider: Optional[QSlider] = None
+        self._max_detections_slider: Optional[QSlider] = None
+        self._batch_size_slider: Optional[QSlider] = None
+        self._prefetch_depth_slider: Optional[QSlider] = None
+        self._writer_threads_slider: Optional[QSlider] = None
+        self._worker_processes_slider: Optional[QSlider] = None
+        self._max_concurrent_pipelines_slider: Optional[QSlider] = None
+        self._shared_decoding_checkbox: Optional[QCheckBox] = None
         self._image_format_combo: Optional[QComboBox] = None
         self._video_format_combo: Optional[QComboBox] = None
+        self._video_backend_combo: Optional[QComboBox] = None
+        self._video_codec_combo: Optional[QComboBox] = None
+        self._video_hw_acceleration_checkbox: Optional[QCheckBox] = None
+        self._video_threads_slider: Optional[QSlider] = None
+        self._frame_stride_slider: Optional[QSlider] = None
+        self._target_fps_slider: Optional[QSlider] = None
+        self._start_time_spinbox: Optional[QDoubleSpinBox] = None
+        self._end_time_spinbox: Optional[QDoubleSpinBox] = None
+        self._stream_max_fps_slider: Optional[QSlider] = None
+        self._stream_target_latency_slider: Optional[QSlider] = None
+        self._stream_display_policy_combo: Optional[QComboBox] = None
+        self._stream_display_delay_slider: Optional[QSlider] = None
+        self._results_only_checkbox: Optional[QCheckBox] = None
+        self._result_format_combo: Optional[QComboBox] = None
+        self._mask_encoding_combo: Optional[QComboBox] = None
+        self._mask_tolerance_slider: Optional[QSlider] = None
         self._box_color_button: Optional[QPushButton] = None
         self._box_color_by_class_checkbox: Optional[QCheckBox] = None
         self._segment_color_button: Optional[QPushButton] = None
         self._segment_color_by_class_checkbox: Optional[QCheckBox] = None
+        self._palette_label: Optional[QLabel] = None
+        self._palette_add_button: Optional[QPushButton] = None
+        self._palette_clear_button: Optional[QPushButton] = None
         self._text_color_button: Optional[QPushButton] = None
         self._box_thickness_slider: Optional[QSlider] = None
         self._segment_thickness_slider: Optional[QSlider] = None
@@ -94,6 +122,60 @@ class PresetsWidget(QWidget):
         self._preset_layout.addWidget(QLabel(self.tr('IOU Threshold:')))
         self._preset_layout.addWidget(self._iou_slider)
 
+        # Confidence slider
+        self._confidence_slider = QSlider(Qt.Orientation.Horizontal)
+        self._confidence_slider.setRange(0, 100)
+        self._confidence_slider.valueChanged.connect(self.set_confidence_threshold)
+        self._preset_layout.addWidget(QLabel(self.tr('Confidence Threshold:')))
+        self._preset_layout.addWidget(self._confidence_slider)
+
+        # Max detections slider
+        self._max_detections_slider = QSlider(Qt.Orientation.Horizontal)
+        self._max_detections_slider.setRange(1, 1000)
+        self._max_detections_slider.valueChanged.connect(self.set_max_detections)
+        self._preset_layout.addWidget(QLabel(self.tr('Max Detections:')))
+        self._preset_layout.addWidget(self._max_detections_slider)
+
+        # Batch size slider
+        self._batch_size_slider = QSlider(Qt.Orientation.Horizontal)
+        self._batch_size_slider.setRange(1, 64)
+        self._batch_size_slider.valueChanged.connect(self.set_batch_size)
+        self._preset_layout.addWidget(QLabel(self.tr('Batch Size:')))
+        self._preset_layout.addWidget(self._batch_size_slider)
+
+        # Prefetch depth slider
+        self._prefetch_depth_slider = QSlider(Qt.Orientation.Horizontal)
+        self._prefetch_depth_slider.setRange(1, 32)
+        self._prefetch_depth_slider.valueChanged.connect(self.set_prefetch_depth)
+        self._preset_layout.addWidget(QLabel(self.tr('Prefetch Depth:')))
+        self._preset_layout.addWidget(self._prefetch_depth_slider)
+
+        # Writer threads slider
+        self._writer_threads_slider = QSlider(Qt.Orientation.Horizontal)
+        self._writer_threads_slider.setRange(1, 16)
+        self._writer_threads_slider.valueChanged.connect(self.set_writer_threads)
+        self._preset_layout.addWidget(QLabel(self.tr('Writer Threads:')))
+        self._preset_layout.addWidget(self._writer_threads_slider)
+
+        # Worker processes slider
+        self._worker_processes_slider = QSlider(Qt.Orientation.Horizontal)
+        self._worker_processes_slider.setRange(1, 16)
+        self._worker_processes_slider.valueChanged.connect(self.set_worker_processes)
+        self._preset_layout.addWidget(QLabel(self.tr('Worker Processes:')))
+        self._preset_layout.addWidget(self._worker_processes_slider)
+
+        # Max concurrent pipelines slider
+        self._max_concurrent_pipelines_slider = QSlider(Qt.Orientation.Horizontal)
+        self._max_concurrent_pipelines_slider.setRange(1, 8)
+        self._max_concurrent_pipelines_slider.valueChanged.connect(self.set_max_concurrent_pipelines)
+        self._preset_layout.addWidget(QLabel(self.tr('Max Concurrent Models:')))
+        self._preset_layout.addWidget(self._max_concurrent_pipelines_slider)
+
+        # Shared decoding checkbox
+        self._shared_decoding_checkbox = QCheckBox(self.tr('Decode Inputs Once for All Models'))
+        self._shared_decoding_checkbox.toggled.connect(self.set_shared_decoding)
+        self._preset_layout.addWidget(self._shared_decoding_checkbox)
+
         # Image format selection
         self._image_format_combo = QComboBox()
         self._image_format_combo.addItems(["png", "jpg"])
@@ -108,6 +190,117 @@ class PresetsWidget(QWidget):
         self._preset_layout.addWidget(QLabel(self.tr('Video Format:')))
         self._preset_layout.addWidget(self._video_format_combo)
 
+        # Video backend selection
+        self._video_backend_combo = QComboBox()
+        self._video_backend_combo.addItems(["opencv", "pyav", "ffmpeg"])
+        self._video_backend_combo.currentTextChanged.connect(self.set_video_backend)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Backend:')))
+        self._preset_layout.addWidget(self._video_backend_combo)
+
+        # Video codec selection
+        self._video_codec_combo = QComboBox()
+        self._video_codec_combo.addItems(["mpeg4", "h264", "mjpeg"])
+        self._video_codec_combo.currentTextChanged.connect(self.set_video_codec)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Codec:')))
+        self._preset_layout.addWidget(self._video_codec_combo)
+
+        # Video hardware acceleration
+        self._video_hw_acceleration_checkbox = QCheckBox(self.tr('Hardware Video Acceleration (OpenCV)'))
+        self._video_hw_acceleration_checkbox.toggled.connect(self.set_video_hw_acceleration)
+        self._preset_layout.addWidget(self._video_hw_acceleration_checkbox)
+
+        # Video threads slider
+        self._video_threads_slider = QSlider(Qt.Orientation.Horizontal)
+        self._video_threads_slider.setRange(0, 32)
+        self._video_threads_slider.valueChanged.connect(self.set_video_threads)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Threads (0 for Auto):')))
+        self._preset_layout.addWidget(self._video_threads_slider)
+
+        # Frame stride slider
+        self._frame_stride_slider = QSlider(Qt.Orientation.Horizontal)
+        self._frame_stride_slider.setRange(1, 120)
+        self._frame_stride_slider.valueChanged.connect(self.set_frame_stride)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Frame Stride:')))
+        self._preset_layout.addWidget(self._frame_stride_slider)
+
+        # Target FPS slider
+        self._target_fps_slider = QSlider(Qt.Orientation.Horizontal)
+        self._target_fps_slider.setRange(0, 60)
+        self._target_fps_slider.valueChanged.connect(self.set_target_fps)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Inference FPS (0 for All Frames):')))
+        self._preset_layout.addWidget(self._target_fps_slider)
+
+        # Video time window
+        self._start_time_spinbox = QDoubleSpinBox()
+        self._start_time_spinbox.setRange(0.0, 86400.0)
+        self._start_time_spinbox.setSuffix(' s')
+        self._start_time_spinbox.valueChanged.connect(self.set_start_time)
+        self._preset_layout.addWidget(QLabel(self.tr('Video Start Time:')))
+        self._preset_layout.addWidget(self._start_time_spinbox)
+
+        # The end time is after the start time, its minimum value, shown as the end of the video, stands for 0
+        self._end_time_spinbox = QDoubleSpinBox()
+        self._end_time_spinbox.setRange(0.0, 86400.0)
+        self._end_time_spinbox.setSuffix(' s')
+        self._end_time_spinbox.setSpecialValueText(self.tr('End of Video'))
+        self._end_time_spinbox.valueChanged.connect(self.set_end_time)
+        self._preset_layout.addWidget(QLabel(self.tr('Video End Time:')))
+        self._preset_layout.addWidget(self._end_time_spinbox)
+
+        # Stream max FPS slider
+        self._stream_max_fps_slider = QSlider(Qt.Orientation.Horizontal)
+        self._stream_max_fps_slider.setRange(1, 60)
+        self._stream_max_fps_slider.valueChanged.connect(self.set_stream_max_fps)
+        self._preset_layout.addWidget(QLabel(self.tr('Stream Max FPS:')))
+        self._preset_layout.addWidget(self._stream_max_fps_slider)
+
+        # Stream target latency slider
+        self._stream_target_latency_slider = QSlider(Qt.Orientation.Horizontal)
+        self._stream_target_latency_slider.setRange(50, 2000)
+        self._stream_target_latency_slider.valueChanged.connect(self.set_stream_target_latency)
+        self._preset_layout.addWidget(QLabel(self.tr('Stream Target Latency (ms):')))
+        self._preset_layout.addWidget(self._stream_target_latency_slider)
+
+        # Stream display policy selection
+        self._stream_display_policy_combo = QComboBox()
+        self._stream_display_policy_combo.addItems(DISPLAY_POLICIES)
+        self._stream_display_policy_combo.currentTextChanged.connect(self.set_stream_display_policy)
+        self._preset_layout.addWidget(QLabel(self.tr('Stream Display Policy:')))
+        self._preset_layout.addWidget(self._stream_display_policy_combo)
+
+        # Stream display delay slider
+        self._stream_display_delay_slider = QSlider(Qt.Orientation.Horizontal)
+        self._stream_display_delay_slider.setRange(0, 1000)
+        self._stream_display_delay_slider.valueChanged.connect(self.set_stream_display_delay)
+        self._preset_layout.addWidget(QLabel(self.tr('Stream Display Delay (ms, smooth policy):')))
+        self._preset_layout.addWidget(self._stream_display_delay_slider)
+
+        # Result format selection
+        self._result_format_combo = QComboBox()
+        self._result_format_combo.addItems(["json", "npz"])
+        self._result_format_combo.currentTextChanged.connect(self.set_result_format)
+        self._preset_layout.addWidget(QLabel(self.tr('Result Format:')))
+        self._preset_layout.addWidget(self._result_format_combo)
+
+        # Mask encoding selection
+        self._mask_encoding_combo = QComboBox()
+        self._mask_encoding_combo.addItems(["float", "int", "rle"])
+        self._mask_encoding_combo.currentTextChanged.connect(self.set_mask_encoding)
+        self._preset_layout.addWidget(QLabel(self.tr('Mask Encoding:')))
+        self._preset_layout.addWidget(self._mask_encoding_combo)
+
+        # Mask simplification tolerance
+        self._mask_tolerance_slider = QSlider(Qt.Orientation.Horizontal)
+        self._mask_tolerance_slider.setRange(0, 50)
+        self._mask_tolerance_slider.valueChanged.connect(self.set_mask_tolerance)
+        self._preset_layout.addWidget(QLabel(self.tr('Mask Simplification Tolerance:')))
+        self._preset_layout.addWidget(self._mask_tolerance_slider)
+
+        # Results only
+        self._results_only_checkbox = QCheckBox(self.tr('Save Results Only (No Images or Videos)'))
+        self._results_only_checkbox.toggled.connect(self.set_results_only)
+        self._preset_layout.addWidget(self._results_only_checkbox)
+
         # Box color picker
         self._box_color_button = QPushButton(self.tr('Set Box Color'))
         self._box_color_button.clicked.connect(self.set_box_color)
@@ -130,6 +323,17 @@ class PresetsWidget(QWidget):
         self._segment_color_by_class_checkbox.toggled.connect(self.set_segment_color_by_class)
         self._preset_layout.addWidget(self._segment_color_by_class_checkbox)
 
+        # Class palette
+        self._palette_label = QLabel()
+        self._palette_add_button = QPushButton(self.tr('Add Palette Color'))
+        self._palette_add_button.clicked.connect(self.add_palette_color)
+        self._palette_clear_button = QPushButton(self.tr('Clear Palette'))
+        self._palette_clear_button.clicked.connect(self.clear_palette)
+        self._preset_layout.addWidget(QLabel(self.tr('Class Palette:')))
+        self._preset_layout.addWidget(self._palette_label)
+        self._preset_layout.addWidget(self._palette_add_button)
+        self._preset_layout.addWidget(self._palette_clear_button)
+
         # Text color picker
         self._text_color_button = QPushButton(self.tr('Set Text Color'))
         self._text_color_button.clicked.connect(self.set_text_color)
@@ -263,8 +467,32 @@ class PresetsWidget(QWidget):
         self._device_combo.setCurrentText(self.get_device())
         self._half_precision_checkbox.setChecked(self.current_preset.half_precision)
         self._iou_slider.setValue(int(self.current_preset.iou_threshold * 100))
+        self._confidence_slider.setValue(int(self.current_preset.confidence_threshold * 100))
+        self._max_detections_slider.setValue(self.current_preset.max_detections)
+        self._batch_size_slider.setValue(self.current_preset.batch_size)
+        self._prefetch_depth_slider.setValue(self.current_preset.prefetch_depth)
+        self._writer_threads_slider.setValue(self.current_preset.writer_threads)
+        self._worker_processes_slider.setValue(self.current_preset.worker_processes)
+        self._max_concurrent_pipelines_slider.setValue(self.current_preset.max_concurrent_pipelines)
+        self._shared_decoding_checkbox.setChecked(self.current_preset.shared_decoding)
         self._image_format_combo.setCurrentText(self.current_preset.image_format)
         self._video_format_combo.setCurrentText(self.current_preset.video_format)
+        self._video_backend_combo.setCurrentText(self.current_preset.video_backend)
+        self._video_codec_combo.setCurrentText(self.current_preset.video_codec)
+        self._video_hw_acceleration_checkbox.setChecked(self.current_preset.video_hw_acceleration)
+        self._video_threads_slider.setValue(self.current_preset.video_threads)
+        self._frame_stride_slider.setValue(self.current_preset.frame_stride)
+        self._target_fps_slider.setValue(int(self.current_preset.target_fps))
+        self._start_time_spinbox.setValue(self.current_preset.start_time)
+        self.update_end_time_spinbox()
+        self._stream_max_fps_slider.setValue(int(self.current_preset.stream_max_fps))
+        self._stream_target_latency_slider.setValue(int(self.current_preset.stream_target_latency * 1000.0))
+        self._stream_display_policy_combo.setCurrentText(self.current_preset.stream_display_policy)
+        self._stream_display_delay_slider.setValue(int(self.current_preset.stream_display_delay * 1000.0))
+        self._result_format_combo.setCurrentText(self.current_preset.result_format)
+        self._mask_encoding_combo.setCurrentText(self.current_preset.mask_encoding)
+        self._mask_tolerance_slider.setValue(int(self.current_preset.mask_tolerance * 10.0))
+        self._results_only_checkbox.setChecked(self.current_preset.results_only)
         self._box_thickness_slider.setValue(self.current_preset.box_thickness)
         self._segment_thickness_slider.setValue(self.current_preset.segment_thickness)
         self._text_size_slider.setValue(int(self.current_preset.text_size * 10.0))
@@ -276,6 +504,7 @@ class PresetsWidget(QWidget):
         self._text_color_button.setStyleSheet(f'background-color: rgb({text_color[0]}, {text_color[1]}, {text_color[2]});')
         self._box_color_by_class_checkbox.setChecked(self.current_preset.box_color_per_class)
         self._segment_color_by_class_checkbox.setChecked(self.current_preset.segment_color_per_class)
+        self._update_palette_label()
         pose_head_color = self.current_preset.pose_head_color
         pose_chest_color = self.current_preset.pose_chest_color
         pose_leg_color = self.current_preset.pose_leg_color
@@ -363,6 +592,78 @@ class PresetsWidget(QWidget):
         self.current_preset.iou_threshold = value / 100.0
         self.current_preset.save()
 
+    def set_confidence_threshold(self, value: int) -> None:
+        """
+        Sets the confidence threshold for the current preset
+
+        :param value: The confidence threshold value
+        """
+        self.current_preset.confidence_threshold = value / 100.0
+        self.current_preset.save()
+
+    def set_max_detections(self, value: int) -> None:
+        """
+        Sets the maximum number of detections per image for the current preset
+
+        :param value: The max detections value
+        """
+        self.current_preset.max_detections = value
+        self.current_preset.save()
+
+    def set_batch_size(self, value: int) -> None:
+        """
+        Sets the image batch size for the current preset
+
+        :param value: The batch size value
+        """
+        self.current_preset.batch_size = value
+        self.current_preset.save()
+
+    def set_prefetch_depth(self, value: int) -> None:
+        """
+        Sets the number of images or frames decoded ahead for the current preset
+
+        :param value: The prefetch depth value
+        """
+        self.current_preset.prefetch_depth = value
+        self.current_preset.save()
+
+    def set_writer_threads(self, value: int) -> None:
+        """
+        Sets the number of threads writing the results for the current preset
+
+        :param value: The writer threads value
+        """
+        self.current_preset.writer_threads = value
+        self.current_preset.save()
+
+    def set_worker_processes(self, value: int) -> None:
+        """
+        Sets the number of processes sharing the images of a model for the current preset
+
+        :param value: The worker processes value
+        """
+        self.current_preset.worker_processes = value
+        self.current_preset.save()
+
+    def set_max_concurrent_pipelines(self, value: int) -> None:
+        """
+        Sets the maximum number of models running at the same time for the current preset
+
+        :param value: The max concurrent pipelines value
+        """
+        self.current_preset.max_concurrent_pipelines = value
+        self.current_preset.save()
+
+    def set_shared_decoding(self, value: bool) -> None:
+        """
+        Sets the shared decoding flag for the current preset
+
+        :param value: The shared decoding flag
+        """
+        self.current_preset.shared_decoding = value
+        self.current_preset.save()
+
     def set_image_format(self, image_format: str) -> None:
         """
         Sets the image format for the current preset
@@ -381,6 +682,163 @@ class PresetsWidget(QWidget):
         self.current_preset.video_format = video_format
         self.current_preset.save()
 
+    def set_video_backend(self, video_backend: str) -> None:
+        """
+        Sets the video backend for the current preset
+
+        :param video_backend: The video backend
+        """
+        self.current_preset.video_backend = video_backend
+        self.current_preset.save()
+
+    def set_video_codec(self, video_codec: str) -> None:
+        """
+        Sets the video codec for the current preset
+
+        :param video_codec: The video codec
+        """
+        self.current_preset.video_codec = video_codec
+        self.current_preset.save()
+
+    def set_video_hw_acceleration(self, value: bool) -> None:
+        """
+        Sets the video hardware acceleration flag for the current preset
+
+        :param value: The video hardware acceleration flag
+        """
+        self.current_preset.video_hw_acceleration = value
+        self.current_preset.save()
+
+    def set_video_threads(self, value: int) -> None:
+        """
+        Sets the number of video threads for the current preset
+
+        :param value: The number of video threads
+        """
+        self.current_preset.video_threads = value
+        self.current_preset.save()
+
+    def set_frame_stride(self, value: int) -> None:
+        """
+        Sets the video frame stride for the current preset
+
+        :param value: The number of frames between two inferred frames
+        """
+        self.current_preset.frame_stride = value
+        self.current_preset.save()
+
+    def set_target_fps(self, value: int) -> None:
+        """
+        Sets the video inference FPS for the current preset
+
+        :param value: The number of inferred frames per second, 0 to infer every frame
+        """
+        self.current_preset.target_fps = float(value)
+        self.current_preset.save()
+
+    def set_start_time(self, value: float) -> None:
+        """
+        Sets the video start time for the current preset
+
+        :param value: The start time in seconds
+        """
+        self.current_preset.start_time = value
+        if 0 < self.current_preset.end_time <= value:
+            # The time window would be empty, the videos are processed up to their end instead
+            self.current_preset.end_time = 0.0
+        self.update_end_time_spinbox()
+        self.current_preset.save()
+
+    def set_end_time(self, value: float) -> None:
+        """
+        Sets the video end time for the current preset
+
+        :param value: The end time in seconds, the start time (minimum of the spinbox) for the end of the video
+        """
+        self.current_preset.end_time = value if value > self.current_preset.start_time else 0.0
+        self.current_preset.save()
+
+    def update_end_time_spinbox(self) -> None:
+        """
+        Updates the end time spinbox from the current preset, its minimum is the start time
+        """
+        self._end_time_spinbox.blockSignals(True)
+        self._end_time_spinbox.setMinimum(self.current_preset.start_time)
+        self._end_time_spinbox.setValue(self.current_preset.end_time or self.current_preset.start_time)
+        self._end_time_spinbox.blockSignals(False)
+
+    def set_stream_max_fps(self, value: int) -> None:
+        """
+        Sets the maximum stream FPS for the current preset
+
+        :param value: The maximum number of processed stream frames per second
+        """
+        self.current_preset.stream_max_fps = float(value)
+        self.current_preset.save()
+
+    def set_stream_target_latency(self, value: int) -> None:
+        """
+        Sets the stream target latency for the current preset
+
+        :param value: The target latency, in milliseconds
+        """
+        self.current_preset.stream_target_latency = value / 1000.0
+        self.current_preset.save()
+
+    def set_stream_display_policy(self, policy: str) -> None:
+        """
+        Sets the stream display policy for the current preset
+
+        :param policy: The display policy
+        """
+        self.current_preset.stream_display_policy = policy
+        self.current_preset.save()
+
+    def set_stream_display_delay(self, value: int) -> None:
+        """
+        Sets the stream display delay of the smooth policy for the current preset
+
+        :param value: The delay between the capture and the display of the frames, in milliseconds
+        """
+        self.current_preset.stream_display_delay = value / 1000.0
+        self.current_preset.save()
+
+    def set_result_format(self, result_format: str) -> None:
+        """
+        Sets the result format for the current preset
+
+        :param result_format: The result format
+        """
+        self.current_preset.result_format = result_format
+        self.current_preset.save()
+
+    def set_mask_encoding(self, mask_encoding: str) -> None:
+        """
+        Sets the mask encoding for the current preset
+
+        :param mask_encoding: The mask encoding
+        """
+        self.current_preset.mask_encoding = mask_encoding
+        self.current_preset.save()
+
+    def set_mask_tolerance(self, value: int) -> None:
+        """
+        Sets the mask simplification tolerance for the current preset
+
+        :param value: The mask tolerance value, in tenths of a pixel
+        """
+        self.current_preset.mask_tolerance = value / 10.0
+        self.current_preset.save()
+
+    def set_results_only(self, value: bool) -> None:
+        """
+        Sets the results only flag for the current preset
+
+        :param value: The results only flag
+        """
+        self.current_preset.results_only = value
+        self.current_preset.save()
+
     def set_color(self, color_attribute: str) -> None:
         """
         Sets the color for the current preset
@@ -471,6 +929,39 @@ class PresetsWidget(QWidget):
         self.current_preset.segment_color_per_class = value
         self.current_preset.save()
 
+    def add_palette_color(self) -> None:
+        """
+        Adds a color to the class palette of the current preset
+        """
+        color_picker = QColorDialog()
+        color_picker.setOption(QColorDialog.ColorDialogOption.ShowAlphaChannel)
+        if color_picker.exec() == QColorDialog.DialogCode.Accepted:
+            new_color = color_picker.currentColor()
+            self.current_preset.palette.append((new_color.red(), new_color.green(), new_color.blue(),
+                                                new_color.alpha()))
+            self.current_preset.save()
+            self._update_palette_label()
+
+    def clear_palette(self) -> None:
+        """
+        Clears the class palette of the current preset, the class colors are generated again
+        """
+        self.current_preset.palette = []
+        self.current_preset.save()
+        self._update_palette_label()
+
+    def _update_palette_label(self) -> None:
+        """
+        Updates the palette label with the colors of the current preset palette
+        """
+        palette = self.current_preset.palette
+        if not palette:
+            self._palette_label.setText(self.tr('Generated colors'))
+            return
+        swatches = ''.join(f'<span style="color: rgb({color[0]}, {color[1]}, {color[2]});">&#9632;</span>'
+                           for color in palette)
+        self._palette_label.setText(swatches)
+
     def set_box_thickness(self, value: int) -> None:
         """
         Sets the box thickness for the current preset
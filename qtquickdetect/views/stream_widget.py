@@ -1,15 +1,20 @@
+import time
 import numpy as np
 
-from collections import deque
 from typing import Optional
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QGraphicsScene, QGraphicsPixmapItem, QHBoxLayout, QPushButton
 from ..models.preset import Preset
 from ..pipeline.pipeline_manager import PipelineManager
+from ..utils.display_buffer import DisplayBuffer
 from ..views.resizeable_graphics_widget import ResizeableGraphicsWidget
 
 
+# Interval between two checks of the display buffer, in milliseconds
+DISPLAY_INTERVAL = 5
+
+
 class StreamWidget(QWidget):
     fatal_error_signal = pyqtSignal(str, Exception)
 
@@ -31,9 +36,10 @@ class StreamWidget(QWidget):
         self._timer: Optional[QTimer] = None
         self._live_url: str = live_url
         self._pipeline_manager: PipelineManager = PipelineManager(task, preset, models)
-        self._frame_buffer: deque[np.ndarray] = deque(maxlen=30)
-        self._buffer_rate: float = 1.0
+        self._display_buffer: DisplayBuffer = DisplayBuffer(preset.stream_display_policy, preset.stream_display_delay,
+                                                            self.release_frame)
         self._frame_update_count: int = 0
+        self._latency: float = 0.0
         self._real_fps: int = 0
         self._fps_timer: QTimer = QTimer(self)
         self._fps_timer.timeout.connect(self.calculate_real_fps)
@@ -44,13 +50,16 @@ class StreamWidget(QWidget):
         self._container_widget: Optional[QWidget] = None
         self._container_layout: Optional[QHBoxLayout] = None
         self._scene: Optional[QGraphicsScene] = None
+        self._pixmap: QPixmap = QPixmap()
+        self._pixmap_item: Optional[QGraphicsPixmapItem] = None
         self._view: Optional[ResizeableGraphicsWidget] = None
         self._stats_label: Optional[QLabel] = None
         self._real_fps_label: Optional[QLabel] = None
         self._fetcher_fps_label: Optional[QLabel] = None
+        self._latency_label: Optional[QLabel] = None
         self._buffer_size_label: Optional[QLabel] = None
-        self._buffer_max_size_label: Optional[QLabel] = None
-        self._buffer_rate_label: Optional[QLabel] = None
+        self._dropped_frames_label: Optional[QLabel] = None
+        self._display_policy_label: Optional[QLabel] = None
         self._return_button: Optional[QPushButton] = None
         self._stats_layout: Optional[QVBoxLayout] = None
         self._main_layout: Optional[QHBoxLayout] = None
@@ -71,6 +80,9 @@ class StreamWidget(QWidget):
         self._container_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self._scene = QGraphicsScene(self._container_widget)
+        # Single item showing the frames, its pixmap is updated in place
+        self._pixmap_item = QGraphicsPixmapItem()
+        self._scene.addItem(self._pixmap_item)
 
         self._view = ResizeableGraphicsWidget(self._scene, self._container_widget)
         self._view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -81,9 +93,10 @@ class StreamWidget(QWidget):
         self._stats_label = QLabel(self.tr('Live stats: '))
         self._real_fps_label = QLabel('FPS: 0')
         self._fetcher_fps_label = QLabel('Fetcher FPS: 0')
+        self._latency_label = QLabel('Latency: 0 ms')
         self._buffer_size_label = QLabel('Buffer Size: 0')
-        self._buffer_max_size_label = QLabel(f"Buffer Max Size: {self._frame_buffer.maxlen}")
-        self._buffer_rate_label = QLabel(f"Buffer Rate: {self._buffer_rate}")
+        self._dropped_frames_label = QLabel('Dropped Frames: 0')
+        self._display_policy_label = QLabel(f'Display Policy: {self._display_buffer.policy}')
         self._return_button = QPushButton(self.tr('Return'))
         self._return_button.clicked.connect(self.return_to_main_view)
 
@@ -92,9 +105,10 @@ class StreamWidget(QWidget):
         self._stats_layout.addWidget(self._stats_label)
         self._stats_layout.addWidget(self._real_fps_label)
         self._stats_layout.addWidget(self._fetcher_fps_label)
+        self._stats_layout.addWidget(self._latency_label)
         self._stats_layout.addWidget(self._buffer_size_label)
-        self._stats_layout.addWidget(self._buffer_max_size_label)
-        self._stats_layout.addWidget(self._buffer_rate_label)
+        self._stats_layout.addWidget(self._dropped_frames_label)
+        self._stats_layout.addWidget(self._display_policy_label)
         self._stats_layout.addWidget(self._return_button)
 
         self._main_layout = QHBoxLayout()
@@ -110,65 +124,68 @@ class StreamWidget(QWidget):
     def start(self) -> None:
         """
         Start the pipeline and timer
-        Set the timer to update frame at the rate of pipeline fps * buffer rate
+        The timer checks the display buffer at a fixed interval, the buffer decides when each frame is shown
         """
         self._pipeline_manager.finished_stream_frame_signal.connect(self.receive_frame)
         self._pipeline_manager.fatal_error_signal.connect(self.fatal_error_signal)
         self._pipeline_manager.run_stream(self._live_url)
         self._timer = QTimer(self)
         self._timer.timeout.connect(self.update_frame)
+        self._timer.start(DISPLAY_INTERVAL)
 
-    def receive_frame(self, frame: np.ndarray) -> None:
+    def receive_frame(self, frame: np.ndarray, frame_time: float) -> None:
         """
-        Receive frame from pipeline and add to buffer if buffer is not full, otherwise update the frame.
-        Adjust the buffer rate according to the buffer size.
+        Receive frame from pipeline and add it to the display buffer
 
         :param frame: The frame received from the pipeline.
+        :param frame_time: The time.monotonic() capture time of the frame.
         """
-        if not self._timer.isActive():
-            self._timer.start(int(1000.0 / self._pipeline_manager.current_pipeline.stream_fps / self._buffer_rate))
-        if len(self._frame_buffer) < 30:
-            self._frame_buffer.append(frame)
-        else:
-            self.update_frame()
-            self._frame_buffer.append(frame)
-        self._buffer_rate = len(self._frame_buffer) / self._frame_buffer.maxlen
-        self._timer.setInterval(int(1000.0 / self._pipeline_manager.current_pipeline.stream_fps / self._buffer_rate))
+        self._display_buffer.put(frame, frame_time)
 
     def update_frame(self) -> None:
         """
-        Update the frame in the buffer to the live label
+        Show the frame due in the display buffer, if any, and its capture to display latency
         """
-        if len(self._frame_buffer) == 0:
+        item = self._display_buffer.take()
+        if item is None:
             return
 
-        frame = self._frame_buffer.popleft()
+        frame, frame_time = item
         self._frame_update_count += 1
+        self._latency = time.monotonic() - frame_time
 
+        # The RGB frame is wrapped without copy, and uploaded to the reused pixmap
         height, width, channel = frame.shape
         bytes_per_line = 3 * width
-        q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888).rgbSwapped()
-        pixmap = QPixmap.fromImage(q_img)
-        self.resize_and_add_pixmap(pixmap)
+        q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+        self._pixmap.convertFromImage(q_img)
+        self.release_frame(frame)
+        self.resize_and_set_pixmap(self._pixmap)
 
         self.update_info_label()
 
-    def resize_and_add_pixmap(self, pixmap: QPixmap) -> None:
+    def release_frame(self, frame: np.ndarray) -> None:
+        """
+        Gives the buffer of a shown or dropped frame back to the frame ring of the pipeline
+
+        :param frame: The frame buffer
         """
-        Resize the pixmap and add to the scene
+        if self._pipeline_manager is not None and self._pipeline_manager.current_pipeline is not None:
+            self._pipeline_manager.current_pipeline.frame_ring.release(frame)
 
-        :param pixmap: The pixmap to add to the scene
+    def resize_and_set_pixmap(self, pixmap: QPixmap) -> None:
+        """
+        Resize the pixmap item to the view and update its pixmap
+
+        :param pixmap: The pixmap to show
         """
         view = self._scene.views()[0]
         view_size = view.size()
 
         scale_factor = min(view_size.width() / pixmap.width(), view_size.height() / pixmap.height())
 
-        frame_item = QGraphicsPixmapItem(pixmap)
-        frame_item.setScale(scale_factor)
-
-        self._scene.clear()
-        self._scene.addItem(frame_item)
+        self._pixmap_item.setPixmap(pixmap)
+        self._pixmap_item.setScale(scale_factor)
 
     def stop(self) -> None:
         """
@@ -176,6 +193,7 @@ class StreamWidget(QWidget):
         """
         self._pipeline_manager.request_cancel()
         self._timer.stop()
+        self._display_buffer.clear()
         self._fps_timer.stop()
         self._timer = None
         self._pipeline_manager = None
@@ -194,11 +212,12 @@ class StreamWidget(QWidget):
         Update the info label
         """
         fetcher_fps = self._pipeline_manager.current_pipeline.stream_fps
-        buffer_size = len(self._frame_buffer)
+        buffer_size = len(self._display_buffer)
         self._real_fps_label.setText(f'FPS: {self._real_fps}')
         self._fetcher_fps_label.setText(f'Fetcher FPS: {fetcher_fps:.2f}')
+        self._latency_label.setText(f'Latency: {self._latency * 1000.0:.0f} ms')
         self._buffer_size_label.setText(f'Buffer Size: {buffer_size}')
-        self._buffer_rate_label.setText(f'Buffer Rate: {self._buffer_rate:.2f}')
+        self._dropped_frames_label.setText(f'Dropped Frames: {self._display_buffer.dropped}')
 
     def return_to_main_view(self) -> None:
         """
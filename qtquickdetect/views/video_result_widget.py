@@ -1,4 +1,3 @@
-import json
 import cv2 as cv
 
 from pathlib import Path
@@ -6,6 +5,7 @@ from typing import Optional
 from PyQt6.QtCore import Qt, QFile, pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QMessageBox, \
     QFileDialog, QSplitter
+from ..pipeline.result_store import ResultReader, export_json
 from ..utils.file_explorer import open_file_explorer
 from ..views.video_player_widget import VideoPlayerWidget
 
@@ -25,7 +25,7 @@ class VideoResultWidget(QWidget):
         super().__init__()
         self._result_path: Path = result_path
         self._input_videos: list[Path] = []
-        self._result_videos: dict[Path, list[Path]] = {}
+        self._result_videos: dict[Path, list[Optional[Path]]] = {}
         self._result_jsons: dict[Path, list[Path]] = {}
 
         # PyQT6 Components
@@ -199,9 +199,10 @@ class VideoResultWidget(QWidget):
         if file_name:
             if not file_name.lower().endswith('.json'):
                 file_name += ".json"
-            if QFile.copy(result_json, file_name):
+            try:
+                export_json(result_json, Path(file_name))
                 QMessageBox.information(self, self.tr('Success'), self.tr('JSON saved successfully!'))
-            else:
+            except (OSError, ValueError):
                 QMessageBox.critical(self, self.tr('Error'), self.tr('An error occurred while saving the JSON.'))
 
     def save_video(self) -> None:
@@ -269,9 +270,8 @@ class VideoResultWidget(QWidget):
         self._model_select_combo.clear()
         self._model_select_combo.addItem('Input')
         for index, result_video in enumerate(self._result_videos[input_video]):
-            with open(self._result_jsons[input_video][index], 'r') as f:
-                data = json.load(f)
-            self._model_select_combo.addItem(f"{data['model_builder']}{data['weight']}",
+            info = ResultReader(self._result_jsons[input_video][index]).info
+            self._model_select_combo.addItem(f"{info['model_builder']}{info['weight']}",
                                              self._result_jsons[input_video][index])
 
     def change_current_model(self) -> None:
@@ -289,9 +289,9 @@ class VideoResultWidget(QWidget):
             self.change_current_video(input_video)
             return
 
-        # Update the video
+        # Update the video, the input is shown if only the results were saved
         result_video = self._result_videos[input_video][index - 1]
-        self.change_current_video(result_video)
+        self.change_current_video(result_video if result_video is not None else input_video)
 
     def change_current_video(self, video_path: Path) -> None:
         """
@@ -303,12 +303,12 @@ class VideoResultWidget(QWidget):
         video_widget = self.video_ui(video_path)
         self._middle_layout.replaceWidget(1, video_widget)
 
-    def add_input_and_result(self, input_video: Path, result_video: Path, result_json: Path) -> None:
+    def add_input_and_result(self, input_video: Path, result_video: Optional[Path], result_json: Path) -> None:
         """
         Adds the input and result to the list of inputs and results.
 
         :param input_video: The path to the input video.
-        :param result_video: The path to the result video.
+        :param result_video: The path to the result video, None if only the results were saved.
         :param result_json: The path to the result JSON.
         """
         # Add the input if it's not already here
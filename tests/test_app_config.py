@@ -75,6 +75,7 @@ def test_reverting_invalid_values(mock_filepaths, monkeypatch):
     invalid_config = {
         "localization": "invalid",
         "qss": "invalid",
+        "model_cache_size": -1,
         "pipelines": {},
         "models": {}
     }
@@ -86,6 +87,7 @@ def test_reverting_invalid_values(mock_filepaths, monkeypatch):
 
     assert app_config.localization == 'en'  # Should revert to default
     assert app_config.qss == 'dark'  # Should revert to default
+    assert app_config.model_cache_size == 2048  # Should revert to default
 
 
 def test_save_config(mock_filepaths, monkeypatch):
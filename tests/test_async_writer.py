@@ -0,0 +1,45 @@
+import threading
+
+from qtquickdetect.utils.async_writer import AsyncWriter
+
+
+def test_jobs_run_in_order_with_a_single_worker():
+    written = []
+    with AsyncWriter(1, 2) as writer:
+        for i in range(50):
+            writer.submit(written.append, i)
+    assert written == list(range(50))
+
+def test_pending_jobs_are_bounded():
+    release = threading.Event()
+    submitted = []
+
+    writer = AsyncWriter(1, 2)
+
+    def submit_jobs():
+        for i in range(4):
+            writer.submit(release.wait)
+            submitted.append(i)
+
+    thread = threading.Thread(target=submit_jobs)
+    thread.start()
+    thread.join(0.5)
+
+    # The third job waits for a free slot while the first ones are blocked
+    assert len(submitted) == 2
+
+    release.set()
+    thread.join()
+    writer.close()
+    assert len(submitted) == 4
+
+def test_first_error_is_kept():
+    def fail(message):
+        raise IOError(message)
+
+    with AsyncWriter(1, 4) as writer:
+        future = writer.submit(fail, 'first')
+        writer.submit(fail, 'second')
+
+    assert isinstance(future.exception(), IOError)
+    assert str(writer.error) == 'first'
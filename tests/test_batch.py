@@ -0,0 +1,71 @@
+import subprocess
+import sys
+import pytest
+
+from unittest.mock import MagicMock
+from qtquickdetect.batch import find_weights, parse_args
+
+
+@pytest.fixture
+def app_config():
+    app_config = MagicMock()
+    app_config.models = {
+        'YoloV8 Detect': {'task': 'detect', 'pipeline': 'Yolo Detect',
+                          'model_builders': {'yolov8n': ['yolov8n.pt']}},
+        'ResNet': {'task': 'classify', 'pipeline': 'TorchVision Classify',
+                   'model_builders': {'resnet18': ['DEFAULT'], 'resnet50': ['DEFAULT']}},
+    }
+    return app_config
+
+
+def test_find_weights(app_config):
+    assert find_weights(app_config, ['yolov8n.pt']) == [('YoloV8 Detect', 'yolov8n', 'yolov8n.pt')]
+    assert find_weights(app_config, ['resnet50.DEFAULT']) == [('ResNet', 'resnet50', 'DEFAULT')]
+
+def test_find_weights_unknown_or_ambiguous(app_config):
+    with pytest.raises(ValueError):
+        find_weights(app_config, ['yolov9c.pt'])
+    with pytest.raises(ValueError):
+        find_weights(app_config, ['DEFAULT'])
+
+def test_parse_args_repeated_models():
+    args = parse_args(['--preset', 'default.json', '--model', 'a.pt', '--model', 'b.pt', '--collection', 'X'])
+    assert args.models == ['a.pt', 'b.pt']
+    assert args.media == 'image'
+    assert not args.results_only
+
+@pytest.mark.parametrize('options', [
+    ['--frame-stride', '0'],
+    ['--target-fps', '-1'],
+    ['--start', '-2'],
+    ['--end', 'nan'],
+    ['--start', '5', '--end', '2'],
+])
+def test_parse_args_rejects_invalid_frame_sampling(options, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(['--preset', 'default.json', '--model', 'a.pt', '--collection', 'X', *options])
+    assert 'error' in capsys.readouterr().err
+
+def test_parse_args_frame_sampling():
+    args = parse_args(['--preset', 'default.json', '--model', 'a.pt', '--collection', 'X', '--frame-stride', '3',
+                       '--target-fps', '0', '--start', '1.5', '--end', '0'])
+    assert (args.frame_stride, args.target_fps, args.start, args.end) == (3, 0.0, 1.5, 0.0)
+
+def test_pipelines_import_without_pyqt():
+    code = (
+        'import os, sys\n'
+        'os.environ["QTQUICKDETECT_HEADLESS"] = "1"\n'
+        'from qtquickdetect.pipeline.pipeline import Pipeline\n'
+        'assert not any(name.startswith("PyQt6") for name in sys.modules)\n'
+        'received = []\n'
+        'class Test(Pipeline):\n'
+        '    def run(self):\n'
+        '        self.finished_all_signal.emit()\n'
+        'pipeline = Test("model", "builder", "weight", None, None, None, None, None)\n'
+        'pipeline.finished_all_signal.connect(lambda: received.append(True))\n'
+        'pipeline.start()\n'
+        'pipeline.wait()\n'
+        'assert received == [True]\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
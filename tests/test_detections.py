@@ -0,0 +1,31 @@
+import numpy as np
+import torch
+
+from qtquickdetect.pipeline.detections import Detections
+
+
+def test_from_tensors_truncates_the_boxes():
+    boxes = torch.tensor([[0.0, 1.0, 10.0, 11.0], [5.5, 6.9, 20.2, 30.7], [1.0, 1.0, 2.0, 2.0]])
+    classes = torch.tensor([1, 2, 3])
+    confidences = torch.tensor([0.9, 0.5, 0.1])
+
+    detections = Detections.from_tensors(boxes, classes, confidences)
+
+    assert len(detections) == 3
+    np.testing.assert_array_equal(detections.boxes, [[0, 1, 10, 11], [5, 6, 20, 30], [1, 1, 2, 2]])
+    np.testing.assert_array_equal(detections.classes, [1, 2, 3])
+    np.testing.assert_allclose(detections.confidences, [0.9, 0.5, 0.1])
+
+def test_to_dicts_matches_the_json_results():
+    detections = Detections.from_tensors(torch.tensor([[1.7, 2.2, 3.9, 4.1]]), torch.tensor([7.0]),
+                                         torch.tensor([0.75]))
+
+    assert detections.to_dicts() == [
+        {'x1': 1, 'y1': 2, 'x2': 3, 'y2': 4, 'classid': 7, 'confidence': 0.75}
+    ]
+
+def test_empty_detections():
+    detections = Detections.from_tensors(torch.zeros((0, 4)), torch.zeros(0), torch.zeros(0))
+
+    assert len(detections) == 0
+    assert detections.to_dicts() == []
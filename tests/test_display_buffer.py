@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from qtquickdetect.utils.display_buffer import DisplayBuffer
+
+
+@pytest.fixture
+def released():
+    return []
+
+def frame(index):
+    return np.full((2, 2, 3), index, dtype=np.uint8)
+
+def index(item):
+    return int(item[0][0, 0, 0])
+
+def test_latest_policy_shows_the_newest_frame_at_once(released):
+    buffer = DisplayBuffer('latest', 0.5, released.append)
+    for i in range(3):
+        buffer.put(frame(i), frame_time=10.0 + i * 0.1, now=10.3)
+
+    item = buffer.take(now=10.3)
+    assert index(item) == 2
+    assert [int(f[0, 0, 0]) for f in released] == [0, 1]
+    assert buffer.dropped == 2
+    assert buffer.take(now=10.3) is None
+
+def test_smooth_policy_shows_frames_after_the_target_delay(released):
+    buffer = DisplayBuffer('smooth', 0.2, released.append)
+    buffer.put(frame(0), frame_time=10.0, now=10.05)
+    buffer.put(frame(1), frame_time=10.1, now=10.12)
+
+    assert buffer.take(now=10.15) is None
+    assert index(buffer.take(now=10.2)) == 0
+    assert buffer.take(now=10.25) is None
+    assert index(buffer.take(now=10.3)) == 1
+    assert released == []
+
+def test_smooth_policy_drops_the_late_frames_but_the_newest(released):
+    buffer = DisplayBuffer('smooth', 0.1, released.append)
+    for i in range(3):
+        buffer.put(frame(i), frame_time=10.0 + i * 0.1, now=10.5)
+
+    assert index(buffer.take(now=10.5)) == 2
+    assert buffer.dropped == 2
+
+def test_paced_policy_keeps_the_capture_spacing(released):
+    buffer = DisplayBuffer('paced', 0.0, released.append)
+    # Delivered in a burst, with the highest delivery delay on the first frame
+    buffer.put(frame(0), frame_time=10.0, now=10.3)
+    buffer.put(frame(1), frame_time=10.1, now=10.31)
+    buffer.put(frame(2), frame_time=10.2, now=10.32)
+
+    assert buffer.display_delay() == pytest.approx(0.3)
+    assert index(buffer.take(now=10.32)) == 0
+    assert buffer.take(now=10.35) is None
+    assert index(buffer.take(now=10.4)) == 1
+    assert index(buffer.take(now=10.5)) == 2
+    assert released == []
+
+def test_full_buffer_drops_the_oldest_frame(released):
+    buffer = DisplayBuffer('smooth', 1.0, released.append, max_frames=2)
+    for i in range(3):
+        buffer.put(frame(i), frame_time=10.0 + i * 0.1, now=10.2)
+
+    assert len(buffer) == 2
+    assert [int(f[0, 0, 0]) for f in released] == [0]
+
+def test_clear_releases_the_buffered_frames(released):
+    buffer = DisplayBuffer('smooth', 1.0, released.append)
+    buffer.put(frame(0), frame_time=10.0, now=10.0)
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert len(released) == 1
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        DisplayBuffer('fastest', 0.0, lambda frame: None)
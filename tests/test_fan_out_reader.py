@@ -0,0 +1,55 @@
+import threading
+
+from qtquickdetect.utils.fan_out_reader import FanOutReader
+
+
+def consume(subscription, output):
+    with subscription:
+        output.extend(subscription)
+
+def test_every_consumer_gets_every_item():
+    read = []
+
+    def source():
+        for i in range(100):
+            read.append(i)
+            yield i
+
+    reader = FanOutReader(source(), 4)
+    subscriptions = [reader.subscribe(lambda: False) for _ in range(3)]
+    outputs = [[] for _ in range(3)]
+    threads = [threading.Thread(target=consume, args=(subscription, output))
+               for subscription, output in zip(subscriptions, outputs)]
+    for thread in threads:
+        thread.start()
+    reader.start()
+    for thread in threads:
+        thread.join()
+
+    # The source is read once for all the consumers
+    assert read == list(range(100))
+    assert all(output == list(range(100)) for output in outputs)
+
+def test_detached_consumer_does_not_block_the_others():
+    reader = FanOutReader(iter(range(100)), 2)
+    detached = reader.subscribe(lambda: False)
+    subscription = reader.subscribe(lambda: False)
+    detached.close()
+    reader.start()
+
+    with subscription:
+        assert list(subscription) == list(range(100))
+
+def test_iteration_resumes_after_break():
+    reader = FanOutReader(iter(range(10)), 4)
+    subscription = reader.subscribe(lambda: False)
+    reader.start()
+
+    with subscription:
+        first = []
+        for item in subscription:
+            first.append(item)
+            if item == 4:
+                break
+        assert first == [0, 1, 2, 3, 4]
+        assert list(subscription) == [5, 6, 7, 8, 9]
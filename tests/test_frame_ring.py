@@ -0,0 +1,42 @@
+import numpy as np
+
+from qtquickdetect.utils.frame_ring import FrameRing
+
+
+def bgr_frame(value=0, size=(4, 6)):
+    frame = np.zeros((*size, 3), dtype=np.uint8)
+    frame[..., 0] = value
+    return frame
+
+def test_frames_are_written_as_rgb():
+    ring = FrameRing(2)
+    buffer = ring.write(bgr_frame(200))
+
+    assert buffer.shape == (4, 6, 3)
+    assert (buffer[..., 2] == 200).all() and (buffer[..., 0] == 0).all()
+
+def test_released_buffers_are_reused():
+    ring = FrameRing(2)
+    first = ring.write(bgr_frame(1))
+    ring.release(first)
+
+    assert ring.write(bgr_frame(2)) is first
+
+def test_frames_are_dropped_while_all_buffers_are_in_use():
+    ring = FrameRing(2)
+    buffers = [ring.write(bgr_frame(index)) for index in range(2)]
+
+    assert ring.write(bgr_frame(3)) is None
+    assert ring.dropped == 1
+
+    ring.release(buffers[0])
+    assert ring.write(bgr_frame(4)) is buffers[0]
+
+def test_buffers_are_reallocated_when_the_frame_size_changes():
+    ring = FrameRing(2)
+    small = ring.write(bgr_frame(1))
+    ring.release(small)
+
+    large = ring.write(bgr_frame(1, size=(8, 8)))
+    assert large is not small
+    assert large.shape == (8, 8, 3)
@@ -0,0 +1,53 @@
+import cv2 as cv
+import numpy as np
+
+from qtquickdetect.utils.mask_encoding import decode_rle, encode_mask, encode_rle, mask_polygon, simplify_polygon
+
+
+def circle(radius=20.0, center=(32.0, 30.0), count=200):
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    return np.stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)], axis=1)
+
+
+def test_simplification_stays_within_tolerance():
+    polygon = circle()
+
+    simplified = simplify_polygon(polygon, 0.5)
+
+    assert len(simplified) < len(polygon) / 4
+    # Every original point is close to the simplified outline
+    contour = simplified.reshape(-1, 1, 2)
+    distances = [abs(cv.pointPolygonTest(contour, (float(x), float(y)), True)) for x, y in polygon]
+    assert max(distances) <= 0.5 + 1e-3
+    assert np.array_equal(simplify_polygon(polygon, 0.0), polygon.astype(np.float32))
+
+
+def test_integer_encoding():
+    mask = encode_mask(np.array([[1.4, 2.6], [10.5, 2.0], [5.0, 8.2]]), 'int', 0.0, (16, 16, 3))
+
+    assert mask == [[1, 3], [10, 2], [5, 8]]
+    assert all(isinstance(value, int) for point in mask for value in point)
+
+
+def test_rle_matches_the_filled_polygon():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        height, width = rng.integers(1, 40, 2)
+        points = rng.integers(-5, 45, (rng.integers(1, 8), 2))
+        expected = np.zeros((height, width), dtype=np.uint8)
+        cv.fillPoly(expected, [points.astype(np.int32)], 1)
+
+        rle = encode_rle(points, (height, width, 3))
+
+        assert rle['size'] == [height, width]
+        assert sum(rle['counts']) == height * width
+        assert np.array_equal(decode_rle(rle), expected)
+
+
+def test_mask_polygon_of_each_encoding():
+    square = np.array([[4, 4], [12, 4], [12, 12], [4, 12]])
+
+    assert np.array_equal(mask_polygon(square.tolist()), square)
+    outline = mask_polygon(encode_mask(square, 'rle', 0.0, (20, 20, 3)))
+    assert sorted(map(tuple, outline.tolist())) == sorted(map(tuple, square.tolist()))
+    assert len(mask_polygon({'size': [4, 4], 'counts': [16]})) == 0
@@ -0,0 +1,115 @@
+import threading
+import time
+import numpy as np
+import cv2 as cv
+import pytest
+
+from qtquickdetect.utils.media_fetcher import MediaFetcher
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / 'stream.avi'
+    out = cv.VideoWriter(str(path), cv.VideoWriter_fourcc(*'MJPG'), 10.0, (16, 16))
+    for index in range(20):
+        out.write(np.full((16, 16, 3), index * 10, dtype=np.uint8))
+    out.release()
+    return path
+
+
+def test_fetch_returns_the_newest_frame_once(video_path):
+    fetcher = MediaFetcher(str(video_path))
+    # Let the capture thread read the whole video, only the last frame is kept
+    while not fetcher.ended:
+        time.sleep(0.01)
+
+    frame, frame_available = fetcher.fetch_frame()
+    assert frame_available
+    assert abs(int(frame[0, 0, 0]) - 190) <= 8
+    assert fetcher.dropped_frames == 19
+
+    # The frame is only fetched once, the stream has ended
+    assert fetcher.fetch_frame(timeout=0.01) == (None, False)
+    fetcher.release()
+
+
+def test_fetched_frames_are_in_order(video_path):
+    fetcher = MediaFetcher(str(video_path))
+    values = []
+    while True:
+        frame, frame_available = fetcher.fetch_frame(timeout=1.0)
+        if not frame_available:
+            break
+        values.append(int(frame[0, 0, 0]))
+    fetcher.release()
+
+    assert len(values) >= 1
+    assert values == sorted(values)
+    with pytest.raises(ValueError):
+        fetcher.fetch_frame()
+
+
+def test_frames_are_only_retrieved_when_fetched(video_path, monkeypatch):
+    retrieve_threads = []
+
+    video_capture = cv.VideoCapture
+
+    class RecordingCapture:
+        def __init__(self, url_or_device):
+            self._cap = video_capture(url_or_device)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+        def retrieve(self):
+            retrieve_threads.append(threading.current_thread())
+            return self._cap.retrieve()
+    monkeypatch.setattr(cv, 'VideoCapture', RecordingCapture)
+
+    fetcher = MediaFetcher(str(video_path))
+    while not fetcher.ended:
+        time.sleep(0.01)
+    assert retrieve_threads == []
+
+    frame, frame_available = fetcher.fetch_frame()
+    fetcher.release()
+
+    assert frame_available
+    assert retrieve_threads == [threading.current_thread()]
+
+
+def test_release_does_not_wait_for_a_stalled_grab(video_path, monkeypatch):
+    unblock = threading.Event()
+    released = threading.Event()
+
+    video_capture = cv.VideoCapture
+
+    class StalledCapture:
+        def __init__(self, url_or_device):
+            self._cap = video_capture(url_or_device)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+        def grab(self):
+            unblock.wait()
+            return self._cap.grab()
+
+        def release(self):
+            released.set()
+            self._cap.release()
+    monkeypatch.setattr(cv, 'VideoCapture', StalledCapture)
+    monkeypatch.setattr('qtquickdetect.utils.media_fetcher.RELEASE_TIMEOUT', 0.1)
+
+    fetcher = MediaFetcher(str(video_path))
+    start = time.monotonic()
+    fetcher.release()
+
+    assert time.monotonic() - start < 1
+    assert fetcher.cap is None
+    with pytest.raises(ValueError):
+        fetcher.fetch_frame()
+    # The capture thread releases the stream once its grab returns
+    assert not released.is_set()
+    unblock.set()
+    assert released.wait(1)
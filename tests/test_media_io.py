@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from qtquickdetect.utils import media_io
+from qtquickdetect.utils.media_io import OpenCVVideoReader, OpenCVVideoWriter, open_video_reader, open_video_writer
+
+
+def frames(count=5, size=(32, 24)):
+    return [np.full((size[1], size[0], 3), index * 40, dtype=np.uint8) for index in range(count)]
+
+
+def write_video(path, backend, codec):
+    writer = open_video_writer(path, 10.0, (32, 24), backend, codec)
+    for frame in frames():
+        writer.write(frame)
+    writer.release()
+
+
+def test_opencv_round_trip(tmp_path):
+    write_video(tmp_path / 'video.avi', 'opencv', 'mjpeg')
+
+    with open_video_reader(tmp_path / 'video.avi') as reader:
+        assert isinstance(reader, OpenCVVideoReader)
+        assert reader.info == (32, 24, 10.0, 5)
+        decoded = list(reader.frames())
+
+    assert [position for _, position, _ in decoded] == [1, 2, 3, 4, 5]
+    for (frame, _, _), expected in zip(decoded, frames()):
+        assert np.abs(frame.astype(int) - expected).max() <= 8
+
+
+def test_frames_are_sampled_in_a_window(tmp_path):
+    write_video(tmp_path / 'video.avi', 'opencv', 'mjpeg')
+
+    with open_video_reader(tmp_path / 'video.avi') as reader:
+        decoded = list(reader.frames(start=1, end=5, stride=2))
+    with open_video_reader(tmp_path / 'video.avi') as reader:
+        sampled = list(reader.frames(start=1, stride=2, decode_skipped=False))
+
+    assert [(position, is_sampled) for _, position, is_sampled in decoded] == \
+        [(2, True), (3, False), (4, True), (5, False)]
+    assert [position for _, position, _ in sampled] == [2, 4]
+    assert np.abs(sampled[1][0].astype(int) - frames()[3]).max() <= 8
+
+
+def test_unreadable_video_is_rejected(tmp_path):
+    path = tmp_path / 'video.avi'
+    path.write_bytes(b'not a video')
+
+    with pytest.raises(IOError):
+        open_video_reader(path)
+
+
+@pytest.mark.parametrize('backend', ['opencv', 'pyav', 'ffmpeg'])
+def test_unknown_frame_rate_is_encoded_at_the_default_rate(tmp_path, backend):
+    if backend == 'pyav':
+        pytest.importorskip('av')
+    if backend == 'ffmpeg' and not media_io.ffmpeg_available():
+        pytest.skip('ffmpeg is not installed')
+    writer = open_video_writer(tmp_path / 'video.avi', 0.0, (32, 24), backend, 'mjpeg')
+    for frame in frames():
+        writer.write(frame)
+    writer.release()
+
+    with open_video_reader(tmp_path / 'video.avi') as reader:
+        assert reader.fps == media_io.DEFAULT_FPS
+        assert len(list(reader.frames())) == 5
+
+
+def test_unavailable_backend_falls_back_to_opencv(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_io, 'pyav_available', lambda: False)
+    monkeypatch.setattr(media_io, 'ffmpeg_available', lambda: False)
+
+    for backend in ['pyav', 'ffmpeg']:
+        writer = open_video_writer(tmp_path / f'{backend}.avi', 10.0, (32, 24), backend, 'mjpeg')
+        writer.release()
+        assert isinstance(writer, OpenCVVideoWriter)
+        assert isinstance(open_video_reader(tmp_path / f'{backend}.avi', backend), OpenCVVideoReader)
+
+
+def test_pyav_round_trip(tmp_path):
+    pytest.importorskip('av')
+    write_video(tmp_path / 'video.mp4', 'pyav', 'h264')
+
+    with open_video_reader(tmp_path / 'video.mp4', 'pyav', threads=2) as reader:
+        assert reader.info[:2] == (32, 24)
+        assert [position for _, position, _ in reader.frames()] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.skipif(not media_io.ffmpeg_available(), reason='ffmpeg is not installed')
+def test_ffmpeg_pipe_round_trip(tmp_path):
+    write_video(tmp_path / 'video.mp4', 'ffmpeg', 'h264')
+
+    with open_video_reader(tmp_path / 'video.mp4') as reader:
+        assert reader.info[:2] == (32, 24)
+        assert len(list(reader.frames())) == 5
+
+
+@pytest.mark.skipif(not media_io.ffmpeg_available(), reason='ffmpeg is not installed')
+def test_ffmpeg_pipe_error_is_reported(tmp_path):
+    writer = media_io.FFmpegPipeVideoWriter(tmp_path / 'video.mp4', 'unknown_encoder', 5.0, (32, 24))
+
+    with pytest.raises(IOError, match='exit code'):
+        writer.release()
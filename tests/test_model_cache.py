@@ -0,0 +1,90 @@
+import threading
+import pytest
+import torch
+
+from qtquickdetect.pipeline.model_cache import DEFAULT_MEMORY_BUDGET, ModelCache
+
+
+@pytest.fixture
+def cache():
+    """
+    Fixture giving an empty model cache and resetting the singleton afterwards.
+    """
+    ModelCache._instance = None
+    cache = ModelCache.get_instance()
+    yield cache
+    ModelCache._instance = None
+
+
+def test_get_loads_once(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return torch.nn.Linear(4, 4)
+
+    first = cache.get(('Pipeline', 'weight.pt', 'cpu'), loader)
+    second = cache.get(('Pipeline', 'weight.pt', 'cpu'), loader)
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_least_recently_used_model_is_evicted(cache):
+    # A 256x1024 float32 linear layer is a bit more than 1 MB, the budget fits two of them
+    cache.set_memory_budget(3)
+    cache.get('a', lambda: torch.nn.Linear(1024, 256))
+    cache.get('b', lambda: torch.nn.Linear(1024, 256))
+    cache.get('a', lambda: torch.nn.Linear(1024, 256))
+    cache.get('c', lambda: torch.nn.Linear(1024, 256))
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+
+def test_evict_weight(cache):
+    cache.get(('Pipeline', 'builder', 'weight.pt', 'cpu'), lambda: torch.nn.Linear(4, 4))
+    cache.get(('Pipeline', 'builder', 'other.pt', 'cpu'), lambda: torch.nn.Linear(4, 4))
+
+    cache.evict_weight('weight.pt')
+
+    assert len(cache) == 1
+    assert ('Pipeline', 'builder', 'other.pt', 'cpu') in cache
+
+
+def test_concurrent_misses_load_the_model_once(cache):
+    loading = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        loading.set()
+        assert release.wait(timeout=5.0)
+        return torch.nn.Linear(4, 4)
+
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(cache.get('a', loader))) for _ in range(2)]
+    threads[0].start()
+    assert loading.wait(timeout=5.0)
+    threads[1].start()
+
+    # The cache is not locked while a model loads
+    other = cache.get('b', lambda: torch.nn.Linear(4, 4))
+    assert 'b' in cache and other is cache.get('b', lambda: None)
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5.0)
+
+    assert len(calls) == 1
+    assert len(models) == 2 and models[0] is models[1]
+
+
+def test_memory_budget_is_set_by_the_caller(cache):
+    # The cache starts with the default budget, the pipeline manager and the batch runner set the configured one
+    assert cache.memory_budget == DEFAULT_MEMORY_BUDGET * 1024 * 1024
+
+    cache.set_memory_budget(512)
+    assert cache.memory_budget == 512 * 1024 * 1024
@@ -0,0 +1,143 @@
+import cv2 as cv
+import numpy as np
+import pytest
+
+from unittest.mock import MagicMock
+from qtquickdetect.utils.overlay_renderer import FONT, OverlayRenderer, Skeleton, COCO_SKELETON, HEAD, ARM
+
+
+@pytest.fixture
+def preset():
+    preset = MagicMock()
+    preset.box_color_per_class = False
+    preset.box_color = (0, 255, 0, 255)
+    preset.box_thickness = 2
+    preset.text_color = (255, 255, 255, 255)
+    preset.text_size = 0.5
+    preset.segment_color_per_class = False
+    preset.segment_color = (0, 255, 0, 255)
+    preset.segment_thickness = 2
+    preset.pose_head_color = (255, 0, 0, 255)
+    preset.pose_chest_color = (0, 255, 0, 255)
+    preset.pose_arm_color = (0, 0, 255, 255)
+    preset.pose_leg_color = (255, 255, 0, 255)
+    preset.pose_point_size = 3
+    preset.pose_line_thickness = 2
+    preset.pose_skeleton = {}
+    return preset
+
+
+@pytest.mark.parametrize('channels', [3, 4])
+def test_masks_match_full_frame_blend(preset, channels):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (120, 160, channels), dtype=np.uint8)
+    expected = img.copy()
+
+    # Some polygons lie partly, or entirely, outside of the image
+    polygons = [rng.uniform(-60, 220, (rng.integers(3, 9), 2)).astype(np.float32) for _ in range(30)]
+    OverlayRenderer(preset).draw_masks(img, polygons, np.zeros(len(polygons), dtype=int))
+
+    # Reference rendering, blending each mask over the whole image
+    color = preset.segment_color
+    for points in polygons:
+        polygon = np.array([points], dtype=np.int32)
+        mask = np.zeros((expected.shape[0], expected.shape[1]), dtype=np.uint8)
+        cv.fillPoly(mask, polygon, 255)
+        mask_colored = np.zeros(expected.shape, dtype=np.uint8)
+        mask_colored[:, :] = color[:channels]
+        expected_masked = cv.bitwise_and(mask_colored, mask_colored, mask=mask)
+        cv.addWeighted(expected, 1, expected_masked, 0.5, 0, expected)
+    cv.polylines(expected, [np.array(points, dtype=np.int32) for points in polygons], True, color, 2)
+
+    assert np.array_equal(img, expected)
+
+
+def test_boxes_match_per_box_drawing(preset):
+    img = np.zeros((200, 300, 3), dtype=np.uint8)
+    expected = img.copy()
+    boxes = np.array([[10, 40, 90, 120], [150, 60, 280, 190]])
+    classes = np.array([1, 2])
+    confidences = np.array([0.5, 0.75])
+    class_names = ['background', 'person', 'car']
+
+    OverlayRenderer(preset).draw_boxes(img, boxes, classes, confidences, class_names)
+
+    for (x1, y1, x2, y2), class_id, confidence in zip(boxes.tolist(), classes.tolist(), confidences.tolist()):
+        cv.rectangle(expected, (x1, y1), (x2, y2), preset.box_color, preset.box_thickness)
+        text = '{} : {:.2f}%'.format(class_names[class_id], confidence * 100)
+        (text_width, text_height), _ = cv.getTextSize(text, FONT, preset.text_size, 1)
+        top = max(0, y1 - text_height - 9)
+        cv.rectangle(expected, (x1, top - 2), (x1 + text_width + 2, top + text_height + 7), preset.box_color,
+                     cv.FILLED)
+        cv.putText(expected, text, (x1, top + text_height), FONT, preset.text_size, preset.text_color, 1)
+
+    assert np.array_equal(img, expected)
+
+
+def test_poses_match_per_edge_drawing(preset):
+    rng = np.random.default_rng(0)
+    keypoints = rng.integers(1, 200, (1, 17, 2))
+    keypoints[0, 3] = (0, 0)  # Missing keypoint, with its edges
+    img = np.zeros((200, 200, 3), dtype=np.uint8)
+    expected = img.copy()
+
+    renderer = OverlayRenderer(preset)
+    renderer.draw_poses(img, keypoints)
+
+    colors = [preset.pose_head_color, preset.pose_chest_color, preset.pose_arm_color, preset.pose_leg_color]
+    for index, point in enumerate(keypoints[0].tolist()):
+        if index != 3:
+            cv.circle(expected, point, preset.pose_point_size, colors[COCO_SKELETON.keypoint_parts[index]], cv.FILLED)
+    # The edges are drawn body part by body part
+    for (start, end), part in sorted(zip(COCO_SKELETON.edges.tolist(), COCO_SKELETON.edge_parts.tolist()), key=lambda edge: edge[1]):
+        if 3 not in (start, end):
+            cv.line(expected, keypoints[0, start].tolist(), keypoints[0, end].tolist(), colors[part],
+                    preset.pose_line_thickness)
+
+    assert np.array_equal(img, expected)
+
+
+def test_custom_and_unknown_skeletons(preset):
+    keypoints = np.array([[(10, 10), (50, 10), (50, 50)]])
+
+    # Custom skeleton
+    img = np.zeros((60, 60, 3), dtype=np.uint8)
+    skeleton = Skeleton([(0, 1), (1, 2)], [HEAD, ARM, ARM], [HEAD, ARM])
+    OverlayRenderer(preset).draw_poses(img, keypoints, skeleton)
+    assert tuple(img[10, 30]) == preset.pose_head_color[:3]
+    assert tuple(img[30, 50]) == preset.pose_arm_color[:3]
+
+    # Unknown topology, only the keypoints are drawn
+    img = np.zeros((60, 60, 3), dtype=np.uint8)
+    OverlayRenderer(preset).draw_poses(img, keypoints)
+    assert tuple(img[10, 10]) == preset.pose_chest_color[:3]
+    assert not img[10, 30].any()
+
+    with pytest.raises(ValueError):
+        Skeleton([(0, 3)], [HEAD, HEAD], [HEAD])
+
+
+def test_preset_skeleton(preset):
+    keypoints = np.array([[(10, 10), (50, 10), (50, 50)]])
+    preset.pose_skeleton = {'edges': [[0, 1], [1, 2]], 'keypoint_parts': ['head', 'arm', 'arm'],
+                            'edge_parts': ['head', 'arm']}
+
+    img = np.zeros((60, 60, 3), dtype=np.uint8)
+    OverlayRenderer(preset).draw_poses(img, keypoints)
+    assert tuple(img[10, 30]) == preset.pose_head_color[:3]
+    assert tuple(img[30, 50]) == preset.pose_arm_color[:3]
+
+    with pytest.raises(ValueError):
+        Skeleton.from_dict({'edges': [[0, 1]], 'keypoint_parts': ['head', 'tail'], 'edge_parts': ['head']})
+
+
+def test_empty_results_draw_nothing(preset):
+    img = np.zeros((50, 50, 4), dtype=np.uint8)
+    renderer = OverlayRenderer(preset)
+
+    renderer.render(img, boxes=np.zeros((0, 4), dtype=int), classes=np.zeros(0, dtype=int),
+                    confidences=np.zeros(0), class_names=[])
+    renderer.render(img, classes=np.zeros(0, dtype=int), polygons=[])
+    renderer.render(img, keypoints=np.zeros((0, 17, 2), dtype=int))
+
+    assert not img.any()
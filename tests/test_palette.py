@@ -0,0 +1,51 @@
+import random
+import numpy as np
+
+from qtquickdetect.utils.palette import Palette, generate_color, get_palette
+
+
+def reseeded_color(class_id):
+    # Colors generated by reseeding the global random generator
+    random.seed(class_id)
+    channels = [0, 0, 0]
+    max_channel = random.randint(0, 2)
+    channels[max_channel] = 255
+    for i in range(3):
+        if i != max_channel:
+            channels[i] = random.randint(50, 200)
+    return (*channels, 255)
+
+
+def test_generated_colors_are_stable_and_keep_global_random_state():
+    random.seed(42)
+    state = random.getstate()
+
+    colors = [generate_color(class_id) for class_id in range(100)]
+
+    assert random.getstate() == state
+    assert colors == [reseeded_color(class_id) for class_id in range(100)]
+
+
+def test_palette_lookup_table():
+    palette = Palette()
+
+    assert palette.color(3) == generate_color(3)
+    assert np.array_equal(palette.colors(np.array([1, 2, 1])),
+                          np.array([generate_color(1), generate_color(2), generate_color(1)]))
+
+    # Class ids beyond the table extend it
+    assert palette.color(1000) == generate_color(1000)
+    assert len(palette.table) > 1000
+
+
+def test_user_palette_repeats_over_classes():
+    palette = Palette(((255, 0, 0, 255), (0, 0, 255, 255)))
+
+    assert palette.color(0) == (255, 0, 0, 255)
+    assert palette.color(1) == (0, 0, 255, 255)
+    assert palette.color(4) == (255, 0, 0, 255)
+
+
+def test_palettes_are_shared():
+    assert get_palette(()) is get_palette(())
+    assert get_palette(((1, 2, 3, 255),)) is not get_palette(())
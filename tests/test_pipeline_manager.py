@@ -0,0 +1,293 @@
+import threading
+import time
+import numpy as np
+import cv2 as cv
+import pytest
+
+from qtquickdetect.models.app_state import AppState
+from qtquickdetect.models.preset import Preset
+from qtquickdetect.pipeline.pipeline import Pipeline
+from qtquickdetect.pipeline.pipeline_manager import PipelineManager
+from qtquickdetect.pipeline.result_store import ResultReader
+from qtquickdetect.utils.media_fetcher import MediaFetcher
+
+
+class FakePipeline(Pipeline):
+    """
+    Pipeline returning the input images unchanged, recording how many pipelines run at the same time.
+    """
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
+        # Draw on the input image, like the real pipelines
+        for image in images:
+            image[0, 0] += 1
+        with FakePipeline.lock:
+            FakePipeline.running += 1
+            FakePipeline.max_running = max(FakePipeline.max_running, FakePipeline.running)
+        time.sleep(0.05)
+        with FakePipeline.lock:
+            FakePipeline.running -= 1
+        return [(image, []) for image in images]
+
+    def _make_results(self, results_array: list) -> dict:
+        return {'weight': self.weight, 'results': results_array}
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """
+    Fixture registering a fake model using the FakePipeline.
+    """
+    monkeypatch.setattr(AppState, '_instance', None)
+    app_config = AppState.get_instance().app_config
+    monkeypatch.setitem(app_config.pipelines, 'fake', f'{__name__}.FakePipeline')
+    monkeypatch.setitem(app_config.models, 'fake', {'task': 'detect', 'pipeline': 'fake'})
+    FakePipeline.running = 0
+    FakePipeline.max_running = 0
+    return {'fake': {'builder': ['a.pt', 'b.pt', 'c.pt']}}
+
+
+@pytest.fixture
+def images_paths(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'image_{i}.png'
+        cv.imwrite(str(path), np.zeros((8, 8, 3), dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize('max_concurrent', [1, 2])
+def test_run_image_limits_concurrency(qtbot, tmp_path, fake_models, images_paths, max_concurrent):
+    preset = Preset('test')
+    preset.max_concurrent_pipelines = max_concurrent
+    manager = PipelineManager('detect', preset, fake_models)
+    finished_files = []
+    manager.finished_file_signal.connect(lambda source, *_: finished_files.append(source))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        manager.run_image(images_paths, tmp_path / 'results')
+
+    assert len(finished_files) == 9
+    assert FakePipeline.max_running <= max_concurrent
+    assert manager.running_pipelines == []
+    for weight in ['a.pt', 'b.pt', 'c.pt']:
+        assert (tmp_path / 'results' / f'builder.{weight}').is_dir()
+
+
+def test_run_image_with_shared_decoding(qtbot, tmp_path, fake_models, images_paths):
+    preset = Preset('test')
+    preset.shared_decoding = True
+    manager = PipelineManager('detect', preset, fake_models)
+    finished_files = []
+    manager.finished_file_signal.connect(lambda source, output, _: finished_files.append(output))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        manager.run_image(images_paths, tmp_path / 'results')
+
+    # All the weights run at the same time, each one draws on its own copy of the shared images
+    assert len(finished_files) == 9
+    assert FakePipeline.max_running == 3
+    for output in finished_files:
+        assert cv.imread(str(output))[0, 0, 0] == 1
+
+
+@pytest.fixture
+def videos_paths(tmp_path):
+    paths = []
+    for i in range(2):
+        video_path = tmp_path / f'video_{i}.avi'
+        out = cv.VideoWriter(str(video_path), cv.VideoWriter_fourcc(*'MJPG'), 5.0, (16, 16))
+        for _ in range(4):
+            out.write(np.zeros((16, 16, 3), dtype=np.uint8))
+        out.release()
+        paths.append(video_path)
+    return paths
+
+
+def test_run_video_with_shared_decoding(qtbot, tmp_path, fake_models, videos_paths):
+    preset = Preset('test')
+    preset.shared_decoding = True
+    manager = PipelineManager('detect', preset, fake_models)
+    finished_jsons = []
+    manager.finished_file_signal.connect(lambda source, output, json_path: finished_jsons.append(json_path))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        manager.run_video(videos_paths, tmp_path / 'results')
+
+    assert len(finished_jsons) == 6
+    for json_path in finished_jsons:
+        assert len(ResultReader(json_path)) == 4
+
+
+def test_unreadable_video_only_fails_itself_with_shared_decoding(qtbot, tmp_path, fake_models, videos_paths):
+    unreadable_path = tmp_path / 'unreadable.avi'
+    unreadable_path.write_bytes(b'not a video')
+    preset = Preset('test')
+    preset.shared_decoding = True
+    manager = PipelineManager('detect', preset, fake_models)
+    finished_files, failed_files = [], []
+    manager.finished_file_signal.connect(lambda source, output, json_path: finished_files.append(source))
+    manager.error_signal.connect(lambda source, e: failed_files.append(source))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        manager.run_video([videos_paths[0], unreadable_path, videos_paths[1]], tmp_path / 'results')
+
+    # Each weight fails on the unreadable video only, the next video is still decoded for all of them
+    assert failed_files == [unreadable_path] * 3
+    assert sorted(finished_files) == sorted(videos_paths * 3)
+
+
+def test_run_image_with_worker_processes(qtbot, tmp_path, fake_models, images_paths):
+    preset = Preset('test')
+    preset.worker_processes = 2
+    manager = PipelineManager('detect', preset, {'fake': {'builder': ['a.pt']}})
+    finished_files = []
+    manager.finished_file_signal.connect(lambda source, *_: finished_files.append(source))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=60000):
+        manager.run_image(images_paths, tmp_path / 'results')
+
+    # The images are shared between the worker processes, their results stream back to the manager
+    assert sorted(finished_files) == sorted(images_paths)
+    assert len(list((tmp_path / 'results' / 'builder.a.pt').glob('*.json'))) == 3
+
+
+@pytest.mark.parametrize('shared_decoding', [False, True])
+def test_run_video_with_frame_stride(qtbot, tmp_path, fake_models, videos_paths, shared_decoding):
+    preset = Preset('test')
+    preset.shared_decoding = shared_decoding
+    preset.frame_stride = 2
+    preset.start_time = 0.2
+    manager = PipelineManager('detect', preset, {'fake': {'builder': ['a.pt']}})
+    finished_files = []
+    manager.finished_file_signal.connect(lambda source, output, json_path: finished_files.append((output, json_path)))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        manager.run_video(videos_paths, tmp_path / 'results')
+
+    # Only the sampled frames are inferred, the output video holds every frame from the start time
+    assert len(finished_files) == 2
+    for output, json_path in finished_files:
+        assert ResultReader(json_path).frame_indices == [1, 3]
+        assert cv.VideoCapture(str(output)).get(cv.CAP_PROP_FRAME_COUNT) == 3
+
+
+@pytest.mark.parametrize('media', ['image', 'video'])
+def test_run_results_only(qtbot, tmp_path, fake_models, images_paths, videos_paths, media):
+    preset = Preset('test')
+    preset.results_only = True
+    manager = PipelineManager('detect', preset, {'fake': {'builder': ['a.pt']}})
+    finished_files = []
+    manager.finished_file_signal.connect(lambda source, output, json_path: finished_files.append((output, json_path)))
+
+    with qtbot.waitSignal(manager.finished_all_signal, timeout=10000):
+        if media == 'image':
+            manager.run_image(images_paths, tmp_path / 'results')
+        else:
+            manager.run_video(videos_paths, tmp_path / 'results')
+
+    # Only the JSON files are written, the output files are reported as absent
+    inputs = images_paths if media == 'image' else videos_paths
+    assert len(finished_files) == len(inputs)
+    assert all(output is None and json_path.exists() for output, json_path in finished_files)
+    suffix = '.json' if media == 'image' else '.jsonl'
+    assert all(path.suffix == suffix for path in (tmp_path / 'results' / 'builder.a.pt').iterdir())
+
+
+class CancellingPipeline(FakePipeline):
+    """
+    Pipeline requesting its cancellation while the second frame is processed.
+    """
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
+        self.processed = getattr(self, 'processed', 0) + 1
+        if self.processed == 2:
+            self.request_cancel()
+        return super()._process_images(images)
+
+
+def test_cancelled_video_keeps_processed_frames(tmp_path, videos_paths):
+    pipeline = CancellingPipeline('fake', 'builder', 'a.pt', Preset('test'), None, videos_paths, None,
+                                  tmp_path / 'results')
+    finished_jsons = []
+    pipeline.finished_file_signal.connect(lambda source, output, json_path: finished_jsons.append(json_path))
+
+    pipeline.run()
+
+    # The results of the processed frames are saved, with their index
+    assert len(finished_jsons) == 1
+    reader = ResultReader(finished_jsons[0])
+    assert len(reader) == 2
+    assert reader.frame(1) == []
+
+
+class FailingPipeline(FakePipeline):
+    """
+    Pipeline failing while the second frame is processed.
+    """
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
+        self.processed = getattr(self, 'processed', 0) + 1
+        if self.processed == 2:
+            raise ValueError('inference error')
+        return super()._process_images(images)
+
+
+def test_failed_video_releases_its_output(tmp_path, videos_paths, monkeypatch):
+    open_video_writer = Pipeline._open_video_writer
+    released = []
+
+    def open_recording_writer(pipeline, *args):
+        writer = open_video_writer(pipeline, *args)
+        release = writer.release
+        writer.release = lambda: released.append(release())
+        return writer
+    monkeypatch.setattr(Pipeline, '_open_video_writer', open_recording_writer)
+    preset = Preset('test')
+    pipeline = FailingPipeline('fake', 'builder', 'a.pt', preset, None, videos_paths[:1], None, tmp_path / 'results')
+    errors = []
+    pipeline.error_signal.connect(lambda source, e: errors.append(e))
+
+    pipeline.run()
+
+    # The output video is closed, with the frame processed before the error
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert len(released) == 1
+    [output] = (tmp_path / 'results' / 'builder.a.pt').glob(f'*.{preset.video_format}')
+    assert cv.VideoCapture(str(output)).get(cv.CAP_PROP_FRAME_COUNT) == 1
+
+
+def test_stream_is_processed_from_a_stream_without_fps(tmp_path, videos_paths, monkeypatch):
+    # Like webcams and RTSP streams not reporting their frame rate
+    fetcher_init = MediaFetcher.__init__
+
+    def init_without_fps(fetcher, url_or_device):
+        fetcher_init(fetcher, url_or_device)
+        fetcher.fps = 0.0
+    monkeypatch.setattr(MediaFetcher, '__init__', init_without_fps)
+    pipeline = FakePipeline('fake', 'builder', 'a.pt', Preset('test'), None, None, str(videos_paths[0]), None)
+    frames = []
+
+    def receive_frame(frame, frame_time):
+        frames.append(frame)
+        pipeline.request_cancel()
+    pipeline.finished_stream_frame_signal.connect(receive_frame)
+
+    pipeline.run()
+
+    # The stream FPS is unknown, the rate is bounded by the max FPS and the inference latency
+    assert len(frames) == 1
+    assert 0 < pipeline.stream_fps <= 30.0
+
+
+def test_stream_stops_when_the_stream_ends(qtbot, videos_paths):
+    pipeline = FakePipeline('fake', 'builder', 'a.pt', Preset('test'), None, None, str(videos_paths[0]), None)
+    errors = []
+    pipeline.fatal_error_signal.connect(lambda message, e: errors.append(e))
+
+    # The pipeline thread finishes by itself once the frames of the video stream are processed
+    pipeline.start()
+    assert pipeline.wait(10000)
+    assert errors == []
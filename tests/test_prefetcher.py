@@ -0,0 +1,36 @@
+import pytest
+
+from qtquickdetect.utils.prefetcher import Prefetcher
+
+
+def test_items_are_yielded_in_order():
+    with Prefetcher(iter(range(100)), 4, lambda: False) as prefetcher:
+        assert list(prefetcher) == list(range(100))
+
+def test_source_exception_is_raised_in_consumer():
+    def source():
+        yield 1
+        raise ValueError('decode error')
+
+    with Prefetcher(source(), 4, lambda: False) as prefetcher:
+        iterator = iter(prefetcher)
+        assert next(iterator) == 1
+        with pytest.raises(ValueError):
+            next(iterator)
+
+def test_cancel_stops_the_reader():
+    cancelled = False
+    read = []
+
+    def source():
+        for i in range(1000):
+            read.append(i)
+            yield i
+
+    with Prefetcher(source(), 2, lambda: cancelled) as prefetcher:
+        for item in prefetcher:
+            if item == 5:
+                cancelled = True
+
+    # The reader is bounded by the queue depth and stops once cancelled
+    assert len(read) < 1000
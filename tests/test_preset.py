@@ -138,3 +138,111 @@ def test_invalid_video_format_reverts_to_default(mock_filepaths, preset_name, mo
     preset = Preset(preset_name)
 
     assert preset.video_format == "mp4"  # Should revert to default
+
+def test_invalid_batch_size_reverts_to_default(mock_filepaths, preset_name, monkeypatch):
+    monkeypatch.setattr(filepaths, 'get_base_data_dir', mock_filepaths.get_base_data_dir)
+
+    invalid_preset = {
+        "batch_size": 0
+    }
+    preset_path = mock_filepaths.get_base_data_dir() / 'presets' / preset_name
+    preset_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preset_path, 'w') as f:
+        json.dump(invalid_preset, f)
+
+    preset = Preset(preset_name)
+
+    assert preset.batch_size == 1  # Should revert to default
+
+def test_invalid_video_settings_revert_to_default(mock_filepaths, preset_name, monkeypatch):
+    monkeypatch.setattr(filepaths, 'get_base_data_dir', mock_filepaths.get_base_data_dir)
+
+    invalid_preset = {
+        "video_backend": "gstreamer",
+        "video_codec": "vp9",
+        "video_hw_acceleration": "yes",
+        "video_threads": -1,
+        "frame_stride": 0,
+        "target_fps": -5.0,
+        "start_time": 10.0,
+        "end_time": 5.0,
+        "stream_max_fps": 0.0,
+        "stream_target_latency": -1.0,
+        "stream_display_policy": "fastest",
+        "stream_display_delay": -0.1
+    }
+    preset_path = mock_filepaths.get_base_data_dir() / 'presets' / preset_name
+    preset_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preset_path, 'w') as f:
+        json.dump(invalid_preset, f)
+
+    preset = Preset(preset_name)
+
+    assert preset.video_backend == 'opencv'  # Should revert to default
+    assert preset.video_codec == 'mpeg4'  # Should revert to default
+    assert preset.video_hw_acceleration is False  # Should revert to default
+    assert preset.video_threads == 0  # Should revert to default
+    assert preset.frame_stride == 1  # Should revert to default
+    assert preset.target_fps == 0.0  # Should revert to default
+    assert preset.start_time == 10.0
+    assert preset.end_time == 0.0  # Should revert to default, it is before the start time
+    assert preset.stream_max_fps == 30.0  # Should revert to default
+    assert preset.stream_target_latency == 0.5  # Should revert to default
+    assert preset.stream_display_policy == 'latest'  # Should revert to default
+    assert preset.stream_display_delay == 0.2  # Should revert to default
+
+def test_invalid_detection_limits_revert_to_default(mock_filepaths, preset_name, monkeypatch):
+    monkeypatch.setattr(filepaths, 'get_base_data_dir', mock_filepaths.get_base_data_dir)
+
+    invalid_preset = {
+        "confidence_threshold": 1.5,
+        "max_detections": 0,
+        "result_format": "csv",
+        "mask_encoding": "png",
+        "mask_tolerance": -1.0
+    }
+    preset_path = mock_filepaths.get_base_data_dir() / 'presets' / preset_name
+    preset_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preset_path, 'w') as f:
+        json.dump(invalid_preset, f)
+
+    preset = Preset(preset_name)
+
+    assert preset.confidence_threshold == 0.25  # Should revert to default
+    assert preset.max_detections == 100  # Should revert to default
+    assert preset.result_format == 'json'  # Should revert to default
+    assert preset.mask_encoding == 'float'  # Should revert to default
+    assert preset.mask_tolerance == 0.0  # Should revert to default
+
+def test_invalid_palette_reverts_to_default(mock_filepaths, preset_name, monkeypatch):
+    monkeypatch.setattr(filepaths, 'get_base_data_dir', mock_filepaths.get_base_data_dir)
+
+    invalid_preset = {
+        "palette": [[255, 0, 0, 255], [300, 0, 0]]
+    }
+    preset_path = mock_filepaths.get_base_data_dir() / 'presets' / preset_name
+    preset_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preset_path, 'w') as f:
+        json.dump(invalid_preset, f)
+
+    preset = Preset(preset_name)
+
+    assert preset.palette == []  # Should revert to default
+
+def test_pose_skeleton_is_read_and_invalid_one_reverts_to_default(mock_filepaths, preset_name, monkeypatch):
+    monkeypatch.setattr(filepaths, 'get_base_data_dir', mock_filepaths.get_base_data_dir)
+
+    skeleton = {"edges": [[0, 1]], "keypoint_parts": ["head", "arm"], "edge_parts": ["arm"]}
+    preset_path = mock_filepaths.get_base_data_dir() / 'presets' / preset_name
+    preset_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preset_path, 'w') as f:
+        json.dump({"pose_skeleton": skeleton}, f)
+
+    assert Preset(preset_name).pose_skeleton == skeleton
+
+    for invalid_skeleton in [[[0, 1]], {"edges": [[0, 1]], "keypoint_parts": ["head", "tail"], "edge_parts": ["arm"]},
+                             {"edges": [[0, 2]], "keypoint_parts": ["head", "arm"], "edge_parts": ["arm"]}]:
+        with open(preset_path, 'w') as f:
+            json.dump({"pose_skeleton": invalid_skeleton}, f)
+
+        assert Preset(preset_name).pose_skeleton == {}  # Should revert to default
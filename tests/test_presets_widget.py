@@ -62,4 +62,42 @@ def test_set_video_format(presets_widget, qtbot):
     initial_format = presets_widget._video_format_combo.currentText()
     new_format = "avi" if initial_format == "mp4" else "mp4"
     presets_widget._video_format_combo.setCurrentText(new_format)
-    assert presets_widget.current_preset.video_format == new_format
\ No newline at end of file
+    assert presets_widget.current_preset.video_format == new_format
+def test_set_batch_size(presets_widget, qtbot):
+    qtbot.mouseClick(presets_widget._add_preset_button, Qt.MouseButton.LeftButton)
+    new_preset_item = presets_widget._preset_list.item(0)
+    presets_widget._preset_list.setCurrentItem(new_preset_item)
+    new_batch_size = presets_widget._batch_size_slider.value() % 64 + 1
+    presets_widget._batch_size_slider.setValue(new_batch_size)
+    assert presets_widget.current_preset.batch_size == new_batch_size
+
+def test_clear_palette(presets_widget, qtbot):
+    qtbot.mouseClick(presets_widget._add_preset_button, Qt.MouseButton.LeftButton)
+    new_preset_item = presets_widget._preset_list.item(0)
+    presets_widget._preset_list.setCurrentItem(new_preset_item)
+
+    presets_widget.current_preset.palette = [(255, 0, 0, 255)]
+    qtbot.mouseClick(presets_widget._palette_clear_button, Qt.MouseButton.LeftButton)
+    assert presets_widget.current_preset.palette == []
+    assert presets_widget._palette_label.text() == 'Generated colors'
+
+def test_video_time_window_is_never_empty(presets_widget, qtbot):
+    qtbot.mouseClick(presets_widget._add_preset_button, Qt.MouseButton.LeftButton)
+    new_preset_item = presets_widget._preset_list.item(0)
+    presets_widget._preset_list.setCurrentItem(new_preset_item)
+    presets_widget._start_time_spinbox.setValue(0.0)
+
+    presets_widget._end_time_spinbox.setValue(10.0)
+    presets_widget._start_time_spinbox.setValue(4.0)
+    assert (presets_widget.current_preset.start_time, presets_widget.current_preset.end_time) == (4.0, 10.0)
+
+    # The end time can not be set before the start time, its minimum stands for the end of the video
+    presets_widget._end_time_spinbox.setValue(2.0)
+    assert presets_widget._end_time_spinbox.value() == 4.0
+    assert presets_widget.current_preset.end_time == 0.0
+
+    # A start time after the end time processes the videos up to their end
+    presets_widget._end_time_spinbox.setValue(10.0)
+    presets_widget._start_time_spinbox.setValue(12.0)
+    assert (presets_widget.current_preset.start_time, presets_widget.current_preset.end_time) == (12.0, 0.0)
+    assert presets_widget._end_time_spinbox.value() == 12.0
@@ -0,0 +1,138 @@
+import json
+import numpy as np
+import torch
+
+from qtquickdetect.pipeline.detections import Detections
+from qtquickdetect.pipeline.result_store import NpzResultWriter, ResultReader, export_json, find_result_file, \
+    open_result_writer, save_npz
+
+INFO = {'model_builder': 'yolov8n', 'weight': 'yolov8n', 'task': 'detect', 'classes': ['person', 'car']}
+
+
+def detection(x1, classid, confidence):
+    return {'x1': x1, 'y1': 2, 'x2': x1 + 10, 'y2': 20, 'classid': classid, 'confidence': confidence}
+
+
+def test_detection_video_round_trip(tmp_path):
+    results = {**INFO, 'results': [[detection(1, 0, 0.9), detection(5, 1, 0.25)], [], [detection(3, 1, 0.5)]]}
+    save_npz(tmp_path / 'video.npz', results, per_frame=True)
+
+    reader = ResultReader(tmp_path / 'video.npz')
+
+    assert reader.info == INFO
+    assert reader.per_frame
+    assert len(reader) == 3
+    assert reader.frame(1) == []
+    assert reader.frame(2) == [detection(3, 1, 0.5)]
+    assert reader.frame_indices == [0, 1, 2]
+    assert json.dumps(reader.to_dict()) == json.dumps({**INFO, 'frame_indices': [0, 1, 2], **results})
+
+
+def test_segmentation_and_pose_round_trip(tmp_path):
+    segment = [{'x1': 1, 'y1': 2, 'x2': 11, 'y2': 20, 'mask': [[1.5, 2.0], [3.0, 4.0], [5.0, 6.5]], 'classid': 0,
+                'confidence': 0.9},
+               {'x1': 2, 'y1': 2, 'x2': 12, 'y2': 20, 'mask': [[7.0, 8.0], [9.0, 10.0], [11.0, 12.0], [13.0, 14.0]],
+                'classid': 1, 'confidence': 0.5}]
+    pose = [{'xy': [[1, 2], [3, 4]], 'confidence': 0.9}, {'xy': [[5, 6], [7, 8]], 'confidence': 0.5}]
+
+    for name, frame in [('segment', segment), ('pose', pose)]:
+        results = {**INFO, 'results': frame}
+        save_npz(tmp_path / f'{name}.npz', results, per_frame=False)
+
+        reader = ResultReader(tmp_path / f'{name}.npz')
+
+        assert not reader.per_frame
+        assert len(reader) == 1
+        assert json.dumps(reader.to_dict()) == json.dumps(results)
+
+
+def test_encoded_masks_round_trip(tmp_path):
+    segment = [{'x1': 1, 'y1': 2, 'x2': 11, 'y2': 20, 'mask': [[1, 2], [3, 4], [5, 6]], 'classid': 0,
+                'confidence': 0.9}]
+    rle = [{'x1': 1, 'y1': 2, 'x2': 11, 'y2': 20, 'mask': {'size': [4, 5], 'counts': [3, 2, 15]}, 'classid': 0,
+            'confidence': 0.9}]
+
+    for name, frame in [('int', segment), ('rle', rle)]:
+        results = {**INFO, 'results': frame}
+        save_npz(tmp_path / f'{name}.npz', results, per_frame=False)
+
+        assert json.dumps(ResultReader(tmp_path / f'{name}.npz').to_dict()) == json.dumps(results)
+
+
+def test_classification_round_trip(tmp_path):
+    results = {**INFO, 'results': [{'classid': 1, 'confidence': 0.75}, {'classid': 0, 'confidence': 0.25}]}
+    save_npz(tmp_path / 'image.npz', results, per_frame=False)
+
+    assert ResultReader(tmp_path / 'image.npz').to_dict() == results
+
+
+def test_detections_are_saved_without_dictionaries(tmp_path):
+    detections = Detections.from_tensors(torch.tensor([[1.7, 2.2, 3.9, 4.1]]), torch.tensor([7.0]),
+                                         torch.tensor([0.75]))
+    save_npz(tmp_path / 'image.npz', {**INFO, 'results': detections}, per_frame=False)
+
+    with np.load(tmp_path / 'image.npz') as archive:
+        assert archive['boxes_0'].dtype == np.int32
+    assert ResultReader(tmp_path / 'image.npz').frame(0) == detections.to_dicts()
+
+
+def test_json_results_are_read_and_exported(tmp_path):
+    results = {**INFO, 'results': [detection(1, 0, 0.9)]}
+    with open(tmp_path / 'image.json', 'w') as f:
+        json.dump(results, f)
+    save_npz(tmp_path / 'other.npz', results, per_frame=False)
+
+    reader = ResultReader(tmp_path / 'image.json')
+    assert reader.info == INFO
+    assert reader.frame(0) == results['results']
+
+    export_json(tmp_path / 'other.npz', tmp_path / 'exported.json')
+    with open(tmp_path / 'exported.json', 'r') as f:
+        assert json.load(f) == results
+
+
+def test_find_result_file(tmp_path):
+    (tmp_path / 'image.npz').touch()
+    (tmp_path / 'image.png').touch()
+
+    assert find_result_file(tmp_path, 'image') == tmp_path / 'image.npz'
+    assert find_result_file(tmp_path, 'missing') is None
+
+
+def test_video_results_are_written_frame_by_frame(tmp_path):
+    frames = [[detection(index, index % 2, 0.5)] for index in range(5)] + [[]]
+    frame_indices = [10, 13, 16, 19, 22, 25]
+    with open_result_writer(tmp_path / 'video.jsonl', INFO) as writer:
+        for frame, index in zip(frames, frame_indices):
+            writer.write_frame(frame, index)
+    with NpzResultWriter(tmp_path / 'video.npz', INFO, per_frame=True, chunk_size=4) as writer:
+        for frame, index in zip(frames, frame_indices):
+            writer.write_frame(frame, index)
+
+    for name in ['video.jsonl', 'video.npz']:
+        reader = ResultReader(tmp_path / name)
+        assert len(reader) == 6
+        assert reader.frame(3) == frames[3]
+        assert reader.frame_indices == frame_indices
+        assert reader.to_dict() == {**INFO, 'frame_indices': frame_indices, 'results': frames}
+
+    save_npz(tmp_path / 'saved.npz', ResultReader(tmp_path / 'video.jsonl').to_dict(), per_frame=True)
+    assert ResultReader(tmp_path / 'saved.npz').frame_indices == frame_indices
+
+
+def test_interrupted_json_lines_are_read_without_index(tmp_path):
+    writer = open_result_writer(tmp_path / 'video.jsonl', INFO)
+    writer.write_frame([detection(1, 0, 0.9)], 0)
+    writer.write_frame(Detections.from_tensors(torch.tensor([[1.0, 2.0, 3.0, 4.0]]), torch.tensor([1.0]),
+                                               torch.tensor([0.5])), 5)
+    # Simulate a crash while the third frame is written
+    with open(tmp_path / 'video.jsonl', 'ab') as f:
+        f.write(b'{"frame": 10, "results": [{"x1": 1')
+
+    reader = ResultReader(tmp_path / 'video.jsonl')
+
+    assert reader.info == INFO
+    assert len(reader) == 2
+    assert reader.frame_indices == [0, 5]
+    assert reader.frame(1) == [{'x1': 1, 'y1': 2, 'x2': 3, 'y2': 4, 'classid': 1, 'confidence': 0.5}]
+    writer.close()
@@ -0,0 +1,92 @@
+import queue
+import threading
+import pytest
+
+from qtquickdetect.utils.stage_worker import STAGE_END, DropOldestQueue, StageWorker
+
+
+def items_source(items):
+    """
+    Returns a stage source yielding the given items, then the end marker.
+    """
+    iterator = iter([*items, STAGE_END])
+    return lambda timeout: next(iterator)
+
+def drain(output, timeout=5.0):
+    """
+    Returns the items of a stage output until the end marker.
+    """
+    items = []
+    while (item := output.get(timeout)) is not STAGE_END:
+        items.append(item)
+    return items
+
+def test_full_queue_drops_the_oldest_item():
+    items = DropOldestQueue(2)
+    for item in range(5):
+        items.put(item)
+
+    assert items.dropped == 3
+    assert len(items) == 2
+    assert [items.get(timeout=0.1), items.get(timeout=0.1)] == [3, 4]
+    with pytest.raises(queue.Empty):
+        items.get(timeout=0.01)
+
+def test_closed_queue_returns_its_items_then_the_end_marker():
+    items = DropOldestQueue(2)
+    items.put(0)
+    items.close()
+
+    assert items.get(timeout=0.1) == 0
+    assert items.get(timeout=0.1) is STAGE_END
+
+def test_items_are_processed_in_order_on_the_stage_thread():
+    output = DropOldestQueue(8)
+
+    def process(item):
+        return item * 10, threading.current_thread().name
+
+    with StageWorker(process, items_source(range(3)), output, 'stage'):
+        assert drain(output) == [(0, 'stage'), (10, 'stage'), (20, 'stage')]
+
+def test_dropped_items_are_not_passed_on():
+    output = DropOldestQueue(8)
+
+    with StageWorker(lambda item: item if item % 2 == 0 else None, items_source(range(5)), output, 'stage'):
+        assert drain(output) == [0, 2, 4]
+
+def test_slow_stage_gets_the_newest_items():
+    # The first stage waits on the second one, which only keeps the newest of the items put meanwhile
+    started = threading.Event()
+    release = threading.Event()
+    middle = DropOldestQueue(1)
+    output = DropOldestQueue(8)
+
+    def process(item):
+        started.set()
+        assert release.wait(timeout=5.0)
+        return item
+
+    with StageWorker(process, middle.get, output, 'stage'):
+        middle.put(0)
+        assert started.wait(timeout=5.0)
+        for item in range(1, 4):
+            middle.put(item)
+        middle.close()
+        release.set()
+
+        assert drain(output) == [0, 3]
+    assert middle.dropped == 2
+
+def test_stage_error_is_kept():
+    output = DropOldestQueue(1)
+    failed = threading.Event()
+
+    def process(item):
+        failed.set()
+        raise ValueError('render error')
+
+    with StageWorker(process, items_source([0]), output, 'stage') as stage:
+        assert failed.wait(timeout=5.0)
+    assert isinstance(stage.error, ValueError)
+    assert len(output) == 0
@@ -0,0 +1,52 @@
+import pytest
+
+from qtquickdetect.utils import stream_scheduler
+from qtquickdetect.utils.stream_scheduler import StreamScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Fixture replacing the monotonic clock of the scheduler by a settable one.
+    """
+    now = [100.0]
+    monkeypatch.setattr(stream_scheduler.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_rate_is_bounded_by_max_fps_and_source_fps():
+    assert StreamScheduler(30.0, 0.5).fps == 30.0
+    assert StreamScheduler(30.0, 0.5, source_fps=10.0).fps == 10.0
+    # An unknown stream FPS does not limit the rate
+    assert StreamScheduler(30.0, 0.5, source_fps=0.0).fps == 30.0
+
+
+def test_rate_follows_the_inference_latency(clock):
+    scheduler = StreamScheduler(30.0, 0.5, smoothing=0.5)
+
+    clock[0] += 0.2
+    scheduler.record(clock[0] - 0.2)
+    assert scheduler.latency == pytest.approx(0.2)
+    assert scheduler.fps == pytest.approx(5.0)
+    # The next frame is scheduled one interval after the start of the last inference
+    assert scheduler.delay() == pytest.approx(0.0)
+
+    clock[0] += 0.1
+    scheduler.record(clock[0] - 0.1)
+    assert scheduler.latency == pytest.approx(0.15)
+    assert scheduler.delay() == pytest.approx(1.0 / scheduler.fps - 0.1)
+
+
+def test_old_frames_are_dropped(clock):
+    scheduler = StreamScheduler(10.0, 0.5)
+    scheduler.record(clock[0] - 0.3)
+
+    assert scheduler.accept(0.1)
+    assert not scheduler.accept(0.4)
+    assert scheduler.dropped_frames == 1
+
+    # A model slower than the target latency still processes the freshest frames
+    slow = StreamScheduler(10.0, 0.5)
+    slow.record(clock[0] - 2.0)
+    assert slow.accept(0.3)
+    assert not slow.accept(2.5)
@@ -0,0 +1,63 @@
+import numpy as np
+import cv2 as cv
+import pytest
+
+from qtquickdetect.models.app_state import AppState
+from qtquickdetect.models.preset import Preset
+from qtquickdetect.pipeline.pipeline import Pipeline
+from qtquickdetect.views.stream_widget import StreamWidget
+
+
+class ColorPipeline(Pipeline):
+    """
+    Pipeline returning the stream frames unchanged.
+    """
+    def _process_images(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, list[dict]]]:
+        return [(image, []) for image in images]
+
+    def _make_results(self, results_array: list) -> dict:
+        return {'results': results_array}
+
+
+@pytest.fixture
+def stream_url(tmp_path, monkeypatch):
+    """
+    Fixture registering a fake model and returning the URL of a blue video stream.
+    """
+    monkeypatch.setattr(AppState, '_instance', None)
+    app_config = AppState.get_instance().app_config
+    monkeypatch.setitem(app_config.pipelines, 'color', f'{__name__}.ColorPipeline')
+    monkeypatch.setitem(app_config.models, 'color', {'task': 'detect', 'pipeline': 'color'})
+
+    path = tmp_path / 'stream.avi'
+    out = cv.VideoWriter(str(path), cv.VideoWriter_fourcc(*'MJPG'), 30.0, (32, 16))
+    for _ in range(120):
+        out.write(np.full((16, 32, 3), (255, 0, 0), dtype=np.uint8))
+    out.release()
+    return str(path)
+
+
+def test_frames_are_shown_in_a_single_reused_item(qtbot, stream_url):
+    widget = StreamWidget(stream_url, 'detect', Preset('test'), {'color': {'builder': ['a.pt']}}, lambda: None)
+    qtbot.addWidget(widget)
+    item = widget._pixmap_item
+
+    qtbot.waitUntil(lambda: not item.pixmap().isNull(), timeout=10000)
+    widget.stop()
+
+    # The frames are RGB, the pixmap shows the blue BGR frames as blue
+    assert widget._scene.items() == [item]
+    image = item.pixmap().toImage()
+    assert (image.width(), image.height()) == (32, 16)
+    color = image.pixelColor(0, 0)
+    assert color.blue() > 200 and color.red() < 50
+
+
+def test_capture_to_display_latency_is_shown(qtbot, stream_url):
+    widget = StreamWidget(stream_url, 'detect', Preset('test'), {'color': {'builder': ['a.pt']}}, lambda: None)
+    qtbot.addWidget(widget)
+
+    qtbot.waitUntil(lambda: widget._latency > 0, timeout=10000)
+    widget.stop()
+
+    assert widget._latency_label.text() == f'Latency: {widget._latency * 1000.0:.0f} ms'
@@ -0,0 +1,37 @@
+import numpy as np
+import torch
+
+from qtquickdetect.models.preset import Preset
+from qtquickdetect.pipeline.model_cache import ModelCache
+from qtquickdetect.pipeline.torchvision_segment_pipeline import TorchVisionSegmentPipeline
+
+
+class FakeMaskRCNN(torch.nn.Module):
+    """
+    Model returning two square masks, with a high and a low score.
+    """
+    def forward(self, images):
+        masks = torch.zeros((2, 1, 32, 32))
+        masks[0, 0, 2:10, 2:10] = 1.0
+        masks[1, 0, 16:24, 16:24] = 1.0
+        return [{
+            'boxes': torch.tensor([[2.0, 2.0, 10.0, 10.0], [16.0, 16.0, 24.0, 24.0]]),
+            'labels': torch.tensor([1, 2]),
+            'scores': torch.tensor([0.9, 0.3]),
+            'masks': masks
+        } for _ in images]
+
+
+def test_masks_below_half_confidence_are_kept_with_a_lower_threshold(monkeypatch):
+    # The confidence threshold of the preset is applied by the model, the pipeline keeps all its masks
+    monkeypatch.setattr(ModelCache, '_instance', None)
+    monkeypatch.setattr(TorchVisionSegmentPipeline, '_build_model', lambda pipeline: FakeMaskRCNN())
+    preset = Preset('test')
+    preset.confidence_threshold = 0.25
+    pipeline = TorchVisionSegmentPipeline('model_name', 'maskrcnn_resnet50_fpn', 'DEFAULT', preset, None, None,
+                                          None, None)
+
+    [(_, results)] = pipeline._process_images([np.zeros((32, 32, 3), dtype=np.uint8)])
+
+    assert [result['classid'] for result in results] == [1, 2]
+    assert results[1]['confidence'] == np.float32(0.3).item()